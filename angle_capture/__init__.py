@@ -1,6 +1,16 @@
 # angle_capture/__init__.py
-from .angle_capture import AngleCapture
+from .angle_capture import AngleCapture, GyroSampling, YawTracker
+from .rate_filter import (
+	RateFilter, PassThroughFilter, LowPassFilter, OneEuroFilter, ComplementaryFilter
+)
 
 __all__ = [
-	"AngleCapture"
+	"AngleCapture",
+	"GyroSampling",
+	"YawTracker",
+	"RateFilter",
+	"PassThroughFilter",
+	"LowPassFilter",
+	"OneEuroFilter",
+	"ComplementaryFilter"
 ]
@@ -2,27 +2,55 @@
 
 File: angle_capture.py
 Author: Prabandh Battu
-Last Modified: 21/10/2025
+Last Modified: 16/10/2026
 
-Utilizes readings from an MPU6050 gyroscope sensor to make its determinations.
+Utilizes readings from an MPU6050 gyroscope sensor (or its simulated backend)
+to make its determinations.
 """
+import asyncio
 import time, math
-from mpu6050 import mpu6050
+from concurrent.futures import Executor
 from threading import Thread, Lock, Event
 from enum import IntEnum
+from typing import Optional, Tuple
+
+import numpy as np
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from common_api.angle import TurnState
+import hal
+from common_api.angle import AngleSnapshot, TurnState
+from common_api.deadline import Deadlines
+from common_api.latest import Latest
+from common_api.event_bus import EventBus, TURN_TOPIC
+from common_api.metrics import Metrics, GYRO_READ
+from common_api.readiness import Readiness, ProgressCallback
 from angle_visual import AngleVisual
+from angle_visual.angle_visual import FRAME_INTERVAL
+from flight_recorder import FlightRecorder
+from .bias_cache import BIAS_CACHE, BiasCalibration, load_bias, save_bias
+from .rate_filter import RateFilter, OneEuroFilter
 
 # Configuration constants for the gyroscope system.
 I2C_ADDR         = 0x68     # Port address of the I2C protocol.
 BIAS_SAMPLES     = 200      # Samples to average for bias at startup.
 SAMPLE_HZ        = 100      # Loop rate during a sensing event.
-LPF_ALPHA        = 0.85     # Alpha value to determine smoothness of the filter.
+LPF_ALPHA        = 0.85     # Alpha value to determine smoothness of the filter (at SAMPLE_HZ).
+LPF_TIME_CONST   = LPF_ALPHA / (1 - LPF_ALPHA) / SAMPLE_HZ  # Same smoothing at any sample rate (in s).
+PREDICT_HORIZON  = 0.1      # How far ahead the yaw is extrapolated to decide the turn state, when predicting (in s).
+FIFO_HZ          = 1000     # Sample rate of the MPU6050 FIFO in batched mode.
+BATCH_HZ         = 25       # Rate the FIFO is drained at in batched mode.
+VECTOR_MIN       = 32       # Smallest block worth integrating with NumPy, per-call overhead wins below it.
+
+# Background check of a cached bias.
+CHECK_SAMPLES    = 50       # Samples averaged to confirm a cached bias.
+CHECK_ATTEMPTS   = 5        # Tries to find the car still before giving up on the check.
+CHECK_RETRY      = 2.0      # Wait before checking again while the car is moving (in s).
+DRIFT_TOL        = 0.2      # Max difference from the cached bias before recalibrating (in deg/s).
+STILL_VAR_RATIO  = 4.0      # Max sample variance, relative to calibration, while still.
+STILL_VAR_FLOOR  = 0.01     # Variance always counted as still (in (deg/s)^2).
 
 # Tunable paramters to match controller setup.
 VEL_NOISE = 1.5
@@ -31,109 +59,501 @@ MIN_DEG = -30.0     # Maximum degree to the left (counterclockwise).
 MAX_DEG = 30        # Maximum degree to the right (clockwise).
 CENTER_TOL = 5.0    # Amount of cushion around 0 deg +/-.
 
+class GyroSampling(IntEnum):
+    """Selects how the gyroscope is sampled by the detection loop.
+
+    Two possible modes:
+    - SINGLE -> one I2C read of all three axes per sample, at SAMPLE_HZ.
+    - FIFO -> the sensor buffers z-axis samples at FIFO_HZ, drained and 
+      integrated as one NumPy block BATCH_HZ times per second.
+    """
+    SINGLE  = 0
+    FIFO    = 1
+
+# Sampling mode when none is given.
+DEFAULT_SAMPLING = GyroSampling.FIFO
+
+# Prediction horizon when none is given: off, as early redraws are shown before
+# the wheel actually crosses the threshold (in s), see PREDICT_HORIZON.
+DEFAULT_PREDICT = 0.0
+
+class YawTracker():
+    """Integrates bias-corrected gyroscope rates into the yaw, and decides the turn state it implies.
+
+    Holds no device and starts no thread, so recorded samples can be replayed
+    through it on their own. The tuning constants (VEL_NOISE, LEAK_PER_SEC,
+    MIN_DEG, MAX_DEG, CENTER_TOL) are read at every call.
+    """
+    def __init__(self, rate_filter: Optional[RateFilter] = None, predict: float = DEFAULT_PREDICT) -> None:
+        """Initializes a centred tracker.
+
+        Arguments:
+            rate_filter (RateFilter | None): filter applied to the rate before integration,
+                a OneEuroFilter if None.
+            predict (float): horizon the yaw is extrapolated over along its current rate
+                to decide the turn state (in s), 0 to use the current yaw only.
+        """
+        self._filter: RateFilter = rate_filter or OneEuroFilter()
+        self._predict = predict
+        self._yaw_deg: float = 0.0
+        self._filtered: float = 0.0
+
+    @property
+    def yaw(self) -> float:
+        """Returns the estimated steering angle, negative to the left (in deg)."""
+        return self._yaw_deg
+
+    @property
+    def rate(self) -> float:
+        """Returns the latest filtered rate (in deg/s)."""
+        return self._filtered
+
+    @property
+    def uses_accel(self) -> bool:
+        """Returns True if the rate filter needs the accelerometer wheel angle, see `observe_accel`."""
+        return self._filter.uses_accel
+
+    def observe_accel(self, accel_angle: float) -> None:
+        """Feeds the accelerometer wheel angle (in deg) to the rate filter."""
+        self._filter.observe(self._yaw_deg, accel_angle)
+
+    def reset_filter(self) -> None:
+        """Forgets the rate filter state, keeping the yaw."""
+        self._filter.reset()
+
+    def reset(self) -> None:
+        """Forgets the rate filter state, and re-centres the yaw."""
+        self._filter.reset()
+        self._yaw_deg = 0.0
+        self._filtered = 0.0
+
+    def _clamp(self, x: float, lo: float, hi: float) -> float:
+        """Restricts a value to remain within a specified range.
+        
+        Arguments:
+            x (float): value to clamp.
+            lo (float): bottom of clamp range.
+            hi (float): top of clamp range.
+            
+        Returns:
+            (float):  clamped value.
+        """
+        if x < lo:
+            return lo
+        if x > hi:
+            return hi
+        return x
+        
+    def turn_state(self) -> TurnState:
+        """Determines the vehicle's turning state based on current yaw angle.
+
+        While the wheel is turning, the yaw is extrapolated `predict` seconds 
+        ahead along the filtered rate, so the turn state changes as the wheel 
+        is about to cross the threshold rather than after it did. The
+        extrapolation stops at the centre, so a fast swing back to centre does
+        not flash the opposite arrow.
+
+        Returns:
+            (TurnState): current steering direction the car is headed in.
+        """
+        yaw = self._yaw_deg
+        if abs(self._filtered) >= VEL_NOISE:
+            ahead = yaw + self._filtered * self._predict
+            yaw = min(ahead, 0.0) if yaw < 0.0 else max(ahead, 0.0) if yaw > 0.0 else ahead
+            yaw = self._clamp(yaw, MIN_DEG, MAX_DEG)
+        if yaw + CENTER_TOL < 0.0:
+            return TurnState.LEFT_TURN
+        if yaw - CENTER_TOL > 0.0:
+            return TurnState.RIGHT_TURN
+        return TurnState.IDLE
+
+    def _accumulate(self, rate: float, dt: float) -> None:
+        """Integrates one filtered rate, leaking the yaw back towards centre while the wheel is still."""
+        self._yaw_deg += rate * dt
+        
+        if abs(rate) < VEL_NOISE:
+            self._yaw_deg -= self._yaw_deg * (LEAK_PER_SEC * dt)
+        
+        self._yaw_deg = self._clamp(self._yaw_deg, MIN_DEG, MAX_DEG)
+        
+    def step(self, z_rate: float, dt: float) -> TurnState:
+        """Integrates one bias-corrected gyroscope sample into the yaw estimate.
+
+        Filters the rate, integrates the rotation, leaks the yaw back towards
+        centre while the wheel is still, and clamps the result.
+
+        Arguments:
+            z_rate (float): bias-corrected z-axis rate (in deg/s).
+            dt (float): time since the previous sample (in s).
+
+        Returns:
+            (TurnState): turn state implied by the updated yaw.
+        """
+        # Filter the rate to reduce any noise in the reading.
+        self._filtered = self._filter.update(z_rate, dt)
+        
+        # integrate to angle (optional; useful for angle-based triggers)
+        self._accumulate(self._filtered, dt)
+        return self.turn_state()
+
+    def integrate(self, z_rates: np.ndarray, dt: float) -> TurnState:
+        """Integrates a block of evenly spaced, bias-corrected samples into the yaw estimate.
+
+        Gives the same result as calling `step` on every sample, but
+        vectorized. Each step is linear, yaw_k = a_k * yaw_(k-1) + b_k, with
+        a_k the leak factor (1 while turning), so with P_k the cumulative 
+        product of the a_k: yaw_k = P_k * (yaw_0 + sum(b_j / P_j, j <= k)).
+        Clamping is not linear, so a block that hits the limits is integrated 
+        sample by sample instead, as are blocks too short to amortise NumPy's
+        per-call overhead.
+
+        Arguments:
+            z_rates (np.ndarray): bias-corrected z-axis rates, oldest first (in deg/s).
+            dt (float): time between two samples (in s).
+
+        Returns:
+            (TurnState): turn state implied by the updated yaw.
+        """
+        # Filter the rate to reduce any noise in the reading.
+        filtered = self._filter.update_block(z_rates, dt)
+        self._filtered = float(filtered[-1])
+        
+        if len(filtered) < VECTOR_MIN:
+            return self._accumulate_samples(filtered, dt)
+        
+        still = np.abs(filtered) < VEL_NOISE
+        if still.any():
+            leak = np.where(still, 1.0 - LEAK_PER_SEC * dt, 1.0)
+            growth = np.cumprod(leak)
+            yaw = growth * (self._yaw_deg + np.cumsum(filtered * (dt * leak / growth)))
+        else:
+            yaw = self._yaw_deg + np.cumsum(filtered) * dt
+        
+        if yaw.min() < MIN_DEG or yaw.max() > MAX_DEG:
+            return self._accumulate_samples(filtered, dt)
+        
+        self._yaw_deg = float(yaw[-1])
+        return self.turn_state()
+
+    def _accumulate_samples(self, filtered: np.ndarray, dt: float) -> TurnState:
+        """Integrates a block of filtered rates one `_accumulate` at a time."""
+        for rate in filtered.tolist():
+            self._accumulate(rate, dt)
+        return self.turn_state()
+
 class AngleCapture():
     """Captures and interprets angular movement from the MPU6050 gyroscope sensor.
 
     Continuously reads rotational data from the gyroscope, filters it, and integrates 
     over time to estimate the yaw angle.
     """
-    def __init__(self, debug: bool = False) -> None:
+    def __init__(
+        self, 
+        debug: bool = False, 
+        on_progress: Optional[ProgressCallback] = None,
+        bias_cache: Optional[str] = BIAS_CACHE,
+        sampling: GyroSampling = DEFAULT_SAMPLING,
+        rate_filter: Optional[RateFilter] = None,
+        predict: float = DEFAULT_PREDICT,
+        bus: Optional[EventBus] = None,
+        recorder: Optional[FlightRecorder] = None,
+        metrics: Optional[Metrics] = None
+    ) -> None:
         """Initializes the AngleCapture class.
 
+        The gyroscope is calibrated in the background, see `readiness`. A still
+        valid bias saved by an earlier run is used straight away instead, and
+        only re-measured if a background check finds it has drifted.
+
         Arguments:
             debug (bool): True if debug logging is active.
+            on_progress (ProgressCallback | None): called with calibration progress messages.
+            bias_cache (str | None): file the bias calibration is saved to, None to always recalibrate.
+            sampling (GyroSampling): how the detection loop samples the gyroscope.
+            rate_filter (RateFilter | None): filter applied to the rate before integration,
+                a OneEuroFilter if None.
+            predict (float): horizon the yaw is extrapolated over along its current rate
+                to decide the turn state (in s), 0 (the default) to use the current yaw only,
+                for example PREDICT_HORIZON to change the display ahead of the wheel.
+            bus (EventBus | None): bus every new turn state is published to (TURN_TOPIC), if any.
+            recorder (FlightRecorder | None): recorder every gyroscope sample and new turn
+                state is logged to, if any.
+            metrics (Metrics | None): registry the gyroscope reads and LED writes are timed
+                in, and the samples counted in. A private one if None.
         """
         self._debug = debug
-        self._sensor = mpu6050.mpu6050(I2C_ADDR)
+        self._sensor = hal.gyro(I2C_ADDR)
+        self._sampling = sampling
+        self._fifo = hal.gyro_fifo(self._sensor) if sampling == GyroSampling.FIFO else None
+        self._tracker = YawTracker(rate_filter, predict)
+        self._bias_cache = bias_cache
+        self._bus = bus
+        self._recorder = recorder
+        metrics = metrics or Metrics()
+        self._gyro_read = metrics.histogram(GYRO_READ)
+        self._gyro_samples = metrics.counter("gyro_samples")
         
         # Internal state to track changes in angle.
         self._turn_state: TurnState = TurnState.IDLE
         self._z_change: float = 0.0
-        self._filtered: float = 0.0
-        self._yaw_deg: float = 0.0
         self._last_reading: time.time = time.time()
-        self._z_axis_bias = self._calibrate()
+        self._z_axis_bias: float = 0.0
+        
+        # Latest estimate for other threads, see `snapshot`.
+        self._state: Latest[AngleSnapshot] = Latest(
+            AngleSnapshot(0.0, 0.0, TurnState.IDLE, time.monotonic())
+        )
         
         # Thread controls.
         self._detect_flag: Event = Event()
         self._thread: Optional[Thread] = None
-        self._lock = Lock()
+        self._lock = Lock()     # Serialises gyroscope reads between the loop and calibration.
+        self._deadlines: Optional[Deadlines] = None     # Pacing of the asyncio loop, see `run_async`.
+        
+        # Calibrate without blocking start-up, the detection loop waits for it.
+        self._readiness = Readiness("gyro", on_progress)
+        self._calibrate_thread = Thread(
+            target=self._calibrate_in_background, name="echonav-calibration", daemon=True
+        )
+        self._calibrate_thread.start()
         
         # Control to display angle.
-        self._angle_vis = AngleVisual()
+        self._angle_vis = AngleVisual(metrics)
+        
+    def _sample_z(self, count: int, progress: bool = False) -> Tuple[float, float]:
+        """Samples the raw z-axis rate at SAMPLE_HZ.
+
+        Arguments:
+            count (int): number of samples to take.
+            progress (bool): True to report progress every quarter.
+
+        Returns:
+            (float, float): mean (in deg/s) and sample variance (in (deg/s)^2) of the readings.
+        """
+        z_sum, z_sq_sum = 0.0, 0.0
+        for i in range(count):
+            with self._lock:
+                z_angle = self._sensor.get_gyro_data()["z"] # Reports in deg/s.
+            z_sum += z_angle
+            z_sq_sum += z_angle * z_angle
+            time.sleep(1.0 / SAMPLE_HZ)
+            if progress and (i + 1) % (count // 4) == 0:
+                self._readiness.report(f"calibrating... {100 * (i + 1) // count}%")
         
-    def _calibrate(self) -> float:
+        mean = z_sum / count
+        variance = max(0.0, (z_sq_sum - count * mean * mean) / max(1, count - 1))
+        return mean, variance
+
+    def _calibrate(self) -> BiasCalibration:
         """Calibrates the gyroscope by averaging several readings.
          
         Determines the baseline bias (offset). This reduces drift caused by sensor noise.
 
         Returns:
-            (float): bias calculated from the samples.
+            (BiasCalibration): bias calculated from the samples, with its metadata.
         """
         if self._debug:
             print("[DEBUG] Calibrating gyroscope...do not move!")
             
-        bias_sum = 0.0
         # Calculate the average variability between readings.
-        for _ in range(BIAS_SAMPLES):
-            z_angle = self._sensor.get_gyro_data()["z"] # Reports in deg/s.
-            bias_sum += z_angle
-            time.sleep(1.0 / SAMPLE_HZ)
-        z_axis_bias = bias_sum / BIAS_SAMPLES
+        z_axis_bias, variance = self._sample_z(BIAS_SAMPLES, progress=True)
+        with self._lock:
+            temperature = self._sensor.get_temp()
         
         if self._debug:
-            print(f"[DEBUG] Gyroscope z-axis bias: {z_axis_bias} deg/s.")
+            print(f"[DEBUG] Gyroscope z-axis bias: {z_axis_bias} deg/s (variance {variance:.4f}).")
             
-        return z_axis_bias
+        return BiasCalibration(
+            z_axis_bias, variance, BIAS_SAMPLES, temperature, time.time(), hal.backend()
+        )
+
+    def _adopt(self, calibration: BiasCalibration) -> None:
+        """Switches to a new bias calibration and saves it for the next start-up."""
+        self._z_axis_bias = calibration.bias
+        if self._bias_cache and not save_bias(self._bias_cache, calibration):
+            if self._debug:
+                print(f"[DEBUG] Could not save the gyroscope bias to {self._bias_cache}")
+
+    def _is_still(self, variance: float, reference: BiasCalibration) -> bool:
+        """Returns True if a sample variance is low enough for the car to have been still."""
+        return variance <= STILL_VAR_RATIO * reference.variance + STILL_VAR_FLOOR
+
+    def _calibrate_in_background(self) -> None:
+        """Loads a valid cached bias, or calibrates the gyroscope, then marks the capture as ready.
+
+        A cached bias is then confirmed by a short background check.
+        """
+        cached = load_bias(self._bias_cache) if self._bias_cache else None
+        if cached is not None:
+            with self._lock:
+                temperature = self._sensor.get_temp()
+            if cached.is_valid(temperature, hal.backend()):
+                self._z_axis_bias = cached.bias
+                self._readiness.set_ready(f"ready (cached bias: {cached.bias:.3f} deg/s)")
+                self._check_bias(cached)
+                return
+        
+        self._adopt(self._calibrate())
+        self._readiness.set_ready()
+
+    def _check_bias(self, cached: BiasCalibration) -> None:
+        """Confirms a cached bias, recalibrating only if it has drifted.
+
+        The check needs the car to be still, which is judged from the sample 
+        variance, so it is retried a few times while the car is moving.
+
+        Arguments:
+            cached (BiasCalibration): cached calibration currently in use.
+        """
+        # The mean of the check samples is only known to within a few standard errors.
+        tolerance = max(DRIFT_TOL, 3 * math.sqrt(cached.variance / CHECK_SAMPLES))
+        for _ in range(CHECK_ATTEMPTS):
+            mean, variance = self._sample_z(CHECK_SAMPLES)
+            if not self._is_still(variance, cached):
+                time.sleep(CHECK_RETRY)
+                continue
+            
+            drift = mean - cached.bias
+            if abs(drift) <= tolerance:
+                self._readiness.report("cached bias confirmed")
+                return
+            
+            self._readiness.report(f"bias drifted by {drift:+.3f} deg/s, recalibrating...")
+            calibration = self._calibrate()
+            if self._is_still(calibration.variance, cached):
+                self._adopt(calibration)
+                self._readiness.report("recalibrated")
+                return
+        
+        self._readiness.report("could not check the cached bias, the car never stood still")
+
+    @property
+    def readiness(self) -> Readiness:
+        """Returns the start-up state of the gyroscope, ready once it is calibrated."""
+        return self._readiness
                     
     def start(self) -> None:
         """Start the detection loop once. Safe to call multiple times."""
         if self._thread and self._thread.is_alive():
             return
             
-        # Begin with idle, down arrow display.
-        self._angle_vis.display_arrow_from_turn(TurnState.IDLE)
+        # Begin with idle, down arrow display, drawn off the detection thread.
+        self._angle_vis.start()
+        self._angle_vis.show(TurnState.IDLE)
             
+        # Integrate from now, not from construction or the last stop.
+        self._last_reading = time.time()
+        self._tracker.reset_filter()
         self._detect_flag.set()
-        self._thread = Thread(target=self._detect_loop)
+        self._thread = Thread(target=self._detect_loop, name="echonav-gyro")
         self._thread.start()
         
-    def _clamp(self, x: float, lo: float, hi: float) -> float:
-        """Restricts a value to remain within a specified range.
-        
+    def _integrate_step(self, z_rate: float, dt: float) -> TurnState:
+        """Records one bias-corrected gyroscope sample and integrates it, see `YawTracker.step`.
+
         Arguments:
-            x (float): value to clamp.
-            lo (float): bottom of clamp range.
-            hi (float): top of clamp range.
-            
+            z_rate (float): bias-corrected z-axis rate (in deg/s).
+            dt (float): time since the previous sample (in s).
+
         Returns:
-            (float):  clamped value.
+            (TurnState): turn state implied by the updated yaw.
         """
-        if x < lo:
-            return lo
-        if x > hi:
-            return hi
-        return x
-        
-    def _direction_from_yaw(self) -> TurnState:
-        """Determines the vehicle's turning state based on current yaw angle.
+        self._z_change = z_rate
+        if self._recorder:
+            self._recorder.gyro(z_rate, dt)
+        return self._tracker.step(z_rate, dt)
+
+    def _integrate_block(self, z_rates: np.ndarray, dt: float) -> TurnState:
+        """Records a block of evenly spaced, bias-corrected samples and integrates it, see `YawTracker.integrate`.
+
+        Arguments:
+            z_rates (np.ndarray): bias-corrected z-axis rates, oldest first (in deg/s).
+            dt (float): time between two samples (in s).
 
         Returns:
-            (TurnState): current steering direction the car is headed in.
+            (TurnState): turn state implied by the updated yaw.
         """
-        if self._yaw_deg + CENTER_TOL < 0.0:
-            return TurnState.LEFT_TURN
-        if self._yaw_deg - CENTER_TOL > 0.0:
-            return TurnState.RIGHT_TURN
-        return TurnState.IDLE
+        if self._recorder:
+            self._recorder.gyro_block(z_rates, dt)
+        self._z_change = float(z_rates[-1])
+        return self._tracker.integrate(z_rates, dt)
+
+    def _observe_accel(self) -> None:
+        """Feeds the accelerometer wheel angle to the filter, if it uses one.
+
+        The sensor z-axis lies along the wheel axle, so the wheel angle is the
+        direction of gravity in the x-y plane.
+        """
+        if not self._tracker.uses_accel:
+            return
+        with self._lock:
+            accel = self._sensor.get_accel_data()
+        self._tracker.observe_accel(math.degrees(math.atan2(accel["x"], accel["y"])))
+
+    def _update_turn_state(self, new_turn_state: TurnState, draw: bool = True) -> bool:
+        """Publishes and records the turn state, and redraws the display, if steering is in a new direction.
+
+        Arguments:
+            new_turn_state (TurnState): turn state implied by the latest yaw.
+            draw (bool): True to hand the new turn state to the display thread, False if the caller draws it.
+
+        Returns:
+            (bool): True if the turn state changed.
+        """
+        if self._turn_state == new_turn_state:
+            return False
+        self._turn_state = new_turn_state
+        if self._debug:
+            print(f"[DEBUG] New turn state: {self._turn_state}")
+        if draw:
+            self._angle_vis.show(self._turn_state)
+        if self._bus:
+            self._bus.publish(TURN_TOPIC, self._turn_state)
+        if self._recorder:
+            self._recorder.turn(self._turn_state, self._tracker.yaw, self._tracker.rate)
+        return True
+
+    def _publish_state(self) -> None:
+        """Publishes the current estimate as a new snapshot for other threads."""
+        self._state.set(AngleSnapshot(self._tracker.yaw, self._tracker.rate, self._turn_state, time.monotonic()))
+
+    def snapshot(self) -> AngleSnapshot:
+        """Returns the latest yaw, filtered rate and turn state.
+
+        Safe to call from any thread: the snapshot is immutable and reading it
+        never blocks the detection loop.
+        """
+        return self._state.get()
+
+    @property
+    def yaw(self) -> float:
+        """Returns the latest estimated steering angle, negative to the left (in deg)."""
+        return self._state.get().yaw
+
+    @property
+    def turn_state(self) -> TurnState:
+        """Returns the latest turn state."""
+        return self._state.get().turn_state
         
     def _detect_loop(self) -> None:
         """Main sensor loop that runs continuously in a background thread.
 
-        Reads gyroscope data, applies low-pass filtering, integrates the
-        rotation to estimate yaw, clamps the result within bounds, and updates
-        the turn display when the direction changes.
+        Waits for calibration, then reads gyroscope data, applies low-pass 
+        filtering, integrates the rotation to estimate yaw, clamps the result 
+        within bounds, and hands the turn to the display thread when the direction changes.
         """
+        while not self._readiness.wait(0.1):
+            if not self._detect_flag.is_set():
+                return
+        
+        if self._fifo is not None:
+            self._batch_loop()
+        else:
+            self._single_loop()
+
+    def _single_loop(self) -> None:
+        """Reads and integrates one gyroscope sample at a time, at SAMPLE_HZ."""
+        self._last_reading = time.time()
         while self._detect_flag.is_set():
             curr_time = time.time()
             dt = curr_time - self._last_reading
@@ -142,30 +562,139 @@ class AngleCapture():
             self._last_reading = curr_time
 
             # Find current (bias corrected) angle reading.
-            self._z_change = self._sensor.get_gyro_data()["z"] - self._z_axis_bias
-
-            # Low-pass filter the rate to reduce any noise in the reading.
-            self._filtered = LPF_ALPHA * self._z_change + (1 - LPF_ALPHA) * self._z_change
-            
-            # integrate to angle (optional; useful for angle-based triggers)
-            self._yaw_deg += self._filtered * dt
-            
-            if abs(self._filtered) < VEL_NOISE:
-                self._yaw_deg -= self._yaw_deg * (LEAK_PER_SEC * dt)
-            
-            self._yaw_deg = self._clamp(self._yaw_deg, MIN_DEG, MAX_DEG)
+            z_rate = self._read_rate()
             
             # Check if steering is in a new direction.
-            new_turn_state = self._direction_from_yaw()
-            if self._turn_state != new_turn_state:
-                self._turn_state = new_turn_state
-                if self._debug:
-                    print(f"[DEBUG] New turn state: {self._turn_state}")
-                    self._angle_vis.display_arrow_from_turn(self._turn_state)
-                    
+            self._update_turn_state(self._integrate_step(z_rate, dt))
+            self._publish_state()
          
             # Wait until next reading.
             time.sleep(max(0, (1.0 / SAMPLE_HZ) - (time.time() - curr_time)))
+
+    def _batch_loop(self) -> None:
+        """Drains the gyroscope FIFO BATCH_HZ times per second, integrating each batch as one block.
+
+        The samples are evenly spaced by the sensor's own clock, so the
+        integration step comes from the FIFO rate rather than wall time.
+        """
+        dt = self._start_fifo()
+        try:
+            while self._detect_flag.is_set():
+                curr_time = time.time()
+                z_rates = self._read_batch()
+                if len(z_rates):
+                    self._update_turn_state(self._integrate_block(z_rates, dt))
+                    self._publish_state()
+                
+                # Wait until the next batch.
+                time.sleep(max(0, (1.0 / BATCH_HZ) - (time.time() - curr_time)))
+        finally:
+            self._stop_fifo()
+
+    def _read_rate(self) -> float:
+        """Reads one bias-corrected z-axis rate (in deg/s), and feeds the accelerometer to the filter."""
+        with self._lock:
+            start = time.perf_counter_ns()
+            z_rate = self._sensor.get_gyro_data()["z"] - self._z_axis_bias
+            self._gyro_read.since(start)
+        self._gyro_samples.add()
+        self._observe_accel()
+        return z_rate
+
+    def _read_batch(self) -> np.ndarray:
+        """Drains the FIFO's bias-corrected z-axis rates (in deg/s), and feeds the accelerometer to the filter."""
+        with self._lock:
+            start = time.perf_counter_ns()
+            z_rates = self._fifo.read_fifo_z()
+            self._gyro_read.since(start)
+        self._gyro_samples.add(len(z_rates))
+        self._observe_accel()
+        return z_rates - self._z_axis_bias
+
+    def _start_fifo(self) -> float:
+        """Starts the FIFO at FIFO_HZ, and returns the time between two of its samples (in s)."""
+        with self._lock:
+            return 1.0 / self._fifo.start_fifo(FIFO_HZ)
+
+    def _stop_fifo(self) -> None:
+        """Stops the FIFO."""
+        with self._lock:
+            self._fifo.stop_fifo()
+
+    async def run_async(self, executor: Executor) -> None:
+        """Coroutine version of the detection loop, for the asyncio runtime. Runs until cancelled.
+
+        Samples at SAMPLE_HZ (FIFO batches at BATCH_HZ) against absolute
+        deadlines, see `missed_deadlines`. The I2C reads run in the executor,
+        and the display is redrawn by a task of its own so a slow redraw never
+        delays the next sample. Clears the display when cancelled.
+
+        Arguments:
+            executor (Executor): runs the blocking I2C and display work.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(executor, self._angle_vis.display_arrow_from_turn, TurnState.IDLE)
+        self._tracker.reset_filter()
+        redraw = asyncio.Event()
+        display = asyncio.create_task(self._display_async(executor, redraw))
+        try:
+            while not self._readiness.ready:
+                await asyncio.sleep(0.1)
+            if self._fifo is not None:
+                await self._batch_async(executor, redraw)
+            else:
+                await self._single_async(executor, redraw)
+        finally:
+            display.cancel()
+            await asyncio.gather(display, return_exceptions=True)
+            await loop.run_in_executor(executor, self._angle_vis.clear_display)
+
+    async def _display_async(self, executor: Executor, redraw: asyncio.Event) -> None:
+        """Redraws the arrow of the latest turn state every time `redraw` is set, at most MAX_FPS times per second."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await redraw.wait()
+            redraw.clear()
+            await loop.run_in_executor(executor, self._angle_vis.display_arrow_from_turn, self._turn_state)
+            await asyncio.sleep(FRAME_INTERVAL)
+
+    async def _single_async(self, executor: Executor, redraw: asyncio.Event) -> None:
+        """Reads and integrates one gyroscope sample per deadline, at SAMPLE_HZ."""
+        loop = asyncio.get_running_loop()
+        self._deadlines = Deadlines(1.0 / SAMPLE_HZ)
+        self._last_reading = time.time()
+        while True:
+            await self._deadlines.wait()
+            z_rate = await loop.run_in_executor(executor, self._read_rate)
+            curr_time = time.time()
+            dt = curr_time - self._last_reading
+            if dt <= 0:
+                continue
+            self._last_reading = curr_time
+            if self._update_turn_state(self._integrate_step(z_rate, dt), draw=False):
+                redraw.set()
+            self._publish_state()
+
+    async def _batch_async(self, executor: Executor, redraw: asyncio.Event) -> None:
+        """Drains and integrates the gyroscope FIFO once per deadline, at BATCH_HZ."""
+        loop = asyncio.get_running_loop()
+        self._deadlines = Deadlines(1.0 / BATCH_HZ)
+        dt = await loop.run_in_executor(executor, self._start_fifo)
+        try:
+            while True:
+                await self._deadlines.wait()
+                z_rates = await loop.run_in_executor(executor, self._read_batch)
+                if len(z_rates):
+                    if self._update_turn_state(self._integrate_block(z_rates, dt), draw=False):
+                        redraw.set()
+                    self._publish_state()
+        finally:
+            await loop.run_in_executor(executor, self._stop_fifo)
+
+    @property
+    def missed_deadlines(self) -> int:
+        """Returns how many sampling deadlines the asyncio loop missed, 0 if it never ran."""
+        return self._deadlines.missed if self._deadlines else 0
         
     def stop(self) -> None:
         """Signal the thread to stop and wait for it to exit."""
@@ -176,4 +705,5 @@ class AngleCapture():
             self._thread.join(timeout=1)
             self._thread = None
             
+        self._angle_vis.stop()
         self._angle_vis.clear_display()
\ No newline at end of file
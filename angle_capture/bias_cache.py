@@ -0,0 +1,81 @@
+"""This module persists the gyroscope bias calibration between runs.
+
+File: bias_cache.py
+Author: Prabandh Battu
+Last Modified: 16/10/2026
+
+A full calibration needs the car to sit still for a couple of seconds, so the
+measured z-axis bias is saved to disk together with the conditions it was
+measured in. On the next start-up it is reused straight away as long as it is
+recent and the MPU6050 is at a similar temperature, since the bias mostly
+drifts with temperature and age.
+"""
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+BIAS_CACHE      = os.path.join(os.path.expanduser("~"), ".echonav", "gyro_bias.json")
+CACHE_MAX_AGE   = 7 * 24 * 3600.0   # Oldest calibration worth reusing (in s).
+TEMP_TOL        = 5.0               # Max temperature change since calibration (in C).
+
+@dataclass
+class BiasCalibration:
+    """DTO holding one gyroscope bias calibration and its metadata."""
+    bias: float         # Mean z-axis rate while still (in deg/s).
+    variance: float     # Sample variance of the z-axis rate while still (in (deg/s)^2).
+    samples: int        # Samples the calibration was averaged over.
+    temperature: float  # MPU6050 die temperature at calibration (in C).
+    timestamp: float    # Wall clock time of the calibration (in s since the epoch).
+    backend: str        # Hardware backend the calibration was measured on.
+
+    def is_valid(self, temperature: float, backend: str, now: Optional[float] = None) -> bool:
+        """Returns True if the calibration can be reused under the current conditions.
+
+        Arguments:
+            temperature (float): current MPU6050 die temperature (in C).
+            backend (str): hardware backend currently in use.
+            now (float | None): current wall clock time, time.time() if None.
+        """
+        now = time.time() if now is None else now
+        return (
+            self.backend == backend
+            and 0.0 <= now - self.timestamp <= CACHE_MAX_AGE
+            and abs(temperature - self.temperature) <= TEMP_TOL
+        )
+
+def load_bias(path: str) -> Optional[BiasCalibration]:
+    """Loads a saved calibration.
+
+    Arguments:
+        path (str): cache file to read.
+
+    Returns:
+        (BiasCalibration | None): the saved calibration, or None if missing or unreadable.
+    """
+    try:
+        with open(path) as f:
+            return BiasCalibration(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+def save_bias(path: str, calibration: BiasCalibration) -> bool:
+    """Saves a calibration, replacing the file atomically so a crash never leaves it half written.
+
+    Arguments:
+        path (str): cache file to write.
+        calibration (BiasCalibration): calibration to save.
+
+    Returns:
+        (bool): True if the calibration was saved.
+    """
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(asdict(calibration), f, indent=2)
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,230 @@
+"""This module provides the pluggable filters applied to the gyroscope z-axis rate.
+
+File: rate_filter.py
+Author: Prabandh Battu
+Last Modified: 16/10/2026
+
+AngleCapture passes every bias-corrected rate sample through one RateFilter
+before integrating it into the yaw. The filters available are:
+
+- PassThroughFilter: no filtering.
+- LowPassFilter: first-order IIR low-pass, smooth but adds a fixed lag.
+- OneEuroFilter: low-pass whose cutoff rises with the rate of change, so it is
+  smooth while the wheel is still and responsive while it is turning.
+- ComplementaryFilter: pulls the integrated yaw towards the wheel angle measured
+  by the accelerometer, which cancels slow gyroscope drift.
+"""
+import math
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+
+IIR_CHUNK           = 64    # Longest block the vectorized IIR solves at once, bounds a^-k.
+ONE_EURO_MIN_CUTOFF = 2.0   # One-euro cutoff while the rate is steady (in Hz).
+ONE_EURO_BETA       = 0.01  # One-euro cutoff increase per deg/s^2 of rate change.
+ONE_EURO_D_CUTOFF   = 5.0   # Cutoff of the one-euro rate-of-change estimate (in Hz).
+COMP_TIME_CONST     = 1.0   # Time constant of the accelerometer correction (in s).
+
+class RateFilter(ABC):
+    """Filters a stream of z-axis rate samples (in deg/s). Subclasses must implement `update`."""
+    uses_accel: bool = False    # True if the filter needs `observe` calls with the accelerometer angle.
+
+    @abstractmethod
+    def update(self, rate: float, dt: float) -> float:
+        """Filters one sample.
+
+        Arguments:
+            rate (float): bias-corrected z-axis rate (in deg/s).
+            dt (float): time since the previous sample (in s).
+
+        Returns:
+            (float): filtered rate (in deg/s).
+        """
+
+    def update_block(self, rates: np.ndarray, dt: float) -> np.ndarray:
+        """Filters a block of evenly spaced samples, oldest first.
+
+        Arguments:
+            rates (np.ndarray): bias-corrected z-axis rates (in deg/s).
+            dt (float): time between two samples (in s).
+
+        Returns:
+            (np.ndarray): filtered rates (in deg/s).
+        """
+        return np.fromiter((self.update(rate, dt) for rate in rates.tolist()), float, len(rates))
+
+    def observe(self, yaw: float, accel_angle: float) -> None:
+        """Feeds the current yaw estimate and accelerometer wheel angle (in deg), if `uses_accel`."""
+
+    def reset(self) -> None:
+        """Forgets all filter state."""
+
+class PassThroughFilter(RateFilter):
+    """Returns every sample unchanged."""
+    def update(self, rate: float, dt: float) -> float:
+        """Returns the sample unchanged."""
+        return rate
+
+    def update_block(self, rates: np.ndarray, dt: float) -> np.ndarray:
+        """Returns the block unchanged."""
+        return rates
+
+class LowPassFilter(RateFilter):
+    """First-order IIR low-pass filter, y_k = a * y_(k-1) + (1 - a) * x_k with a = tau / (tau + dt)."""
+    def __init__(self, time_const: float) -> None:
+        """Initializes the filter.
+
+        Arguments:
+            time_const (float): filter time constant tau (in s), larger is smoother but slower.
+        """
+        self._time_const = time_const
+        self._value: Optional[float] = None
+
+    def update(self, rate: float, dt: float) -> float:
+        """Filters one sample, starting from the first sample seen."""
+        if self._value is None:
+            self._value = rate
+        else:
+            a = self._time_const / (self._time_const + dt)
+            self._value = a * self._value + (1 - a) * rate
+        return self._value
+
+    def update_block(self, rates: np.ndarray, dt: float) -> np.ndarray:
+        """Filters a block, solving the recurrence in closed form.
+
+        With a constant a, y_k = a^k * (y_0 + (1 - a) * sum(x_j / a^j, j <= k)).
+        The block is solved in chunks so a^-k stays well within float range.
+        """
+        if self._value is None:
+            self._value = float(rates[0])
+        a = self._time_const / (self._time_const + dt)
+        out = np.empty(len(rates))
+        for start in range(0, len(rates), IIR_CHUNK):
+            chunk = rates[start:start + IIR_CHUNK]
+            powers = a ** np.arange(1, len(chunk) + 1)
+            out[start:start + len(chunk)] = powers * (self._value + (1 - a) * np.cumsum(chunk / powers))
+            self._value = float(out[start + len(chunk) - 1])
+        return out
+
+    def reset(self) -> None:
+        """Forgets the filtered value."""
+        self._value = None
+
+class OneEuroFilter(RateFilter):
+    """One-euro filter: a low-pass whose cutoff frequency grows with the rate of change.
+
+    Casiez et al., "1 Euro Filter: A Simple Speed-based Low-pass Filter for Noisy
+    Input in Interactive Systems", CHI 2012.
+    """
+    def __init__(
+        self,
+        min_cutoff: float = ONE_EURO_MIN_CUTOFF,
+        beta: float = ONE_EURO_BETA,
+        d_cutoff: float = ONE_EURO_D_CUTOFF
+    ) -> None:
+        """Initializes the filter.
+
+        Arguments:
+            min_cutoff (float): cutoff while the rate is steady (in Hz), lower is smoother.
+            beta (float): cutoff increase per unit of rate change (in Hz per deg/s^2), higher reacts faster.
+            d_cutoff (float): cutoff of the rate-of-change estimate (in Hz).
+        """
+        self._min_cutoff = min_cutoff
+        self._beta = beta
+        self._d_cutoff = d_cutoff
+        self._value: Optional[float] = None
+        self._change: float = 0.0
+
+    def _alpha(self, cutoff: float, dt: float) -> float:
+        """Returns the smoothing factor of a low-pass at `cutoff` Hz for a `dt` step."""
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, rate: float, dt: float) -> float:
+        """Filters one sample, starting from the first sample seen."""
+        if self._value is None:
+            self._value = rate
+            return rate
+
+        change = (rate - self._value) / dt
+        self._change += self._alpha(self._d_cutoff, dt) * (change - self._change)
+        cutoff = self._min_cutoff + self._beta * abs(self._change)
+        self._value += self._alpha(cutoff, dt) * (rate - self._value)
+        return self._value
+
+    def update_block(self, rates: np.ndarray, dt: float) -> np.ndarray:
+        """Filters a block of samples.
+
+        The cutoff adapts on every sample so this cannot be vectorized, but the
+        loop keeps its state in locals and hoists everything that only depends
+        on dt, which is much cheaper than calling `update` per sample.
+        """
+        samples = rates.tolist()
+        if self._value is None:
+            self._value = samples[0]
+        value, change = self._value, self._change
+        d_alpha = self._alpha(self._d_cutoff, dt)
+        # alpha(cutoff) = 1 / (1 + tau / dt) = 1 / (1 + k / cutoff), with k = 1 / (2 pi dt).
+        k = 1.0 / (2 * math.pi * dt)
+        min_cutoff, beta = self._min_cutoff, self._beta
+        out = []
+        for rate in samples:
+            change += d_alpha * ((rate - value) / dt - change)
+            value += (rate - value) / (1.0 + k / (min_cutoff + beta * abs(change)))
+            out.append(value)
+        self._value, self._change = value, change
+        return np.array(out)
+
+    def reset(self) -> None:
+        """Forgets the filtered value and rate of change."""
+        self._value = None
+        self._change = 0.0
+
+class ComplementaryFilter(RateFilter):
+    """Corrects the rate so the integrated yaw converges on the accelerometer wheel angle.
+
+    The gyroscope is accurate over short times but drifts, the accelerometer
+    angle is noisy but drift-free. Adding (accel_angle - yaw) / tau to the rate
+    is the complementary filter written in rate form: the yaw follows the
+    gyroscope at high frequencies and the accelerometer below 1 / tau.
+
+    This relies on the sensor being mounted with its z-axis along the steering
+    wheel axle, and the axle not vertical, so gravity turns with the wheel in
+    the x-y plane. The wheel is assumed centred when the first angle is observed.
+    """
+    uses_accel = True
+
+    def __init__(self, time_const: float = COMP_TIME_CONST, inner: Optional[RateFilter] = None) -> None:
+        """Initializes the filter.
+
+        Arguments:
+            time_const (float): time constant tau of the correction (in s).
+            inner (RateFilter | None): filter smoothing the gyroscope rate first, if any.
+        """
+        self._time_const = time_const
+        self._inner = inner or PassThroughFilter()
+        self._zero: Optional[float] = None
+        self._correction: float = 0.0
+
+    def observe(self, yaw: float, accel_angle: float) -> None:
+        """Updates the correction from the current yaw and accelerometer wheel angle (in deg)."""
+        if self._zero is None:
+            self._zero = accel_angle - yaw
+        # Wrap the difference into [-180, 180) so the correction never goes the long way around.
+        error = (accel_angle - self._zero - yaw + 180.0) % 360.0 - 180.0
+        self._correction = error / self._time_const
+
+    def update(self, rate: float, dt: float) -> float:
+        """Filters one sample and adds the accelerometer correction."""
+        return self._inner.update(rate, dt) + self._correction
+
+    def update_block(self, rates: np.ndarray, dt: float) -> np.ndarray:
+        """Filters a block and adds the accelerometer correction."""
+        return self._inner.update_block(rates, dt) + self._correction
+
+    def reset(self) -> None:
+        """Forgets the accelerometer zero and the inner filter state."""
+        self._inner.reset()
+        self._zero = None
+        self._correction = 0.0
@@ -0,0 +1,94 @@
+"""Unit tests of the gyroscope rate filters.
+
+File: test_rate_filter.py
+Author: Prabandh Battu
+Last Modified: 16/10/2026
+"""
+import numpy as np
+import pytest
+
+from angle_capture.rate_filter import (
+    RateFilter, PassThroughFilter, LowPassFilter, OneEuroFilter, ComplementaryFilter
+)
+
+DT = 0.001
+
+def step(n: int = 200, value: float = 100.0) -> np.ndarray:
+    """Returns a rate step from 0 to `value` halfway through n samples."""
+    rates = np.zeros(n)
+    rates[n // 2:] = value
+    return rates
+
+@pytest.mark.parametrize("make", [
+    PassThroughFilter,
+    lambda: LowPassFilter(0.05),
+    OneEuroFilter,
+    lambda: ComplementaryFilter(inner=OneEuroFilter())
+])
+def test_block_matches_samples(make):
+    rates = step() + np.random.default_rng(0).normal(0.0, 0.5, 200)
+    one, block = make(), make()
+    expected = [one.update(rate, DT) for rate in rates.tolist()]
+    assert np.allclose(block.update_block(rates, DT), expected)
+
+def test_pass_through_is_identity():
+    rates = step()
+    assert np.array_equal(PassThroughFilter().update_block(rates, DT), rates)
+
+def test_first_sample_passes_through():
+    assert LowPassFilter(0.05).update(42.0, DT) == 42.0
+    assert OneEuroFilter().update(42.0, DT) == 42.0
+
+def test_low_pass_long_block_stays_finite():
+    # Longer than IIR_CHUNK, a^-k would overflow if solved in one go.
+    out = LowPassFilter(0.001).update_block(np.full(5000, 10.0), DT)
+    assert np.all(np.isfinite(out))
+    assert out[-1] == pytest.approx(10.0)
+
+def test_low_pass_lags_a_step():
+    out = LowPassFilter(0.05).update_block(step(), DT)
+    assert 0.0 < out[-1] < 100.0
+
+def test_one_euro_follows_fast_change_better_than_low_pass():
+    rates = step(400)
+    euro = OneEuroFilter().update_block(rates, DT)
+    low = LowPassFilter(0.08).update_block(rates, DT)
+    assert euro[250] > low[250]
+
+def test_one_euro_smooths_noise_while_still():
+    noise = np.random.default_rng(1).normal(0.0, 1.0, 1000)
+    out = OneEuroFilter().update_block(noise, DT)
+    assert np.std(out[100:]) < 0.5 * np.std(noise)
+
+@pytest.mark.parametrize("make", [lambda: LowPassFilter(0.05), OneEuroFilter])
+def test_reset_forgets_state(make):
+    rate_filter = make()
+    rate_filter.update_block(np.full(100, 50.0), DT)
+    rate_filter.reset()
+    assert rate_filter.update(-20.0, DT) == -20.0
+
+def test_complementary_pulls_towards_accel_angle():
+    comp = ComplementaryFilter(time_const=1.0)
+    comp.observe(0.0, 10.0)     # Sets the zero.
+    comp.observe(0.0, 15.0)     # Wheel 5 deg right of the yaw.
+    assert comp.update(0.0, DT) == pytest.approx(5.0)
+
+def test_complementary_wraps_correction():
+    comp = ComplementaryFilter(time_const=1.0)
+    comp.observe(0.0, 179.0)
+    comp.observe(0.0, -179.0)   # 2 deg on, not 358 deg back.
+    assert comp.update(0.0, DT) == pytest.approx(2.0)
+
+def test_complementary_reset_forgets_zero():
+    comp = ComplementaryFilter(time_const=1.0)
+    comp.observe(0.0, 10.0)
+    comp.observe(0.0, 15.0)
+    comp.reset()
+    comp.observe(0.0, 40.0)
+    assert comp.update(0.0, DT) == pytest.approx(0.0)
+
+def test_filter_without_update_cannot_be_built():
+    class Incomplete(RateFilter):
+        pass
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,34 @@
+"""Unit tests of the yaw integration behind AngleCapture.
+
+File: test_yaw_tracker.py
+Author: Prabandh Battu
+Last Modified: 16/10/2026
+"""
+import numpy as np
+
+from angle_capture.angle_capture import YawTracker, MAX_DEG
+from angle_capture.rate_filter import PassThroughFilter
+from common_api.angle import TurnState
+
+DT = 0.001
+
+def test_block_matches_samples():
+    rates = np.concatenate([np.full(300, 40.0), np.zeros(300), np.full(300, -20.0)])
+    one, block = YawTracker(PassThroughFilter()), YawTracker(PassThroughFilter())
+    for rate in rates.tolist():
+        expected = one.step(rate, DT)
+    assert block.integrate(rates, DT) == expected
+    assert np.isclose(block.yaw, one.yaw)
+
+def test_turn_and_reset():
+    tracker = YawTracker(PassThroughFilter())
+    assert tracker.integrate(np.full(200, 50.0), DT) == TurnState.RIGHT_TURN
+    assert np.isclose(tracker.yaw, 10.0)
+    tracker.reset()
+    assert tracker.yaw == 0.0 and tracker.rate == 0.0
+    assert tracker.turn_state() == TurnState.IDLE
+
+def test_yaw_is_clamped():
+    tracker = YawTracker(PassThroughFilter())
+    tracker.integrate(np.full(1000, 100.0), DT)
+    assert tracker.yaw == MAX_DEG
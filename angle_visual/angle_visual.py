@@ -2,17 +2,32 @@
 
 File: angle_visual.py
 Author: Anju Damodaran
-Last Modified: 21/10/2025
+Last Modified: 16/10/2026
 
 Has three fixed angle states it can push to the display depending on current orientation.
+Every frame is built and packed once, at import, and a frame is only pushed to the matrix
+if it differs from the one shown, at most MAX_FPS times per second. In the
+thread runtime the frames are pushed by a display thread of their own, so a
+slow LED write never delays the gyroscope sampling.
 """
 import sys
 import os
+import time
+from threading import Event, Lock, Thread
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
+import hal
 from common_api.angle import TurnState
-from sense_hat import SenseHat
-from typing import List
+from common_api.metrics import Metrics, LED_WRITE
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+MAX_FPS         = 25                # Most frames pushed to the matrix per second.
+FRAME_INTERVAL  = 1.0 / MAX_FPS     # Shortest time between two pushed frames (in s).
+
+class Frame(NamedTuple):
+    """A full frame of 64 RGB pixels, and the same frame packed as written to the matrix."""
+    pixels: Tuple[Tuple[int, int, int], ...]
+    packed: bytes
 
 # Colors options.
 RED     = (255, 0, 0)
@@ -52,6 +67,24 @@ DOWN_LEFT_ARROW: List[bool] = [
     0, 0, 0, 0, 0, 0, 0, 1
 ]
 
+def frame_of(pattern: List[bool]) -> Frame:
+    """Returns the red on black frame of an arrow pattern, packed for the matrix.
+
+    Args:
+        pattern (list): Flattened 8x8 list of 0s and 1s.
+    """
+    pixels = tuple(RED if cell else BLACK for cell in pattern)
+    return Frame(pixels, hal.pack_frame(pixels))
+
+BLANK_FRAME: Frame = frame_of([0] * 64)
+
+# Frame of each turn state, reversed as the car is going backwards.
+ARROW_FRAMES: Dict[TurnState, Frame] = {
+    TurnState.LEFT_TURN : frame_of(DOWN_RIGHT_ARROW),
+    TurnState.IDLE : frame_of(DOWN_ARROW),
+    TurnState.RIGHT_TURN : frame_of(DOWN_LEFT_ARROW)
+}
+
 class AngleVisual():
     """Handles visual feedback of turn direction using the Raspberry Pi Sense HAT.
 
@@ -59,29 +92,52 @@ class AngleVisual():
     the current turning state (left, right, or idle). The display provides an
     immediate, intuitive visual representation of the car's steering orientation.
     """
-    def __init__(self) -> None:
-        """Initializes the AngleVisual class."""
-        self._sense = SenseHat()
+    def __init__(self, metrics: Optional[Metrics] = None) -> None:
+        """Initializes the AngleVisual class.
+
+        Args:
+            metrics (Metrics | None): registry every LED write is timed in, and every
+                skipped one counted in, a private one if None.
+        """
+        self._fb = hal.led_framebuffer(hal.sense_hat())
+        metrics = metrics or Metrics()
+        self._led_write = metrics.histogram(LED_WRITE)
+        self._led_writes_skipped = metrics.counter("led_writes_skipped")
+        self._lock = Lock()     # Serialises writes, so `_shown` matches the matrix.
+        self._shown: Optional[Frame] = None
+
+        # Display thread, see `start`.
+        self._wanted: TurnState = TurnState.IDLE
+        self._redraw: Event = Event()
+        self._stop_flag: Event = Event()
+        self._thread: Optional[Thread] = None
         self.clear_display()
     
     def clear_display(self) -> None:
         """Clears the LED matrix, turning off all pixels."""
-        self._sense.clear()
+        with self._lock:
+            start = time.perf_counter_ns()
+            self._fb.write_frame(BLANK_FRAME.packed)
+            self._led_write.since(start)
+            self._shown = BLANK_FRAME
 
-    def _display_arrow(self, arrow_pattern: List[bool]) -> None:
-        """Displays the arrow pattern on the Sense HAT.
+    def _display_arrow(self, frame: Frame) -> None:
+        """Displays a frame on the Sense HAT, unless it is already shown.
 
         Args:
-            angle (float): Current steering angle in degrees (for selection).
-            arrow_pattern (list): Flattened 8x8 list of 0s and 1s for the arrow.
+            frame (Frame): prebuilt frame, see `ARROW_FRAMES`.
         """
-        pixels = []
-        for cell in arrow_pattern:
-            pixels.append(RED if cell else BLACK)
-        self._sense.set_pixels(pixels)
+        with self._lock:
+            if frame is self._shown:
+                self._led_writes_skipped.add()
+                return
+            start = time.perf_counter_ns()
+            self._fb.write_frame(frame.packed)
+            self._led_write.since(start)
+            self._shown = frame
 
     def display_arrow_from_turn(self, turn: TurnState) -> None:
-        """Displays an arrow corresponding to the current turn direction.
+        """Displays an arrow corresponding to the current turn direction, on the calling thread.
 
         The mapping is reversed to reflect the car's rear orientation when backing up.
 
@@ -90,9 +146,43 @@ class AngleVisual():
         Args:
             turn (TurnState): The current turn state (LEFT_TURN, RIGHT_TURN, or IDLE).
         """
-        arrow_map = {
-            TurnState.LEFT_TURN : DOWN_RIGHT_ARROW,
-            TurnState.IDLE : DOWN_ARROW,
-            TurnState.RIGHT_TURN : DOWN_LEFT_ARROW
-        }
-        self._display_arrow(arrow_map.get(turn))
\ No newline at end of file
+        self._display_arrow(ARROW_FRAMES[turn])
+
+    def start(self) -> None:
+        """Starts the display thread drawing the turns passed to `show`. Safe to call multiple times."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_flag.clear()
+        self._thread = Thread(target=self._display_loop, name="echonav-display", daemon=True)
+        self._thread.start()
+
+    def show(self, turn: TurnState) -> None:
+        """Hands a turn state to the display thread and returns straight away.
+
+        Only the latest turn state is drawn, so states replaced within one
+        FRAME_INTERVAL are never pushed to the matrix.
+
+        Args:
+            turn (TurnState): The current turn state.
+        """
+        self._wanted = turn
+        self._redraw.set()
+
+    def _display_loop(self) -> None:
+        """Draws the latest turn state every time it is shown, at most MAX_FPS times per second."""
+        while True:
+            self._redraw.wait()
+            if self._stop_flag.is_set():
+                return
+            self._redraw.clear()
+            self.display_arrow_from_turn(self._wanted)
+            if self._stop_flag.wait(FRAME_INTERVAL):
+                return
+
+    def stop(self) -> None:
+        """Stops the display thread, dropping any turn state not drawn yet."""
+        self._stop_flag.set()
+        self._redraw.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
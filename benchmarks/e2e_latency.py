@@ -0,0 +1,414 @@
+"""End-to-end latency benchmarks for the full EchoNav pipeline.
+
+File: e2e_latency.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Drives an unmodified EchoNav instance against the simulated backend with
+scripted scenarios, and measures how long it takes from a change in the world
+to the matching change in the feedback:
+
+- obstacle -> alert: the world's obstacle moves, until `SpeakerBeep` switches
+  to the matching beep interval.
+- steering -> redraw: the true steering angle crosses the turn threshold,
+  until `AngleVisual` pushes the matching arrow to the LED matrix.
+
+Every scenario also reports the sweep rate, the CPU time of each pipeline
+thread, and EchoNav's own per-stage latency histograms. Results are written as JSON, and can be compared with an earlier run.
+Both runtimes can be measured: the thread per stage EchoNav (the default), or
+the single event loop AsyncEchoNav.
+
+Usage:
+    python -m benchmarks.e2e_latency --output e2e.json [--compare old.json] [--scenario approach]
+    python -m benchmarks.e2e_latency --runtime asyncio --output e2e_async.json --compare e2e.json
+    python -m benchmarks.e2e_latency --flight-log /tmp/flight.rec --output e2e_rec.json --compare e2e.json
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+from threading import Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import hal
+from common_api.angle import TurnState
+from common_api.distance import CarCorner
+
+ALERT_TOL       = 0.02  # Beep interval counted as matching the expected one (in s).
+EVENT_TIMEOUT   = 3.0   # Events without a response within this window count as missed (in s).
+SETTLE_TIME     = 1.0   # Time given to the pipeline before each scenario (in s).
+PERCENTILES     = (50, 95, 99)
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Returns the nearest-rank percentile of a list, or None if it is empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+def summarize(latencies: List[float], missed: int) -> Dict[str, Any]:
+    """Summarizes latencies (in s) as percentiles in milliseconds."""
+    summary: Dict[str, Any] = {"n": len(latencies), "missed": missed}
+    for pct in PERCENTILES:
+        value = percentile(latencies, pct)
+        summary[f"p{pct}_ms"] = None if value is None else round(value * 1000, 2)
+    return summary
+
+def summarize_stages(stages: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarizes EchoNav's stage histograms as bucket percentiles in microseconds."""
+    summary: Dict[str, Any] = {}
+    for name, stats in sorted(stages.items()):
+        summary[name] = {"n": stats.count}
+        for pct in PERCENTILES:
+            value = stats.percentile_ns(pct)
+            summary[name][f"p{pct}_us"] = None if value is None else round(value / 1000, 1)
+        summary[name]["max_us"] = round(stats.max_ns / 1000, 1)
+    return summary
+
+def thread_cpu(thread: Optional[Thread]) -> Optional[float]:
+    """Returns the CPU time consumed so far by a thread (in s), if the platform exposes it."""
+    if thread is None or thread.ident is None or not hasattr(time, "pthread_getcpuclockid"):
+        return None
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread.ident))
+    except (OSError, ProcessLookupError):
+        return None
+
+class PipelineProbe():
+    """Observes a running EchoNav without changing its behaviour.
+
+    Wraps the sweep and the speaker update of one instance to timestamp every
+    produced beep interval, and samples the CPU clocks of the pipeline threads.
+    """
+    def __init__(self, nav: Any) -> None:
+        """Attaches the probe to an EchoNav instance.
+
+        Arguments:
+            nav (EchoNav): instance to observe.
+        """
+        self._nav = nav
+        self.sweeps: List[Tuple[float, float]] = []
+        self.intervals: List[Tuple[float, Optional[float]]] = []
+
+        capture = nav._ultrason_cap
+        speaker = nav._speaker_beep
+        read_all = capture.read_all
+        read_all_async = capture.read_all_async
+        update_closest = speaker.update_closest
+
+        def timed_read_all() -> Any:
+            start = time.perf_counter()
+            readings = read_all()
+            self.sweeps.append((start, time.perf_counter()))
+            return readings
+
+        async def timed_read_all_async(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            readings = await read_all_async(*args, **kwargs)
+            self.sweeps.append((start, time.perf_counter()))
+            return readings
+
+        def recorded_update(readings: Any) -> None:
+            update_closest(readings)
+            self.intervals.append((time.perf_counter(), speaker.interval))
+
+        capture.read_all = timed_read_all
+        capture.read_all_async = timed_read_all_async
+        speaker.update_closest = recorded_update
+
+    def reset(self) -> None:
+        """Forgets everything observed so far."""
+        self.sweeps.clear()
+        self.intervals.clear()
+
+    def threads(self) -> Dict[str, Optional[Thread]]:
+        """Returns the pipeline threads, by stage name.
+
+        Under the asyncio runtime, these are the event loop and the executor
+        threads. The flight recorder's writer is included while recording.
+        """
+        audio = getattr(self._nav._speaker_beep._stream, "_thread", None)
+        loop_thread = getattr(self._nav, "_loop_thread", None)
+        if loop_thread is not None:
+            workers = sorted(self._nav._executor._threads, key=lambda thread: thread.name)
+            threads = {"loop": loop_thread, "audio": audio}
+            threads.update({f"io{index}": thread for index, thread in enumerate(workers)})
+        else:
+            threads = {
+                "control": self._nav._thread,
+                "alarm": self._nav._alarm_thread,
+                "gyro": self._nav._angle_cap._thread,
+                "audio": audio
+            }
+        if self._nav._recorder:
+            threads["recorder"] = self._nav._recorder._thread
+        return threads
+
+    def cpu(self) -> Dict[str, Optional[float]]:
+        """Returns the CPU time of every pipeline thread so far (in s)."""
+        return {stage: thread_cpu(thread) for stage, thread in self.threads().items()}
+
+class ScenarioRun():
+    """Collects the events and responses of one scenario."""
+    def __init__(self, name: str, nav: Any, probe: PipelineProbe) -> None:
+        """Initializes an empty run.
+
+        Arguments:
+            name (str): scenario name.
+            nav (EchoNav): instance under test.
+            probe (PipelineProbe): probe attached to the instance.
+        """
+        self.name = name
+        self.world = hal.world()
+        self._speaker = nav._speaker_beep
+        self._probe = probe
+        self.alerts: List[Tuple[float, Optional[float]]] = []
+        self.turns: List[Tuple[float, TurnState]] = []
+
+    def set_distance(self, corner: CarCorner, distance: Optional[float]) -> None:
+        """Moves an obstacle and registers the beep interval it should lead to."""
+        self.world.set_distance(corner, distance)
+        closest = [d for d in (self.world.distance(c) for c in CarCorner) if d is not None]
+        expected = self._speaker._map_dist_to_duration(min(closest)) if closest else None
+        self.alerts.append((time.perf_counter(), expected))
+
+    def steer(self, segments: List[Tuple[float, float]]) -> None:
+        """Plays a list of (rate in deg/s, duration in s) steering segments in real time.
+
+        Registers the moment the true yaw crosses each turn threshold, together
+        with the turn state the display should then show.
+        """
+        from angle_capture.angle_capture import CENTER_TOL
+        yaw = 0.0
+        state = TurnState.IDLE
+        for rate, duration in segments:
+            start = time.perf_counter()
+            self.world.gyro_rate = rate
+            # Locate threshold crossings within the segment at 1 ms resolution.
+            for step in range(int(duration * 1000)):
+                yaw += rate * 0.001
+                new_state = TurnState.IDLE
+                if yaw < -CENTER_TOL:
+                    new_state = TurnState.LEFT_TURN
+                elif yaw > CENTER_TOL:
+                    new_state = TurnState.RIGHT_TURN
+                if new_state != state:
+                    state = new_state
+                    self.turns.append((start + step * 0.001, state))
+            time.sleep(max(0.0, start + duration - time.perf_counter()))
+        self.world.gyro_rate = 0.0
+
+    def alert_latencies(self) -> Tuple[List[float], int]:
+        """Matches every obstacle event with the first beep interval that reached it."""
+        latencies, missed = [], 0
+        previous: Optional[float] = None
+        for when, expected in self.alerts:
+            changed = expected != previous and not (
+                expected is not None and previous is not None and abs(expected - previous) <= ALERT_TOL
+            )
+            previous = expected
+            if not changed:
+                continue
+            response = None
+            for at, interval in self._probe.intervals:
+                if at < when or at > when + EVENT_TIMEOUT:
+                    continue
+                if expected is None and interval is None:
+                    response = at
+                elif expected is not None and interval is not None and interval <= expected + ALERT_TOL:
+                    response = at
+                if response is not None:
+                    break
+            if response is None:
+                missed += 1
+            else:
+                latencies.append(response - when)
+        return latencies, missed
+
+    def redraw_latencies(self) -> Tuple[List[float], int]:
+        """Matches every threshold crossing with the first LED frame showing its arrow."""
+        from angle_visual.angle_visual import ARROW_FRAMES
+        frames = list(self.world.frames)
+        latencies, missed = [], 0
+        for when, turn in self.turns:
+            response = next(
+                (at for at, pixels in frames
+                 if when <= at <= when + EVENT_TIMEOUT and pixels == ARROW_FRAMES[turn].pixels),
+                None
+            )
+            if response is None:
+                missed += 1
+            else:
+                latencies.append(response - when)
+        return latencies, missed
+
+def scenario_approach(run: ScenarioRun) -> None:
+    """Reverses towards a wall: the back-left obstacle closes in from 150 cm at 50 cm/s."""
+    for distance in range(150, 0, -5):
+        run.set_distance(CarCorner.BACK_LEFT, float(distance))
+        time.sleep(0.1)
+    time.sleep(1.0)
+    run.set_distance(CarCorner.BACK_LEFT, None)
+    time.sleep(1.0)
+
+def scenario_sudden_obstacle(run: ScenarioRun) -> None:
+    """Obstacles pop up close to random corners, then vanish again."""
+    rng = random.Random(1)
+    for _ in range(12):
+        corner = rng.choice(list(CarCorner))
+        run.set_distance(corner, rng.uniform(5.0, 40.0))
+        time.sleep(rng.uniform(0.6, 1.0))
+        run.set_distance(corner, None)
+        time.sleep(rng.uniform(0.6, 1.0))
+
+def scenario_sensor_dropout(run: ScenarioRun) -> None:
+    """One sensor is unplugged while obstacles keep appearing at another corner."""
+    run.world.disconnect(CarCorner.BACK_RIGHT)
+    try:
+        for distance in (30.0, 10.0, 45.0, 20.0, 8.0, 35.0):
+            run.set_distance(CarCorner.BACK_LEFT, distance)
+            time.sleep(0.8)
+            run.set_distance(CarCorner.BACK_LEFT, None)
+            time.sleep(0.8)
+    finally:
+        run.world.reconnect(CarCorner.BACK_RIGHT)
+
+def scenario_rapid_steering(run: ScenarioRun) -> None:
+    """The steering wheel is swung quickly from side to side."""
+    for _ in range(4):
+        run.steer([(100.0, 0.25), (0.0, 0.3), (-100.0, 0.5), (0.0, 0.3), (100.0, 0.25), (0.0, 0.4)])
+
+SCENARIOS: Dict[str, Callable[[ScenarioRun], None]] = {
+    "approach": scenario_approach,
+    "sudden_obstacle": scenario_sudden_obstacle,
+    "sensor_dropout": scenario_sensor_dropout,
+    "rapid_steering": scenario_rapid_steering
+}
+
+def reset_world() -> None:
+    """Clears every obstacle and stops any steering."""
+    world = hal.world()
+    for corner in CarCorner:
+        world.set_distance(corner, None)
+        world.reconnect(corner)
+    world.gyro_rate = 0.0
+    world.steering_angle = 0.0
+
+def run_scenario(name: str, nav: Any, probe: PipelineProbe) -> Dict[str, Any]:
+    """Runs one scenario against a running EchoNav and summarizes its results."""
+    reset_world()
+    time.sleep(SETTLE_TIME)
+    probe.reset()
+    nav.metrics.reset()
+    run = ScenarioRun(name, nav, probe)
+
+    cpu_before = probe.cpu()
+    start = time.perf_counter()
+    SCENARIOS[name](run)
+    elapsed = time.perf_counter() - start
+    cpu_after = probe.cpu()
+    misses = nav.deadline_misses() if hasattr(nav, "deadline_misses") else None
+
+    alerts, missed_alerts = run.alert_latencies()
+    redraws, missed_redraws = run.redraw_latencies()
+    sweep_times = [end - begin for begin, end in probe.sweeps]
+    return {
+        "duration_s": round(elapsed, 3),
+        "alert_latency": summarize(alerts, missed_alerts),
+        "redraw_latency": summarize(redraws, missed_redraws),
+        "sweep_rate_hz": round(len(probe.sweeps) / elapsed, 2),
+        "sweep_time": summarize(sweep_times, 0),
+        "cpu_s": {
+            stage: None if cpu_before[stage] is None or cpu_after[stage] is None
+            else round(cpu_after[stage] - cpu_before[stage], 4)
+            for stage in cpu_before
+            if stage in cpu_after
+        },
+        "deadline_misses": misses,
+        "stages": summarize_stages(nav.stage_latency())
+    }
+
+def git_revision() -> Optional[str]:
+    """Returns the current git commit, if available."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    """Prints the change of every latency percentile and sweep rate against an earlier run."""
+    print(
+        f"Comparing {current.get('revision')} ({current.get('runtime', 'threads')}) against "
+        f"{previous.get('revision')} ({previous.get('runtime', 'threads')}):"
+    )
+    for name, result in current["scenarios"].items():
+        old = previous.get("scenarios", {}).get(name)
+        if old is None:
+            continue
+        for metric in ("alert_latency", "redraw_latency", "sweep_time"):
+            for pct in PERCENTILES:
+                key = f"p{pct}_ms"
+                new_value, old_value = result[metric][key], old[metric][key]
+                if new_value is None or old_value is None:
+                    continue
+                print(f"  {name:16} {metric:15} {key:7} {old_value:9.2f} -> {new_value:9.2f} ms")
+        print(f"  {name:16} sweep_rate_hz           {old['sweep_rate_hz']:9.2f} -> {result['sweep_rate_hz']:9.2f}")
+
+def main() -> None:
+    """Runs the selected scenarios and writes the JSON report."""
+    parser = argparse.ArgumentParser(description="EchoNav end-to-end latency benchmarks.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                        help="scenario to run (repeatable), all of them by default")
+    parser.add_argument("--output", default="e2e_latency.json", help="JSON report to write")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    parser.add_argument("--runtime", choices=("threads", "asyncio"), default="threads",
+                        help="EchoNav runtime to measure")
+    parser.add_argument("--flight-log", help="ring file to record to while measuring, no recording if unset")
+    args = parser.parse_args()
+
+    # The simulated backend must be selected before the components are imported.
+    hal.configure(hal.SIMULATED)
+    from echo_nav import EchoNav
+    from echo_nav_async import AsyncEchoNav
+    runtime = AsyncEchoNav if args.runtime == "asyncio" else EchoNav
+
+    startup = time.perf_counter()
+    nav = runtime(debug=False, flight_log=args.flight_log)
+    construct = time.perf_counter() - startup
+    nav.wait_ready()
+    startup = time.perf_counter() - startup
+    probe = PipelineProbe(nav)
+    nav.toggle_program()
+
+    report: Dict[str, Any] = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "runtime": args.runtime,
+        "flight_log": args.flight_log is not None,
+        "construct_s": round(construct, 3),
+        "startup_s": round(startup, 3),
+        "scenarios": {}
+    }
+    try:
+        for name in args.scenario or list(SCENARIOS):
+            print(f"Running scenario: {name}")
+            report["scenarios"][name] = run_scenario(name, nav, probe)
+    finally:
+        nav.shutdown()
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
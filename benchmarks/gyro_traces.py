@@ -0,0 +1,219 @@
+"""Trace-based evaluation of the AngleCapture rate filters and yaw prediction.
+
+File: gyro_traces.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Replays recorded gyroscope traces through AngleCapture's YawTracker integration
+with every filter configuration, and measures how the turn state follows the
+steering wheel:
+
+- latency: from the wheel crossing a turn threshold, until the turn state
+  changes to match (negative when the prediction fires early).
+- stability: turn state changes that do not match any threshold crossing.
+
+Traces are .npz files holding the FIFO sample rate, the batch size, the raw
+z-axis samples, one accelerometer wheel angle per batch and, for synthetic
+traces, the true wheel angle per sample. Traces without a true angle are
+judged against the bias-corrected rate integrated offline.
+
+Usage:
+    python -m benchmarks.gyro_traces synth --output trace.npz [--seed 1]
+    python -m benchmarks.gyro_traces record --seconds 30 --output trace.npz
+    python -m benchmarks.gyro_traces evaluate trace.npz [more.npz ...] [--json results.json]
+"""
+import argparse
+import json
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import hal
+
+EARLY_WINDOW    = 0.3   # Earliest a predicted change still matches a threshold crossing (in s).
+MATCH_TIMEOUT   = 1.0   # Latest a change still matches a threshold crossing (in s).
+MIN_DWELL       = 0.1   # Shortest reference state that must be shown, briefer ones are optional (in s).
+TRACE_NOISE     = 0.3   # Gyroscope noise of synthetic traces (in deg/s).
+ACCEL_NOISE     = 1.0   # Accelerometer wheel angle noise of synthetic traces (in deg).
+TRACE_BIAS      = 0.8   # Initial gyroscope bias of synthetic traces (in deg/s).
+TRACE_DRIFT     = 0.02  # Bias drift of synthetic traces (in deg/s per s).
+
+# (rate in deg/s, duration in s) segments of the synthetic steering script.
+SYNTH_SEGMENTS: List[Tuple[float, float]] = [
+    (0.0, 1.0), (40.0, 0.5), (0.0, 1.0), (-40.0, 0.5), (0.0, 1.0),    # Slow turn and back.
+    (150.0, 0.15), (0.0, 0.5), (-300.0, 0.15), (0.0, 0.5), (150.0, 0.15), (0.0, 1.0),  # Quick swings.
+    (8.0, 0.3), (-16.0, 0.3), (8.0, 0.3), (0.0, 1.0),                  # Wiggle inside the dead zone.
+    (15.0, 1.2), (0.0, 4.0), (-15.0, 1.2), (0.0, 2.0),                 # Slow turn held for a while.
+]
+
+def synth_trace(rate_hz: float, batch: int, seed: int) -> Dict[str, Any]:
+    """Generates a noisy, drifting trace of SYNTH_SEGMENTS with its true wheel angle."""
+    rng = np.random.default_rng(seed)
+    rates = np.concatenate([np.full(int(duration * rate_hz), rate) for rate, duration in SYNTH_SEGMENTS])
+    truth = np.cumsum(rates) / rate_hz
+    times = np.arange(len(rates)) / rate_hz
+    z = rates + TRACE_BIAS + TRACE_DRIFT * times + rng.normal(0.0, TRACE_NOISE, len(rates))
+    accel = truth[batch - 1::batch] + rng.normal(0.0, ACCEL_NOISE, len(rates) // batch)
+    return {"rate_hz": rate_hz, "batch": batch, "bias": TRACE_BIAS, "z": z, "accel": accel, "truth": truth}
+
+def record_trace(seconds: float, rate_hz: float, batch: int) -> Dict[str, Any]:
+    """Records the configured backend's gyroscope, after a still second to measure its bias."""
+    from angle_capture.angle_capture import I2C_ADDR
+    gyro = hal.gyro(I2C_ADDR)
+    fifo = hal.gyro_fifo(gyro)
+    rate_hz = fifo.start_fifo(rate_hz)
+    z: List[np.ndarray] = []
+    accel: List[float] = []
+    try:
+        print("Keep the wheel centred and still...")
+        time.sleep(1.0)
+        bias = float(np.mean(fifo.read_fifo_z()))
+        print(f"Recording for {seconds} s, steer away!")
+        end = time.perf_counter() + seconds
+        pending = np.empty(0)
+        while time.perf_counter() < end:
+            time.sleep(batch / rate_hz)
+            pending = np.concatenate([pending, fifo.read_fifo_z()])
+            while len(pending) >= batch:
+                z.append(pending[:batch])
+                pending = pending[batch:]
+                data = gyro.get_accel_data()
+                accel.append(math.degrees(math.atan2(data["x"], data["y"])))
+    finally:
+        fifo.stop_fifo()
+    return {"rate_hz": rate_hz, "batch": batch, "bias": bias, "z": np.concatenate(z), "accel": np.array(accel)}
+
+def reference_angle(trace: Dict[str, Any]) -> np.ndarray:
+    """Returns the true wheel angle, or the bias-corrected rate integrated offline if unknown."""
+    if "truth" in trace:
+        return trace["truth"]
+    window = max(1, int(trace["rate_hz"] * 0.02))
+    smoothed = np.convolve(trace["z"] - trace["bias"], np.ones(window) / window, mode="same")
+    return np.cumsum(smoothed) / trace["rate_hz"]
+
+def turn_changes(angle: np.ndarray, rate_hz: float) -> List[Tuple[float, Any, bool]]:
+    """Returns the (time, TurnState, required) changes of the wheel angle, thresholded like AngleCapture.
+
+    States held for less than MIN_DWELL (swinging through centre) are not
+    required: showing them is neither a miss nor spurious.
+    """
+    from common_api.angle import TurnState
+    from angle_capture.angle_capture import CENTER_TOL
+    states = np.where(angle < -CENTER_TOL, int(TurnState.LEFT_TURN),
+                      np.where(angle > CENTER_TOL, int(TurnState.RIGHT_TURN), int(TurnState.IDLE)))
+    changes = [
+        (index / rate_hz, TurnState(int(states[index])))
+        for index in np.flatnonzero(np.diff(states)) + 1
+    ]
+    return [
+        (when, state, following[0] - when >= MIN_DWELL)
+        for (when, state), following in zip(changes, changes[1:] + [(math.inf, None)])
+    ]
+
+def replay(tracker: Any, trace: Dict[str, Any]) -> List[Tuple[float, Any]]:
+    """Runs a trace through the YawTracker's batched integration, returning its turn state changes."""
+    from common_api.angle import TurnState
+    dt = 1.0 / trace["rate_hz"]
+    batch = int(trace["batch"])
+    z = trace["z"] - trace["bias"]
+    state = TurnState.IDLE
+    changes = []
+    for index, start in enumerate(range(0, len(z) - batch + 1, batch)):
+        if tracker.uses_accel:
+            tracker.observe_accel(float(trace["accel"][index]))
+        new_state = tracker.integrate(z[start:start + batch], dt)
+        if new_state != state:
+            state = new_state
+            changes.append(((start + batch) * dt, state))
+    return changes
+
+def score(reference: List[Tuple[float, Any, bool]], estimate: List[Tuple[float, Any]]) -> Dict[str, Any]:
+    """Matches every reference change with the first estimated change to the same state."""
+    latencies, missed, used = [], 0, set()
+    for when, state, required in reference:
+        match = next(
+            (i for i, (at, est) in enumerate(estimate)
+             if i not in used and est == state and when - EARLY_WINDOW <= at <= when + MATCH_TIMEOUT),
+            None
+        )
+        if match is not None:
+            used.add(match)
+            if required:
+                latencies.append(estimate[match][0] - when)
+        elif required:
+            missed += 1
+    ms = sorted(1000 * latency for latency in latencies)
+    return {
+        "changes": sum(1 for _, _, required in reference if required),
+        "missed": missed,
+        "spurious": len(estimate) - len(used),
+        "median_ms": round(ms[len(ms) // 2], 1) if ms else None,
+        "max_ms": round(ms[-1], 1) if ms else None
+    }
+
+def filter_configs() -> Dict[str, Callable[[], Tuple[Any, float]]]:
+    """Returns the (rate filter, prediction horizon) configurations to compare, by name."""
+    from angle_capture.angle_capture import LPF_TIME_CONST, PREDICT_HORIZON
+    from angle_capture.rate_filter import (
+        PassThroughFilter, LowPassFilter, OneEuroFilter, ComplementaryFilter
+    )
+    return {
+        "none": lambda: (PassThroughFilter(), 0.0),
+        "lowpass": lambda: (LowPassFilter(LPF_TIME_CONST), 0.0),
+        "lowpass+predict": lambda: (LowPassFilter(LPF_TIME_CONST), PREDICT_HORIZON),
+        "one_euro": lambda: (OneEuroFilter(), 0.0),
+        "one_euro+predict": lambda: (OneEuroFilter(), PREDICT_HORIZON),
+        "complementary+predict": lambda: (ComplementaryFilter(inner=OneEuroFilter()), PREDICT_HORIZON)
+    }
+
+def evaluate(paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Scores every filter configuration on every trace."""
+    from angle_capture import YawTracker
+    results: Dict[str, Dict[str, Any]] = {}
+    for path in paths:
+        trace = dict(np.load(path))
+        reference = turn_changes(reference_angle(trace), float(trace["rate_hz"]))
+        results[path] = {}
+        for name, make in filter_configs().items():
+            rate_filter, predict = make()
+            results[path][name] = score(reference, replay(YawTracker(rate_filter, predict), trace))
+    return results
+
+def main() -> None:
+    """Synthesizes, records or evaluates gyroscope traces."""
+    from angle_capture.angle_capture import FIFO_HZ, BATCH_HZ
+    parser = argparse.ArgumentParser(description="EchoNav gyroscope trace evaluation.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    synth = sub.add_parser("synth", help="write a synthetic trace with its true wheel angle")
+    synth.add_argument("--output", required=True)
+    synth.add_argument("--seed", type=int, default=1)
+    record = sub.add_parser("record", help="record a trace from the configured backend")
+    record.add_argument("--output", required=True)
+    record.add_argument("--seconds", type=float, default=30.0)
+    ev = sub.add_parser("evaluate", help="score every filter configuration on traces")
+    ev.add_argument("traces", nargs="+")
+    ev.add_argument("--json", help="file to write the results to")
+    args = parser.parse_args()
+
+    batch = FIFO_HZ // BATCH_HZ
+    if args.command == "synth":
+        np.savez(args.output, **synth_trace(FIFO_HZ, batch, args.seed))
+    elif args.command == "record":
+        np.savez(args.output, **record_trace(args.seconds, FIFO_HZ, batch))
+    else:
+        results = evaluate(args.traces)
+        for path, configs in results.items():
+            print(path)
+            print(f"  {'config':24} {'changes':>7} {'missed':>7} {'spurious':>8} {'median ms':>10} {'max ms':>8}")
+            for name, r in configs.items():
+                median = "-" if r["median_ms"] is None else f"{r['median_ms']:.1f}"
+                worst = "-" if r["max_ms"] is None else f"{r['max_ms']:.1f}"
+                print(f"  {name:24} {r['changes']:7} {r['missed']:7} {r['spurious']:8} {median:>10} {worst:>8}")
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
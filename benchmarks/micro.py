@@ -0,0 +1,185 @@
+"""Micro-benchmarks for the per-reading hot paths of EchoNav.
+
+File: micro.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Times the functions that run on every sweep, gyro sample or redraw, and counts
+the memory they allocate, against the simulated backend. Results are compared
+with a baseline file so that regressions in the inner loops are caught before
+they reach the car. Timings are machine specific, so the baseline should be
+refreshed (--update-baseline) on the machine it is checked on.
+
+Usage:
+    python -m benchmarks.micro [--check] [--update-baseline] [--bench is_stable]
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+import hal
+
+BASELINE_FILE   = os.path.join(os.path.dirname(__file__), "baseline_micro.json")
+ROUNDS          = 5     # Timed rounds per benchmark, the fastest one is kept.
+TIME_TOL        = 0.25  # Allowed CPU time growth over the baseline before failing --check.
+ALLOC_SLACK     = 64    # Allowed peak allocation growth over the baseline (in bytes).
+
+Bench = Tuple[Callable[[], Any], int]
+
+def measure(func: Callable[[], Any], calls: int) -> Dict[str, float]:
+    """Times a function and measures its allocations.
+
+    Arguments:
+        func (Callable): function under test, called without arguments.
+        calls (int): calls per timed round.
+
+    Returns:
+        (Dict[str, float]): wall and CPU time per call (in ns), the peak memory
+        allocated by a single call (in bytes) and the net blocks left behind per call.
+    """
+    for _ in range(min(calls, 100)):
+        func()
+
+    wall, cpu = float("inf"), float("inf")
+    for _ in range(ROUNDS):
+        wall_start, cpu_start = time.perf_counter_ns(), time.thread_time_ns()
+        for _ in range(calls):
+            func()
+        cpu = min(cpu, (time.thread_time_ns() - cpu_start) / calls)
+        wall = min(wall, (time.perf_counter_ns() - wall_start) / calls)
+
+    tracemalloc.start()
+    try:
+        func()
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+
+        blocks_start = sys.getallocatedblocks()
+        for _ in range(calls):
+            func()
+        blocks = (sys.getallocatedblocks() - blocks_start) / calls
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "wall_ns": round(wall, 1),
+        "cpu_ns": round(cpu, 1),
+        "peak_bytes": max(0, peak - base),
+        "net_blocks": round(blocks, 3)
+    }
+
+def build_benchmarks() -> Dict[str, Bench]:
+    """Builds every benchmark against freshly constructed, simulated components."""
+    from common_api.angle import TurnState
+    from common_api.distance import CarCorner, DistanceReading
+    from ultrasonic_capture.ultrasonic_capture import UltrasonicCapture
+    from speaker_beep import SpeakerBeep
+    from angle_capture import AngleCapture
+    from angle_capture.angle_capture import FIFO_HZ, BATCH_HZ
+    from angle_visual.angle_visual import ARROW_FRAMES
+    from common_api.metrics import Histogram
+
+    world = hal.world()
+    for corner, distance in zip(CarCorner, (25.0, 80.0, 150.0, None)):
+        world.set_distance(corner, distance)
+
+    capture = UltrasonicCapture(debug=False, adaptive=False)
+    sensor = capture._sensors[0]
+    speaker = SpeakerBeep()
+    # Only the update path is measured, the audio thread would only add noise.
+    speaker.readiness.wait()
+    speaker.close()
+    angle = AngleCapture(bias_cache=None)
+    visual = angle._angle_vis
+
+    burst = [25.1, 24.9, 25.3]
+    readings = [
+        DistanceReading(corner, distance, 1.0)
+        for corner, distance in zip(CarCorner, (25.0, 80.0, None, 150.0))
+    ]
+    corner = CarCorner.FRONT_LEFT
+    gyro_block = np.resize([12.5, -12.5], FIFO_HZ // BATCH_HZ)
+    histogram = Histogram("bench")
+    # Alternate the arrows, as a repeated one is not written again.
+    frames = itertools.cycle((ARROW_FRAMES[TurnState.LEFT_TURN], ARROW_FRAMES[TurnState.RIGHT_TURN]))
+
+    return {
+        "is_stable": (lambda: sensor._is_stable(burst), 20000),
+        "reading_from": (lambda: sensor.reading_from([25.0]), 20000),
+        "read_distance": (sensor.read_distance, 5),
+        "read_all": (capture.read_all, 5),
+        "update_closest": (lambda: speaker.update_closest(readings), 20000),
+        "map_dist_to_duration": (lambda: speaker._map_dist_to_duration(25.0), 50000),
+        "angle_integrate_step": (lambda: angle._integrate_step(12.5, 0.01), 50000),
+        "angle_integrate_block": (lambda: angle._integrate_block(gyro_block, 0.002), 20000),
+        "display_arrow": (lambda: visual._display_arrow(next(frames)), 2000),
+        "corner_pins": (lambda: corner.pins, 100000),
+        "corner_print_name": (lambda: corner.print_name, 100000),
+        "histogram_record": (lambda: histogram.record(26_000_000), 100000)
+    }
+
+def check(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any]) -> List[str]:
+    """Compares results with the baseline, returning one message per regression."""
+    failures = []
+    for name, result in results.items():
+        old = baseline.get("benchmarks", {}).get(name)
+        if old is None:
+            continue
+        if result["cpu_ns"] > old["cpu_ns"] * (1 + TIME_TOL):
+            failures.append(f"{name}: cpu {old['cpu_ns']} -> {result['cpu_ns']} ns/call")
+        if result["peak_bytes"] > old["peak_bytes"] + ALLOC_SLACK:
+            failures.append(f"{name}: peak alloc {old['peak_bytes']} -> {result['peak_bytes']} B/call")
+    return failures
+
+def main() -> None:
+    """Runs the micro-benchmarks, optionally checking or updating the baseline."""
+    parser = argparse.ArgumentParser(description="EchoNav hot path micro-benchmarks.")
+    parser.add_argument("--bench", action="append", help="benchmark to run (repeatable), all by default")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline file to compare with")
+    parser.add_argument("--check", action="store_true", help="exit with an error on any regression")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline")
+    args = parser.parse_args()
+
+    # The simulated backend must be selected before the components are imported.
+    hal.configure(hal.SIMULATED)
+    benchmarks = build_benchmarks()
+    names = args.bench or list(benchmarks)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name in names:
+        func, calls = benchmarks[name]
+        results[name] = measure(func, calls)
+        r = results[name]
+        print(f"{name:22} {r['cpu_ns']:12.1f} cpu ns {r['wall_ns']:14.1f} wall ns "
+              f"{r['peak_bytes']:8} B peak {r['net_blocks']:8.3f} blocks")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "benchmarks": results
+            }, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            failures = check(results, json.load(f))
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures and args.check:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+"""Faster-than-real-time replay of recorded flight logs through the EchoNav processing stages.
+
+File: replay.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Feeds the pings and gyroscope samples of a flight log (see flight_recorder)
+back through the code the car runs: the DistanceFilter of every sensor, the
+SpeakerBeep interval mapping and the YawTracker integration behind AngleCapture.
+Time is taken from the record timestamps rather than the wall clock, so a
+replay runs as fast as the CPU allows and an hour of driving is re-processed
+in seconds.
+
+Every replay reports how the feedback behaved, and how closely it agrees with
+the feedback recorded on the car, which is 1.0 when replaying with the
+parameters the log was recorded with:
+
+- readings: share of OK readings, successive-reading jitter, and agreement
+  with the recorded readings.
+- alerts: time spent beeping, interval changes (flapping), and agreement of
+  the beep interval with the recorded beeps.
+- turns: turn state changes, flicker (changes reverted within FLICKER_WINDOW),
+  and agreement with the recorded turn state.
+
+Parameter sweeps replay the log once per combination of MAX_DEV,
+MAPPING_EXPONENT, CENTER_TOL and LEAK_PER_SEC, spread over worker processes.
+
+Usage:
+    python -m benchmarks.replay run ~/.echonav/flight.rec [--set CENTER_TOL=4] [--json results.json]
+    python -m benchmarks.replay sweep ~/.echonav/flight.rec --grid CENTER_TOL=3,5,7 --grid LEAK_PER_SEC=0.01,0.02 [--workers 4]
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import hal
+
+READING_TOL     = 0.5   # Replayed distance counted as matching the recorded one (in cm).
+ALERT_TOL       = 0.02  # Beep interval counted as matching, or as unchanged (in s).
+FLICKER_WINDOW  = 0.3   # Turn state changes reverted within this window count as flicker (in s).
+
+# Tunable parameters, by the module they are read from.
+PARAMETERS: Dict[str, str] = {
+    "MAX_DEV": "ultrasonic_capture.ultrasonic_capture",
+    "MAPPING_EXPONENT": "speaker_beep.speaker_beep",
+    "CENTER_TOL": "angle_capture.angle_capture",
+    "LEAK_PER_SEC": "angle_capture.angle_capture"
+}
+
+def apply_params(params: Dict[str, float]) -> None:
+    """Overrides tunable parameters for the rest of the process.
+
+    The parameters are module constants read at call time, so a replay
+    process sets them before replaying. Never call this in a live EchoNav process.
+    """
+    import importlib
+    for name, value in params.items():
+        if name not in PARAMETERS:
+            raise ValueError(f"unknown parameter {name}, expected one of {', '.join(PARAMETERS)}")
+        setattr(importlib.import_module(PARAMETERS[name]), name, value)
+
+def current_params() -> Dict[str, float]:
+    """Returns the current value of every tunable parameter."""
+    import importlib
+    return {name: getattr(importlib.import_module(module), name) for name, module in PARAMETERS.items()}
+
+def split_sessions(records: np.ndarray) -> List[np.ndarray]:
+    """Splits a log at its SESSION records, since timestamps restart with every run."""
+    from flight_recorder import RecordKind
+    starts = np.flatnonzero(records["kind"] == RecordKind.SESSION)
+    bounds = [0] + [int(start) for start in starts if start > 0] + [len(records)]
+    return [records[begin:end] for begin, end in zip(bounds, bounds[1:]) if end > begin]
+
+def _state_at(times: np.ndarray, change_times: List[float], change_states: List[int]) -> np.ndarray:
+    """Returns the state in force at each time, starting IDLE (0) before the first change."""
+    if not change_times:
+        return np.zeros(len(times), dtype=int)
+    states = np.concatenate([[0], change_states])
+    return states[np.searchsorted(change_times, times, side="right")]
+
+class Replayer():
+    """Runs recorded sessions through the EchoNav processing stages, on a virtual clock.
+
+    Only the pure stages are built, the distance filters, the yaw tracker and
+    the beep interval mapping, so no GPIO pin, gyroscope or audio device is
+    opened and no calibration thread is started. They are rebuilt before
+    every session, with the current parameters.
+    """
+    def __init__(self) -> None:
+        """Prepares the gyroscope batching of the FIFO loop."""
+        from angle_capture.angle_capture import FIFO_HZ, BATCH_HZ
+        self._batch = FIFO_HZ // BATCH_HZ
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forgets the state of every stage, and rebuilds the filters with the current parameters."""
+        from angle_capture import YawTracker
+        from common_api.angle import TurnState
+        from common_api.distance import CarCorner
+        from ultrasonic_capture import ultrasonic_capture
+        from ultrasonic_capture.distance_filter import DistanceFilter
+        self._filters = {corner: DistanceFilter(ultrasonic_capture.MAX_DEV) for corner in CarCorner}
+        self._tracker = YawTracker()
+        self._turn_state = TurnState.IDLE
+
+    def _gyro_chunks(self, records: np.ndarray) -> List[np.ndarray]:
+        """Splits the gyroscope records into the batches the FIFO loop would integrate."""
+        from flight_recorder import RecordKind
+        gyro = np.flatnonzero(records["kind"] == RecordKind.GYRO)
+        return np.array_split(gyro, range(self._batch, len(gyro), self._batch)) if len(gyro) else []
+
+    def replay(self, records: np.ndarray) -> Dict[str, Any]:
+        """Replays one session, returning the raw traces of its feedback.
+
+        Arguments:
+            records (np.ndarray): records of one session, oldest first.
+
+        Returns:
+            (Dict[str, Any]): the replayed readings, intervals and turn changes with
+            their virtual times, and the recorded ones to compare them with.
+        """
+        from common_api.distance import CarCorner, DistanceReading, ReadingStatus
+        from flight_recorder import RecordKind
+        from speaker_beep import SpeakerBeep
+        from ultrasonic_capture.ultrasonic_capture import SOUND_SPEED, filtered_reading
+        self._reset()
+        times = records["t_ns"] * 1e-9
+        kinds = records["kind"]
+        pings = np.flatnonzero(kinds == RecordKind.PING)
+        chunks = self._gyro_chunks(records)
+
+        # Pings and gyroscope batches, in the order the car processed them.
+        event_times = np.concatenate([times[pings], [times[chunk[-1]] for chunk in chunks]])
+        order = np.argsort(event_times, kind="stable")
+
+        latest: Dict[CarCorner, DistanceReading] = {}
+        readings: List[Tuple[float, int, float]] = []
+        intervals: List[Tuple[float, Optional[float]]] = [(float(times[0]), None)]
+        turns: List[Tuple[float, int]] = []
+        for event in order.tolist():
+            now = float(event_times[event])
+            if event < len(pings):
+                record = records[pings[event]]
+                corner = CarCorner(int(record["arg"]))
+                status = ReadingStatus(int(record["status"]))
+                if status == ReadingStatus.ERROR:
+                    reading = DistanceReading(corner, None, 0.0, now, ReadingStatus.ERROR)
+                else:
+                    echo = float(record["a"])
+                    distance = None if math.isnan(echo) else round(echo * SOUND_SPEED, 2)
+                    reading = filtered_reading(corner, self._filters[corner], [distance], status, now)
+                latest[corner] = reading
+                readings.append((now, corner, math.nan if reading.distance is None else reading.distance))
+                interval = SpeakerBeep.interval_for(list(latest.values()))
+                if interval != intervals[-1][1]:
+                    intervals.append((now, interval))
+            else:
+                chunk = chunks[event - len(pings)]
+                rates, steps = records["a"][chunk], records["b"][chunk]
+                if np.all(steps == steps[0]):
+                    state = self._tracker.integrate(rates, float(steps[0]))
+                else:
+                    # Samples read one at a time (GyroSampling.SINGLE), each with its own step.
+                    for rate, dt in zip(rates.tolist(), steps.tolist()):
+                        state = self._tracker.step(rate, dt)
+                if state != self._turn_state:
+                    self._turn_state = state
+                    turns.append((now, int(state)))
+
+        recorded_turns = records[kinds == RecordKind.TURN]
+        recorded_beeps = records[kinds == RecordKind.BEEP]
+        recorded_readings = records[kinds == RecordKind.READING]
+        return {
+            "start": float(times[0]),
+            "end": float(times[-1]),
+            "readings": readings,
+            "intervals": intervals,
+            "turns": turns,
+            "gyro_times": np.array([times[chunk[-1]] for chunk in chunks]),
+            "recorded_turns": (recorded_turns["t_ns"] * 1e-9, recorded_turns["arg"].astype(int)),
+            "recorded_beeps": (recorded_beeps["t_ns"] * 1e-9, recorded_beeps["a"]),
+            "recorded_readings": (
+                recorded_readings["t_ns"] * 1e-9, recorded_readings["arg"].astype(int), recorded_readings["a"]
+            )
+        }
+
+def summarize(traces: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Turns the traces of every session into the metrics of one replay."""
+    ok, jitter, matched, compared = 0, [], 0, 0
+    alert_s, changes, beep_matched, beeps = 0.0, 0, 0, 0
+    turn_changes, flicker, turn_equal, turn_samples = 0, 0, 0, 0
+    duration, reading_count = 0.0, 0
+    for trace in traces:
+        duration += trace["end"] - trace["start"]
+        reading_count += len(trace["readings"])
+
+        # Readings: OK share, jitter per corner, and agreement with the first recorded reading after each ping.
+        rec_times, rec_corners, rec_distances = trace["recorded_readings"]
+        by_corner = {
+            corner: (rec_times[rec_corners == corner], rec_distances[rec_corners == corner])
+            for corner in np.unique(rec_corners).tolist()
+        }
+        previous: Dict[int, float] = {}
+        for when, corner, distance in trace["readings"]:
+            if not math.isnan(distance):
+                ok += 1
+                if not math.isnan(previous.get(corner, math.nan)):
+                    jitter.append(abs(distance - previous[corner]))
+            previous[corner] = distance
+            corner_times, corner_distances = by_corner.get(int(corner), (rec_times[:0], rec_distances[:0]))
+            index = int(np.searchsorted(corner_times, when))
+            if index < len(corner_times):
+                compared += 1
+                recorded = float(corner_distances[index])
+                if (math.isnan(distance) and math.isnan(recorded)) or abs(distance - recorded) <= READING_TOL:
+                    matched += 1
+
+        # Alerts: time beeping, flapping, and the interval in force at every recorded beep.
+        intervals = trace["intervals"] + [(trace["end"], None)]
+        last_interval: Optional[float] = None
+        for (when, interval), (until, _) in zip(intervals, intervals[1:]):
+            if interval is not None:
+                alert_s += until - when
+                if last_interval is not None and abs(interval - last_interval) > ALERT_TOL:
+                    changes += 1
+                last_interval = interval
+        change_times = [when for when, _ in trace["intervals"]]
+        for when, recorded in zip(*trace["recorded_beeps"]):
+            index = int(np.searchsorted(change_times, when, side="right")) - 1
+            replayed = trace["intervals"][index][1] if index >= 0 else None
+            beeps += 1
+            if replayed is not None and abs(replayed - recorded) <= ALERT_TOL:
+                beep_matched += 1
+
+        # Turns: changes, quick reversals, and agreement with the recorded turn state at every batch.
+        turn_changes += len(trace["turns"])
+        for (when, _), (after, _) in zip(trace["turns"], trace["turns"][1:]):
+            if after - when < FLICKER_WINDOW:
+                flicker += 1
+        gyro_times = trace["gyro_times"]
+        replayed_states = _state_at(gyro_times, [t for t, _ in trace["turns"]], [s for _, s in trace["turns"]])
+        rec_times, rec_states = trace["recorded_turns"]
+        recorded_states = _state_at(gyro_times, list(rec_times), list(rec_states))
+        turn_equal += int(np.count_nonzero(replayed_states == recorded_states))
+        turn_samples += len(gyro_times)
+
+    def ratio(part: float, whole: float) -> Optional[float]:
+        return round(part / whole, 4) if whole else None
+
+    return {
+        "duration_s": round(duration, 2),
+        "readings": reading_count,
+        "ok_ratio": ratio(ok, reading_count),
+        "jitter_cm": round(float(np.mean(jitter)), 3) if jitter else None,
+        "reading_agreement": ratio(matched, compared),
+        "alert_s": round(alert_s, 2),
+        "interval_changes": changes,
+        "beep_agreement": ratio(beep_matched, beeps),
+        "turn_changes": turn_changes,
+        "turn_flicker": flicker,
+        "turn_agreement": ratio(turn_equal, turn_samples)
+    }
+
+# Per-process state of the sweep workers.
+_worker: Dict[str, Any] = {}
+
+def _init_worker(path: str) -> None:
+    """Loads the log and builds the replayer once per worker process."""
+    from flight_recorder import FlightLog
+    log = FlightLog(path)
+    try:
+        _worker["sessions"] = split_sessions(log.records())
+    finally:
+        log.close()
+    _worker["replayer"] = Replayer()
+    _worker["defaults"] = current_params()
+
+def _run(params: Dict[str, float]) -> Dict[str, Any]:
+    """Replays every session of the worker's log with a set of parameters."""
+    apply_params({**_worker["defaults"], **params})
+    start = time.perf_counter()
+    traces = [_worker["replayer"].replay(session) for session in _worker["sessions"]]
+    wall = time.perf_counter() - start
+    result = summarize(traces)
+    result["wall_s"] = round(wall, 3)
+    result["speedup"] = round(result["duration_s"] / wall, 1) if wall > 0 else None
+    return {"params": current_params(), "metrics": result}
+
+def run(path: str, params: Dict[str, float]) -> Dict[str, Any]:
+    """Replays a log in this process."""
+    _init_worker(path)
+    return _run(params)
+
+def sweep(path: str, grid: Dict[str, List[float]], workers: Optional[int]) -> List[Dict[str, Any]]:
+    """Replays a log once per combination of the grid values, over worker processes."""
+    names = list(grid)
+    combinations = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path,)) as pool:
+        return list(pool.map(_run, combinations))
+
+def parse_assignments(items: List[str]) -> Dict[str, List[float]]:
+    """Parses NAME=value[,value...] arguments."""
+    parsed: Dict[str, List[float]] = {}
+    for item in items:
+        name, _, values = item.partition("=")
+        if name not in PARAMETERS or not values:
+            raise SystemExit(f"expected NAME=value[,value...] with NAME one of {', '.join(PARAMETERS)}: {item}")
+        parsed[name] = [float(value) for value in values.split(",")]
+    return parsed
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """Prints one line of metrics per replay."""
+    columns = ("ok_ratio", "jitter_cm", "reading_agreement", "alert_s", "interval_changes",
+               "beep_agreement", "turn_changes", "turn_flicker", "turn_agreement", "speedup")
+    print("  ".join(f"{name:>16}" for name in PARAMETERS) + "  " + "  ".join(f"{c:>17}" for c in columns))
+    for result in results:
+        values = "  ".join(f"{result['params'][name]:>16g}" for name in PARAMETERS)
+        metrics = "  ".join(f"{str(result['metrics'][c]):>17}" for c in columns)
+        print(f"{values}  {metrics}")
+
+def main() -> None:
+    """Replays a flight log once, or sweeps parameters over it."""
+    from flight_recorder import FLIGHT_LOG
+    parser = argparse.ArgumentParser(description="EchoNav flight log replay.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    single = sub.add_parser("run", help="replay a log once")
+    single.add_argument("log", nargs="?", default=FLIGHT_LOG)
+    single.add_argument("--set", action="append", default=[], help="NAME=value parameter override")
+    single.add_argument("--json", help="file to write the results to")
+    grid = sub.add_parser("sweep", help="replay a log once per parameter combination")
+    grid.add_argument("log", nargs="?", default=FLIGHT_LOG)
+    grid.add_argument("--grid", action="append", default=[], help="NAME=value,value,... values to sweep")
+    grid.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    grid.add_argument("--json", help="file to write the results to")
+    args = parser.parse_args()
+
+    # The simulated backend must be selected before the components are imported.
+    hal.configure(hal.SIMULATED)
+    if args.command == "run":
+        overrides = {name: values[-1] for name, values in parse_assignments(args.set).items()}
+        results = [run(args.log, overrides)]
+    else:
+        results = sweep(args.log, parse_assignments(args.grid), args.workers)
+
+    print_results(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,10 @@
 
 File: angle.py
 Author: Josh Dean
-Last Modified: 21/10/2025
+Last Modified: 16/10/2026
 """
 from enum import IntEnum
+from dataclasses import dataclass
 
 class TurnState(IntEnum):
     """Represents the current turning state of the vehicle.
@@ -27,3 +28,11 @@ class TurnState(IntEnum):
             self.RIGHT_TURN : "Right Turn"
         }
         return name_map.get(self)
+
+@dataclass(frozen=True)
+class AngleSnapshot:
+    """Immutable DTO holding the latest steering estimate of AngleCapture."""
+    yaw: float              # Estimated steering wheel angle, negative to the left (in deg).
+    rate: float             # Filtered z-axis rate (in deg/s).
+    turn_state: TurnState   # Turn state shown on the display.
+    timestamp: float        # Monotonic time of the estimate (in s).
@@ -0,0 +1,68 @@
+"""This module paces the periodic coroutines of the asyncio runtime.
+
+File: deadline.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Every periodic task of the asyncio runtime (sensor sweeps, gyroscope sampling) runs against
+absolute deadlines, so the time spent in each iteration does not push the
+next one back. Deadlines that pass before the task gets
+control back are counted, which shows whether the single event loop keeps up.
+A task that must not idle (the sensor sweeps) instead begins each period as
+soon as the previous one ends, and counts the periods that overran.
+"""
+import asyncio
+import time
+from typing import Optional
+
+class Deadlines():
+    """Absolute deadlines of one periodic coroutine, with a count of the missed ones."""
+    def __init__(self, period: float) -> None:
+        """Initializes the schedule, starting at the first `wait`.
+
+        Arguments:
+            period (float): time between two deadlines (in s).
+        """
+        self._period = period
+        self._next: Optional[float] = None
+        self._end: Optional[float] = None       # Deadline of the iteration begun, see `begin`.
+        self._missed: int = 0
+
+    @property
+    def period(self) -> float:
+        """Returns the time between two deadlines (in s)."""
+        return self._period
+
+    @property
+    def missed(self) -> int:
+        """Returns how many deadlines had already passed when they were waited for."""
+        return self._missed
+
+    async def wait(self) -> None:
+        """Sleeps until the next deadline.
+
+        A missed deadline is counted, and the schedule restarts from now rather
+        than running the missed iterations back to back.
+        """
+        now = time.monotonic()
+        self._next = now if self._next is None else self._next + self._period
+        delay = self._next - now
+        if delay < 0:
+            self._missed += 1
+            self._next = now
+            delay = 0.0
+        await asyncio.sleep(delay)
+
+    def begin(self, period: Optional[float] = None) -> None:
+        """Begins the next iteration now, for a task that runs back to back instead of waiting.
+
+        Its deadline is then the time it must end by, and the previous
+        iteration is counted as missed if it overran its own.
+
+        Arguments:
+            period (float | None): time this iteration may take (in s), the fixed period if None.
+        """
+        now = time.monotonic()
+        if self._end is not None and now > self._end:
+            self._missed += 1
+        self._end = now + (self._period if period is None else period)
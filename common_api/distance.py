@@ -2,10 +2,10 @@
 
 File: distance.py
 Author: Josh Dean
-Last Modified: 21/10/2025
+Last Modified: 16/10/2026
 """
 from enum import IntEnum
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -36,8 +36,55 @@ class CarCorner(IntEnum):
         }
         return pin_map.get(self)
     
+class ReadingStatus(IntEnum):
+    """Explains the outcome of a distance reading.
+
+    Eight possible states:
+    - OK -> a valid distance was measured.
+    - OUT_OF_RANGE -> no echo returned within the sensor's max range.
+    - UNSTABLE -> echoes returned, but they disagreed too much to be trusted.
+    - ERROR -> the sensor raised an error while being read.
+    - NO_RESPONSE -> the sensor never started an echo, it may be unplugged.
+    - SENSOR_FAULT -> the sensor keeps failing and is skipped until it recovers.
+    - NOT_READY -> the sensor is still settling after start-up.
+    - BUSY -> the echo line was still high from an earlier pulse, so the ping was skipped.
+    """
+    OK              = 0
+    OUT_OF_RANGE    = 1
+    UNSTABLE        = 2
+    ERROR           = 3
+    NO_RESPONSE     = 4
+    SENSOR_FAULT    = 5
+    NOT_READY       = 6
+    BUSY            = 7
+
 @dataclass
 class DistanceReading:
-    """DTO representing a single distance measurement from one sensor."""
+    """DTO representing a single distance measurement from one sensor.
+    
+    The confidence is in [0, 1], or None if the producer does not rate its readings.
+    The timestamp is the monotonic time (in s) the reading was produced, if known.
+    """
     corner: CarCorner
-    distance: Optional[float]
\ No newline at end of file
+    distance: Optional[float]
+    confidence: Optional[float] = None
+    timestamp: Optional[float] = None
+    status: ReadingStatus = ReadingStatus.OK
+
+@dataclass(frozen=True)
+class DistanceSnapshot:
+    """Immutable DTO holding the latest reading of every sensor, in CarCorner order.
+
+    Published whole by UltrasonicCapture, so the readings always belong together.
+    """
+    readings: Tuple[DistanceReading, ...]
+    
+    @property
+    def closest(self) -> Optional[DistanceReading]:
+        """Returns the reading of the closest obstacle, or None if no sensor sees one."""
+        valid = [reading for reading in self.readings if reading.distance is not None]
+        return min(valid, key=lambda reading: reading.distance) if valid else None
+    
+    def distances(self) -> Dict[CarCorner, Optional[float]]:
+        """Returns the latest distance of every corner (in cm), None if unknown or out of range."""
+        return {reading.corner: reading.distance for reading in self.readings}
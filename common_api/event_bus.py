@@ -0,0 +1,135 @@
+"""This module creates a publish/subscribe bus connecting the EchoNav components.
+
+File: event_bus.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Producers publish every event as soon as it exists (a distance reading per
+sensor, a new turn state) and never wait on the consumers: each subscriber
+owns a bounded queue, and when it falls behind its oldest events are dropped
+so that it always catches up on the latest ones. A slow sink (logging,
+telemetry) therefore never delays the alarm.
+"""
+from collections import deque
+from threading import Condition, Lock
+from typing import Any, Deque, Dict, List, Optional
+
+# Topics published by the EchoNav components.
+DISTANCE_TOPIC  = "distance"    # DistanceReading, one per sensor as soon as it is produced.
+TURN_TOPIC      = "turn"        # TurnState, every time the steering direction changes.
+
+DEFAULT_MAXLEN  = 16            # Default queue length of a subscriber.
+
+class Subscription():
+    """Bounded queue of the events one subscriber has not consumed yet.
+
+    Latest value wins: publishing into a full queue drops its oldest event.
+    """
+    def __init__(self, bus: "EventBus", topic: str, maxlen: int) -> None:
+        """Initializes an empty subscription.
+
+        Arguments:
+            bus (EventBus): bus the subscription belongs to.
+            topic (str): topic subscribed to.
+            maxlen (int): most events queued before the oldest are dropped.
+        """
+        self._bus = bus
+        self._topic = topic
+        self._queue: Deque[Any] = deque(maxlen=maxlen)
+        self._ready = Condition(Lock())
+        self._closed: bool = False
+        self._dropped: int = 0
+
+    @property
+    def topic(self) -> str:
+        """Returns the topic subscribed to."""
+        return self._topic
+
+    @property
+    def dropped(self) -> int:
+        """Returns how many events were dropped because the queue was full."""
+        return self._dropped
+
+    @property
+    def closed(self) -> bool:
+        """Returns True once the subscription is closed."""
+        return self._closed
+
+    def put(self, event: Any) -> None:
+        """Queues an event without blocking, dropping the oldest one if the queue is full."""
+        with self._ready:
+            if len(self._queue) == self._queue.maxlen:
+                self._dropped += 1
+            self._queue.append(event)
+            self._ready.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """Takes the oldest queued event, waiting for one if the queue is empty.
+
+        Arguments:
+            timeout (float | None): longest time to wait (in s), forever if None.
+
+        Returns:
+            (Any | None): the event, or None on timeout or once closed.
+        """
+        with self._ready:
+            if not self._queue and not self._closed:
+                self._ready.wait(timeout)
+            return self._queue.popleft() if self._queue else None
+
+    def drain(self) -> List[Any]:
+        """Takes every queued event without waiting, oldest first."""
+        with self._ready:
+            events = list(self._queue)
+            self._queue.clear()
+        return events
+
+    def close(self) -> None:
+        """Unsubscribes, and wakes any consumer blocked in `get`."""
+        self._bus.unsubscribe(self)
+        with self._ready:
+            self._closed = True
+            self._ready.notify_all()
+
+class EventBus():
+    """Routes published events to the subscriptions of their topic."""
+    def __init__(self) -> None:
+        """Initializes a bus without subscribers."""
+        self._lock = Lock()
+        # Replaced rather than mutated, so `publish` iterates a snapshot without locking.
+        self._subscribers: Dict[str, List[Subscription]] = {}
+
+    def subscribe(self, topic: str, maxlen: int = DEFAULT_MAXLEN) -> Subscription:
+        """Subscribes to a topic.
+
+        Arguments:
+            topic (str): topic to receive the events of.
+            maxlen (int): most events queued before the oldest are dropped.
+
+        Returns:
+            (Subscription): queue the events are delivered to.
+        """
+        subscription = Subscription(self, topic, maxlen)
+        with self._lock:
+            subscribers = dict(self._subscribers)
+            subscribers[topic] = subscribers.get(topic, []) + [subscription]
+            self._subscribers = subscribers
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stops delivering events to a subscription."""
+        with self._lock:
+            subscribers = dict(self._subscribers)
+            remaining = [s for s in subscribers.get(subscription.topic, []) if s is not subscription]
+            subscribers[subscription.topic] = remaining
+            self._subscribers = subscribers
+
+    def publish(self, topic: str, event: Any) -> None:
+        """Delivers an event to every subscriber of its topic, without ever blocking on them.
+
+        Arguments:
+            topic (str): topic of the event.
+            event (Any): event to deliver.
+        """
+        for subscription in self._subscribers.get(topic, ()):
+            subscription.put(event)
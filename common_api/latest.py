@@ -0,0 +1,46 @@
+"""This module creates a lock-free cell holding the latest state of a component.
+
+File: latest.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+A component's loop thread publishes its state as a new immutable snapshot,
+and any other thread reads the newest one. Publishing swaps a single
+reference, which is atomic in Python, so a reader always sees one complete
+snapshot: readers never block the writer, and neither side takes a lock.
+The version counter travels in the same reference, so a reader can tell
+whether anything changed since its last look, like a seqlock's sequence.
+"""
+from typing import Generic, Tuple, TypeVar
+
+T = TypeVar("T")
+
+class Latest(Generic[T]):
+    """Holds the latest immutable snapshot published by a single writer thread."""
+    def __init__(self, initial: T) -> None:
+        """Initializes the cell with its first snapshot, at version 0.
+
+        Arguments:
+            initial (T): snapshot returned until the first `set`.
+        """
+        self._cell: Tuple[int, T] = (0, initial)
+
+    def set(self, value: T) -> None:
+        """Publishes a new snapshot, which must never be mutated afterwards.
+
+        Only one thread may publish into a cell, or versions could be lost.
+        """
+        self._cell = (self._cell[0] + 1, value)
+
+    def get(self) -> T:
+        """Returns the latest snapshot."""
+        return self._cell[1]
+
+    def read(self) -> Tuple[int, T]:
+        """Returns the latest snapshot together with its version."""
+        return self._cell
+
+    @property
+    def version(self) -> int:
+        """Returns how many snapshots were published since the initial one."""
+        return self._cell[0]
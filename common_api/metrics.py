@@ -0,0 +1,261 @@
+"""This module keeps always-on latency histograms and counters of the EchoNav pipeline stages.
+
+File: metrics.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Every pipeline stage (ping wait, stability check, control loop handoff, beep
+scheduling, gyroscope read, LED write) is timed with a monotonic nanosecond
+clock, and each duration is counted in one of a fixed set of power-of-two
+buckets. Recording is a handful of integer operations, with no allocation
+and no lock, so the instrumentation stays on in production.
+
+Like a Latest cell, each histogram and counter is written by one thread at a
+time. Readers take an unlocked copy, which may lag by the sample being
+recorded. The stats can be queried through EchoNav, or scraped as text from
+an optional HTTP endpoint on the car itself.
+"""
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Dict, List, Optional, Tuple
+
+FIRST_BUCKET_BITS   = 10            # The first bucket holds durations under 2^10 ns (~1 us).
+BUCKETS             = 22            # Doubling buckets up to 2^30 ns (~1.07 s), then one for anything slower.
+METRICS_HOST        = "127.0.0.1"   # Only reachable from the car itself.
+PREFIX              = "echonav"     # Prefix of every exported metric name.
+
+# Pipeline stages, one histogram each.
+PING_WAIT       = "ping_wait"       # Trigger to result of one ping.
+STABILITY_CHECK = "stability_check" # Filtering or burst validation of one sensor's pings.
+HANDOFF         = "handoff"         # A reading produced, until the alarm loop picks it up.
+BEEP_UPDATE     = "beep_update"     # Beep interval and tones picked for new readings.
+AUDIO_CALLBACK  = "audio_callback"  # One audio buffer rendered.
+GYRO_READ       = "gyro_read"       # One I2C read of the gyroscope, a sample or a FIFO batch.
+LED_WRITE       = "led_write"       # One frame pushed to the LED matrix.
+
+def bucket_bound(index: int) -> Optional[int]:
+    """Returns the exclusive upper bound of a bucket (in ns), None for the last one."""
+    if index >= BUCKETS - 1:
+        return None
+    return 1 << (FIRST_BUCKET_BITS + index)
+
+@dataclass(frozen=True)
+class HistogramStats:
+    """Immutable DTO of one histogram: sample count, total and max duration, and bucket counts."""
+    count: int
+    total_ns: int
+    max_ns: int
+    buckets: Tuple[int, ...]        # Samples per bucket, see `bucket_bound`.
+
+    @property
+    def mean_ns(self) -> Optional[float]:
+        """Returns the mean duration (in ns), None without samples."""
+        return self.total_ns / self.count if self.count else None
+
+    def percentile_ns(self, pct: float) -> Optional[int]:
+        """Returns an upper bound of a percentile (in ns), None without samples.
+
+        The bound is the end of the bucket the percentile falls in, at most the
+        max, so it is within a factor of two of the true value.
+
+        Arguments:
+            pct (float): percentile, in [0, 100].
+
+        Returns:
+            (int | None): the percentile's upper bound.
+        """
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * pct // 100))
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                bound = bucket_bound(index)
+                return self.max_ns if bound is None else min(bound, self.max_ns)
+        return self.max_ns
+
+class Histogram():
+    """Fixed-bucket histogram of the durations of one stage."""
+    def __init__(self, name: str) -> None:
+        """Initializes an empty histogram.
+
+        Arguments:
+            name (str): stage name, exported as `echonav_<name>_seconds`.
+        """
+        self._name = name
+        self._counts: List[int] = [0] * BUCKETS
+        self._count: int = 0
+        self._total: int = 0
+        self._max: int = 0
+
+    @property
+    def name(self) -> str:
+        """Returns the stage name."""
+        return self._name
+
+    def record(self, ns: int) -> None:
+        """Counts one duration (in ns)."""
+        self._counts[min(max(ns.bit_length() - FIRST_BUCKET_BITS, 0), BUCKETS - 1)] += 1
+        self._count += 1
+        self._total += ns
+        if ns > self._max:
+            self._max = ns
+
+    def since(self, start_ns: int) -> None:
+        """Counts the time elapsed since a `time.perf_counter_ns()` start."""
+        self.record(time.perf_counter_ns() - start_ns)
+
+    def stats(self) -> HistogramStats:
+        """Returns a copy of the histogram."""
+        return HistogramStats(self._count, self._total, self._max, tuple(self._counts))
+
+    def reset(self) -> None:
+        """Drops every sample."""
+        self._counts = [0] * BUCKETS
+        self._count = self._total = self._max = 0
+
+class Counter():
+    """Count of the occurrences of one event."""
+    def __init__(self, name: str) -> None:
+        """Initializes the counter at 0.
+
+        Arguments:
+            name (str): event name, exported as `echonav_<name>_total`.
+        """
+        self._name = name
+        self._value: int = 0
+
+    @property
+    def name(self) -> str:
+        """Returns the event name."""
+        return self._name
+
+    @property
+    def value(self) -> int:
+        """Returns the count."""
+        return self._value
+
+    def add(self, n: int = 1) -> None:
+        """Counts n more occurrences."""
+        self._value += n
+
+    def reset(self) -> None:
+        """Sets the count back to 0."""
+        self._value = 0
+
+class Metrics():
+    """Registry of the histograms and counters of one EchoNav instance.
+
+    Components look their instruments up once, when they are constructed, so
+    the hot paths only ever call `record` or `add`.
+    """
+    def __init__(self) -> None:
+        """Initializes an empty registry."""
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, Counter] = {}
+        self._lock = Lock()     # Serialises registration only.
+
+    def histogram(self, name: str) -> Histogram:
+        """Returns the histogram of a stage, created on first use."""
+        with self._lock:
+            return self._histograms.setdefault(name, Histogram(name))
+
+    def counter(self, name: str) -> Counter:
+        """Returns the counter of an event, created on first use."""
+        with self._lock:
+            return self._counters.setdefault(name, Counter(name))
+
+    def histograms(self) -> Dict[str, HistogramStats]:
+        """Returns a copy of every histogram, by stage name."""
+        with self._lock:
+            histograms = list(self._histograms.values())
+        return {histogram.name: histogram.stats() for histogram in histograms}
+
+    def counters(self) -> Dict[str, int]:
+        """Returns every counter, by event name."""
+        with self._lock:
+            counters = list(self._counters.values())
+        return {counter.name: counter.value for counter in counters}
+
+    def reset(self) -> None:
+        """Drops every sample and sets every counter back to 0, for example between benchmark runs."""
+        with self._lock:
+            instruments = list(self._histograms.values()) + list(self._counters.values())
+        for instrument in instruments:
+            instrument.reset()
+
+    def render(self) -> str:
+        """Returns every histogram and counter in the Prometheus text format, durations in seconds."""
+        lines: List[str] = []
+        for name, stats in sorted(self.histograms().items()):
+            metric = f"{PREFIX}_{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            seen = 0
+            for index, count in enumerate(stats.buckets):
+                seen += count
+                bound = bucket_bound(index)
+                le = "+Inf" if bound is None else f"{bound / 1e9:.9g}"
+                lines.append(f'{metric}_bucket{{le="{le}"}} {seen}')
+            lines.append(f"{metric}_sum {stats.total_ns / 1e9:.9g}")
+            lines.append(f"{metric}_count {stats.count}")
+        for name, value in sorted(self.counters().items()):
+            metric = f"{PREFIX}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = METRICS_HOST) -> "MetricsServer":
+        """Starts serving `render` over HTTP in a background thread.
+
+        Arguments:
+            port (int): TCP port to listen on, 0 to pick a free one.
+            host (str): address to listen on, the loopback interface by default.
+
+        Returns:
+            (MetricsServer): the running server, close it when done.
+        """
+        return MetricsServer(self, port, host)
+
+class MetricsServer():
+    """HTTP endpoint answering GET /metrics with the text of a Metrics registry."""
+    def __init__(self, metrics: Metrics, port: int, host: str = METRICS_HOST) -> None:
+        """Binds the port and starts serving in a daemon thread.
+
+        Arguments:
+            metrics (Metrics): registry to serve.
+            port (int): TCP port to listen on, 0 to pick a free one.
+            host (str): address to listen on.
+        """
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = Thread(target=self._server.serve_forever, name="echonav-metrics", daemon=True)
+        self._thread.start()
+
+    @property
+    def port(self) -> int:
+        """Returns the TCP port being listened on."""
+        return self._server.server_address[1]
+
+    def close(self) -> None:
+        """Stops serving and releases the port."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=1)
@@ -0,0 +1,59 @@
+"""This module creates a shared interface for reporting subsystem start-up progress.
+
+File: readiness.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Slow start-up work (sensor settling, gyro calibration, opening the audio
+device) runs in the background, so each component exposes a Readiness that
+the controller can poll or wait on while the rest of the system carries on.
+"""
+from threading import Event
+from typing import Callable, Optional
+
+# Called with the subsystem name and a progress message.
+ProgressCallback = Callable[[str, str], None]
+
+class Readiness():
+    """Tracks whether one subsystem has finished starting up, and reports its progress."""
+    def __init__(self, name: str, on_progress: Optional[ProgressCallback] = None) -> None:
+        """Initializes a subsystem that is not ready yet.
+
+        Arguments:
+            name (str): subsystem name, passed to the progress callback.
+            on_progress (ProgressCallback | None): called on every progress message.
+        """
+        self._name = name
+        self._on_progress = on_progress
+        self._ready: Event = Event()
+
+    @property
+    def name(self) -> str:
+        """Returns the subsystem name."""
+        return self._name
+
+    @property
+    def ready(self) -> bool:
+        """Returns True once the subsystem has finished starting up."""
+        return self._ready.is_set()
+
+    def report(self, message: str) -> None:
+        """Passes a progress message to the callback, if any."""
+        if self._on_progress:
+            self._on_progress(self._name, message)
+
+    def set_ready(self, message: str = "ready") -> None:
+        """Marks the subsystem as ready and reports it."""
+        self._ready.set()
+        self.report(message)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the subsystem is ready.
+
+        Arguments:
+            timeout (float | None): longest time to wait (in s), forever if None.
+
+        Returns:
+            (bool): True if the subsystem is ready.
+        """
+        return self._ready.wait(timeout)
@@ -0,0 +1,38 @@
+"""Unit tests of the Deadlines pacing.
+
+File: test_deadline.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+"""
+import asyncio
+import time
+
+from common_api.deadline import Deadlines
+
+def test_wait_paces_and_counts_overruns():
+    async def run() -> Deadlines:
+        deadlines = Deadlines(0.02)
+        await deadlines.wait()
+        await deadlines.wait()      # On time.
+        time.sleep(0.05)
+        await deadlines.wait()      # Overran.
+        return deadlines
+    assert asyncio.run(run()).missed == 1
+
+def test_begin_counts_only_overruns():
+    deadlines = Deadlines(0.02)
+    deadlines.begin()
+    deadlines.begin()               # Ended well within its period.
+    assert deadlines.missed == 0
+    time.sleep(0.05)
+    deadlines.begin()
+    assert deadlines.missed == 1
+
+def test_begin_uses_each_iterations_own_period():
+    deadlines = Deadlines(0.01)
+    deadlines.begin(0.2)
+    time.sleep(0.03)
+    deadlines.begin()               # Within 0.2 s.
+    time.sleep(0.03)
+    deadlines.begin()               # Over 0.01 s.
+    assert deadlines.missed == 1
@@ -0,0 +1,70 @@
+"""Unit tests of the publish/subscribe EventBus.
+
+File: test_event_bus.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+"""
+import time
+from threading import Thread
+
+from common_api.event_bus import EventBus, DISTANCE_TOPIC, TURN_TOPIC
+
+def test_events_reach_only_their_topic():
+    bus = EventBus()
+    distances = bus.subscribe(DISTANCE_TOPIC)
+    turns = bus.subscribe(TURN_TOPIC)
+    bus.publish(DISTANCE_TOPIC, 1)
+    bus.publish(TURN_TOPIC, "left")
+    assert distances.drain() == [1]
+    assert turns.drain() == ["left"]
+
+def test_every_subscriber_gets_every_event():
+    bus = EventBus()
+    first, second = bus.subscribe(DISTANCE_TOPIC), bus.subscribe(DISTANCE_TOPIC)
+    for i in range(3):
+        bus.publish(DISTANCE_TOPIC, i)
+    assert first.drain() == [0, 1, 2]
+    assert second.drain() == [0, 1, 2]
+
+def test_overflow_drops_oldest_and_counts():
+    bus = EventBus()
+    sub = bus.subscribe(DISTANCE_TOPIC, maxlen=3)
+    for i in range(5):
+        bus.publish(DISTANCE_TOPIC, i)
+    assert sub.dropped == 2
+    assert sub.drain() == [2, 3, 4]
+
+def test_slow_subscriber_does_not_affect_others():
+    bus = EventBus()
+    slow = bus.subscribe(DISTANCE_TOPIC, maxlen=1)
+    fast = bus.subscribe(DISTANCE_TOPIC, maxlen=8)
+    for i in range(4):
+        bus.publish(DISTANCE_TOPIC, i)
+    assert slow.drain() == [3]
+    assert fast.drain() == [0, 1, 2, 3]
+    assert fast.dropped == 0
+
+def test_get_times_out_when_empty():
+    sub = EventBus().subscribe(DISTANCE_TOPIC)
+    assert sub.get(timeout=0.01) is None
+
+def test_get_wakes_on_publish():
+    bus = EventBus()
+    sub = bus.subscribe(DISTANCE_TOPIC)
+    Thread(target=lambda: (time.sleep(0.02), bus.publish(DISTANCE_TOPIC, 7))).start()
+    assert sub.get(timeout=1.0) == 7
+
+def test_close_unsubscribes_and_wakes_consumer():
+    bus = EventBus()
+    sub = bus.subscribe(DISTANCE_TOPIC)
+    result = []
+    consumer = Thread(target=lambda: result.append(sub.get()))
+    consumer.start()
+    time.sleep(0.02)
+    sub.close()
+    consumer.join(timeout=1.0)
+    assert not consumer.is_alive()
+    assert result == [None]
+    assert sub.closed
+    bus.publish(DISTANCE_TOPIC, 1)
+    assert sub.drain() == []
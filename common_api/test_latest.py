@@ -0,0 +1,50 @@
+"""Unit tests of the Latest snapshot cell.
+
+File: test_latest.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+"""
+from threading import Thread
+
+from common_api.latest import Latest
+
+def test_initial_snapshot_is_version_zero():
+    cell = Latest("idle")
+    assert cell.get() == "idle"
+    assert cell.read() == (0, "idle")
+    assert cell.version == 0
+
+def test_set_bumps_version():
+    cell = Latest(0)
+    cell.set(10)
+    cell.set(20)
+    assert cell.read() == (2, 20)
+
+def test_reader_can_detect_change():
+    cell = Latest(None)
+    seen, _ = cell.read()
+    assert cell.version == seen
+    cell.set("new")
+    assert cell.version != seen
+
+def test_reader_always_sees_complete_snapshot():
+    cell = Latest((0, 0))
+    torn = []
+
+    def write() -> None:
+        for i in range(1, 20000):
+            cell.set((i, -i))
+
+    def read() -> None:
+        for _ in range(20000):
+            a, b = cell.get()
+            if a != -b:
+                torn.append((a, b))
+
+    threads = [Thread(target=write), Thread(target=read)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert torn == []
+    assert cell.read() == (19999, (19999, -19999))
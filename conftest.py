@@ -0,0 +1,14 @@
+"""Shared pytest set-up for the unit tests next to each module.
+
+File: conftest.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Selects the simulated devices before any test module imports a component,
+so the tests run on any machine, without a RaspPi or a SenseHat.
+"""
+import os
+
+from hal.backend import BACKEND_ENV, SIMULATED
+
+os.environ.setdefault(BACKEND_ENV, SIMULATED)
@@ -3,45 +3,222 @@
 
 File: echo_nav.py
 Author: Josh Dean
-Last Modified: 21/10/2025
+Last Modified: 16/10/2026
 
 This module defines the EchoNav class, which integrates ultrasonic distance sensing,
 gyroscope angle detection, and speaker-based feedback into a cohesive navigation system.
 The EchoNav system continuously reads sensor data and provides real-time feedback
-to assist users in detecting obstacles within their surroundings.
+to assist users in detecting obstacles within their surroundings. The components
+are connected by an EventBus: every reading is published as soon as it is
+produced, and any number of sinks can subscribe without slowing the alarm.
 """
-from time import sleep
-from sense_hat import SenseHat
+import os
+import signal
+from time import monotonic, monotonic_ns
 import threading
-from typing import Optional
+from typing import Dict, List, Optional
 
+import hal
 from speaker_beep import SpeakerBeep
 from ultrasonic_capture import UltrasonicCapture
 from angle_capture import AngleCapture
+from common_api.angle import TurnState
+from common_api.distance import CarCorner, DistanceReading
+from common_api.event_bus import EventBus, Subscription, DISTANCE_TOPIC
+from common_api.metrics import Metrics, MetricsServer, HistogramStats, HANDOFF
+from common_api.readiness import Readiness, ProgressCallback
+from flight_recorder import FlightRecorder, FLIGHT_LOG
+from profiler import SamplingProfiler, DEFAULT_DURATION
+from joystick_input import JoystickDispatcher, Gesture
+
+# Selects the runtime `main` starts, the thread runtime by default.
+RUNTIME_ENV     = "ECHONAV_RUNTIME"
+THREADS         = "threads"     # A thread per stage, see EchoNav.
+ASYNCIO         = "asyncio"     # A single event loop, see echo_nav_async.AsyncEchoNav.
+
+# Flight log `main` records to, FLIGHT_LOG by default and disabled if empty.
+FLIGHT_LOG_ENV  = "ECHONAV_FLIGHT_LOG"
+
+# Local port `main` serves the metrics on, not served if unset.
+METRICS_PORT_ENV = "ECHONAV_METRICS_PORT"
+
+# Joystick bindings of `EchoNav.run`. A long middle press shuts down.
+TOGGLE_DIRECTION        = "middle"  # Starts or stops the program.
+MUTE_DIRECTION          = "up"      # Mutes or unmutes the beeps.
+ADAPTIVE_DIRECTION      = "left"    # Pings the corners by urgency.
+FULL_SWEEP_DIRECTION    = "right"   # Pings every corner on every sweep.
+PROFILE_DIRECTION       = "down"    # Profiles the running process, see EchoNav.profile.
+
+# Signal that also profiles the running process in `main`.
+PROFILE_SIGNAL          = "SIGUSR1" # `kill -USR1 <pid>`
 
 class EchoNav():
     """Main controller for the EchoNav system.
 
     The EchoNav class manages ultrasonic sensor input, angular orientation tracking, 
     and speaker feedback to create an obstacle detection and navigation system.
-    It also runs a background control loop to continuously process sensor readings 
-    and provide real-time audio feedback.
+    It also runs a background control loop sweeping the sensors back to back, 
+    and an alarm loop turning every published reading into real-time audio feedback.
     """
-    def __init__(self) -> None:
-        """Initializes the EchoNav controller and its components."""
-        self._debug: bool = True
+    def __init__(
+        self,
+        debug: bool = True,
+        on_progress: Optional[ProgressCallback] = None,
+        flight_log: Optional[str] = None,
+        metrics_port: Optional[int] = None
+    ) -> None:
+        """Initializes the EchoNav controller and its components.
+
+        Returns without waiting for the components to start up: the sensors
+        settle, the gyroscope calibrates and the audio device opens concurrently
+        in the background. Each subsystem gives feedback as soon as it is ready,
+        see `readiness` and `wait_ready`.
+        
+        Arguments:
+            debug (bool): True if debug logging is active.
+            on_progress (ProgressCallback | None): called with the subsystem name and a 
+                message as start-up progresses, logs them in debug mode if None.
+            flight_log (str | None): ring file every ping, reading, gyroscope sample, turn
+                and beep is recorded to, None to not record.
+            metrics_port (int | None): local port the stage metrics are served on over HTTP,
+                None to not serve them. They can always be queried, see `stage_latency`.
+        """
+        self._debug: bool = debug
         self._thread: Optional[threading.Thread] = None
+        self._alarm_thread: Optional[threading.Thread] = None
+        self._alarm_sub: Optional[Subscription] = None
         self._running: bool = False
+        self._muted: bool = False
         self._active_flag: threading.Event = threading.Event()
-        self._ultrason_cap = UltrasonicCapture(debug=self._debug)
-        self._angle_cap = AngleCapture(debug=self._debug)
-        self._speaker_beep = SpeakerBeep(debug=self._debug)
+        self._bus = EventBus()
+        self._recorder = FlightRecorder(flight_log) if flight_log else None
+        self._metrics = Metrics()
+        self._handoff = self._metrics.histogram(HANDOFF)
+        on_progress = on_progress or self._log_progress
+        self._ultrason_cap = UltrasonicCapture(
+            debug=self._debug, on_progress=on_progress, bus=self._bus, recorder=self._recorder,
+            metrics=self._metrics
+        )
+        self._angle_cap = AngleCapture(
+            debug=self._debug, on_progress=on_progress, bus=self._bus, recorder=self._recorder,
+            metrics=self._metrics
+        )
+        self._speaker_beep = SpeakerBeep(
+            debug=self._debug, on_progress=on_progress, recorder=self._recorder, metrics=self._metrics
+        )
+        self._metrics_server: Optional[MetricsServer] = None
+        if metrics_port is not None:
+            self._metrics_server = self._metrics.serve(metrics_port)
+        self._profiler = SamplingProfiler(on_done=self._log_profile)
+        self._subsystems: List[Readiness] = [
+            self._ultrason_cap.readiness,
+            self._angle_cap.readiness,
+            self._speaker_beep.readiness
+        ]
+
+    def _log_progress(self, name: str, message: str) -> None:
+        """Default progress callback, logs start-up progress in debug mode."""
+        if self._debug:
+            print(f"[DEBUG] Start-up: {name} {message}")
+
+    @property
+    def bus(self) -> EventBus:
+        """Returns the event bus, to attach extra sinks (logging, telemetry, display)."""
+        return self._bus
+
+    def yaw(self) -> float:
+        """Returns the latest estimated steering angle, negative to the left (in deg)."""
+        return self._angle_cap.yaw
+
+    def turn_state(self) -> TurnState:
+        """Returns the latest turn state."""
+        return self._angle_cap.turn_state
+
+    def closest(self) -> Optional[DistanceReading]:
+        """Returns the latest reading of the closest obstacle, or None if no sensor sees one."""
+        return self._ultrason_cap.latest().closest
+
+    def distances(self) -> Dict[CarCorner, Optional[float]]:
+        """Returns the latest distance of every corner (in cm), None if unknown or out of range.
+
+        Like `yaw`, `turn_state` and `closest`, this reads the latest immutable 
+        snapshot, so it never blocks and can be called from any thread.
+        """
+        return self._ultrason_cap.latest().distances()
+
+    @property
+    def metrics(self) -> Metrics:
+        """Returns the registry of the stage histograms and event counters."""
+        return self._metrics
+
+    def stage_latency(self) -> Dict[str, HistogramStats]:
+        """Returns the latency histogram of every pipeline stage, by name.
+
+        The stages are the ping wait, stability check, control loop handoff,
+        beep update, audio callback, gyroscope read and LED write, see
+        common_api.metrics. Like `distances`, this never blocks and can be
+        called from any thread.
+        """
+        return self._metrics.histograms()
+
+    def counters(self) -> Dict[str, int]:
+        """Returns the event counters (ping outcomes, gyroscope samples, beeps), by name."""
+        return self._metrics.counters()
+
+    def profile(self, duration: float = DEFAULT_DURATION, trace_memory: bool = True) -> bool:
+        """Starts a time-boxed profile of the running process in the background.
+
+        Samples the stacks and CPU time of every thread (control, alarm, gyro,
+        audio...) and diffs the allocations, then writes a report under
+        profiler.PROFILE_DIR. Returns at once, so it can be called from a
+        joystick handler, but not from a signal handler, see `_profile_on_signal`.
+
+        Arguments:
+            duration (float): length of the profile (in s).
+            trace_memory (bool): True to also trace allocations, which slows them down meanwhile.
+
+        Returns:
+            (bool): True if the profile started, False if one is already running.
+        """
+        started = self._profiler.start(duration, trace_memory)
+        print(f"Profiling for {duration:.0f} s..." if started else "A profile is already running")
+        return started
+
+    @property
+    def last_profile(self) -> Optional[str]:
+        """Returns the report file of the last finished profile, None if there was none."""
+        return self._profiler.last_report
+
+    def _log_profile(self, path: str) -> None:
+        """Tells where a finished profile was written."""
+        print(f"Profile written to {path}")
+
+    def readiness(self) -> Dict[str, bool]:
+        """Returns whether each subsystem has finished starting up, by name."""
+        return {subsystem.name: subsystem.ready for subsystem in self._subsystems}
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until every subsystem has finished starting up.
+
+        Arguments:
+            timeout (float | None): longest time to wait (in s), forever if None.
+
+        Returns:
+            (bool): True if every subsystem is ready.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        for subsystem in self._subsystems:
+            remaining = None if deadline is None else max(0.0, deadline - monotonic())
+            if not subsystem.wait(remaining):
+                return False
+        return True
         
     def _control_loop(self) -> None:
         """Main processing loop for EchoNav.
 
-        Continuously reads ultrasonic sensor data, updates speaker feedback, 
-        and handles timing for real-time obstacle detection.
+        Continuously sweeps the ultrasonic sensors, which publish every reading 
+        on the bus as it is produced. The sweeps are paced by the firing 
+        schedule itself, so there is no extra sleep in the critical path.
         """
         if self._debug:
             print("Starting up EchoNav loop...")
@@ -49,11 +226,67 @@ class EchoNav():
             readings = self._ultrason_cap.read_all()
             if self._debug:
                 print(f"[DEBUG] Readings: {readings}")
-            self._speaker_beep.update_closest(readings)
-            sleep(0.05)
         if self._debug:
             print("EchoNav loop exited")
+
+    def _alarm_loop(self, subscription: Subscription) -> None:
+        """Updates the speaker feedback as soon as any new reading is published.
+
+        Readings queued while the speaker was updating are folded in together,
+        so the speaker always sees the latest reading of every corner.
+
+        Arguments:
+            subscription (Subscription): subscription to DISTANCE_TOPIC, closed to stop the loop.
+        """
+        latest: Dict[CarCorner, DistanceReading] = {}
+        while True:
+            reading = subscription.get()
+            if reading is None:
+                break
+            self._record_handoff(reading)
+            latest[reading.corner] = reading
+            for reading in subscription.drain():
+                self._record_handoff(reading)
+                latest[reading.corner] = reading
+            self._speaker_beep.update_closest(list(latest.values()))
+
+    def _record_handoff(self, reading: DistanceReading) -> None:
+        """Times how long ago a reading picked up by the alarm was produced."""
+        if reading.timestamp is not None:
+            self._handoff.record(monotonic_ns() - int(reading.timestamp * 1e9))
             
+    @property
+    def muted(self) -> bool:
+        """Returns True if the beeps are muted, leaving the display as the only feedback."""
+        return self._muted
+
+    def set_muted(self, muted: bool) -> None:
+        """Mutes or unmutes the beeps, from now and across restarts of the program.
+
+        Arguments:
+            muted (bool): True to mute the beeps.
+        """
+        self._muted = muted
+        if self._running:
+            if muted:
+                self._speaker_beep.stop()
+            else:
+                self._speaker_beep.start()
+
+    def toggle_mute(self) -> None:
+        """Mutes the beeps if they are on, unmutes them otherwise."""
+        self.set_muted(not self._muted)
+        print("Beeps muted" if self._muted else "Beeps on")
+
+    def set_adaptive(self, adaptive: bool) -> None:
+        """Switches the sensors between pinging corners by urgency and pinging all of them on every sweep.
+
+        Arguments:
+            adaptive (bool): True to ping corners by urgency.
+        """
+        self._ultrason_cap.set_adaptive(adaptive)
+        print("Pinging corners by urgency" if adaptive else "Pinging every corner on every sweep")
+
     def toggle_program(self) -> None:
         """Starts or stops the main control loop depending on the current state.
         When stopped, it instructs the user to press the joystick to restart.
@@ -73,12 +306,20 @@ class EchoNav():
         """
         if self._running:
             return
-        self._speaker_beep.start()
+        if not self._muted:
+            self._speaker_beep.start()
         self._angle_cap.start()
         self._active_flag.set()
         
+        # Subscribe the alarm before the sensors sweep, so it misses no reading.
+        self._alarm_sub = self._bus.subscribe(DISTANCE_TOPIC, maxlen=len(CarCorner))
+        self._alarm_thread = threading.Thread(
+            target=self._alarm_loop, args=(self._alarm_sub,), name="echonav-alarm"
+        )
+        self._alarm_thread.start()
+        
         # Start a thread for the control loop.
-        self._thread = threading.Thread(target=self._control_loop)
+        self._thread = threading.Thread(target=self._control_loop, name="echonav-control")
         self._thread.start()
         self._running = True
 
@@ -98,40 +339,112 @@ class EchoNav():
         if self._thread: 
             self._thread.join(timeout=1)
             self._thread = None
+        
+        # Closing the subscription wakes the alarm thread.
+        if self._alarm_sub:
+            self._alarm_sub.close()
+            self._alarm_sub = None
+        if self._alarm_thread:
+            self._alarm_thread.join(timeout=1)
+            self._alarm_thread = None
             
         self._running = False
 
+    def run(self) -> None:
+        """Dispatches joystick gestures until a long middle press or `Ctrl-C`, then shuts down.
+
+        Blocks on the joystick between events, so waiting for input uses no CPU:
+        - middle: starts or stops the program, a long press shuts down.
+        - up: mutes or unmutes the beeps.
+        - left / right: pings the corners by urgency / every corner on every sweep.
+        - down: profiles the running process.
+        """
+        dispatcher = self._dispatcher()
+        try:
+            dispatcher.run()
+        except KeyboardInterrupt:
+            pass
+        self.shutdown()
+
+    def _dispatcher(self) -> JoystickDispatcher:
+        """Returns a dispatcher of the SenseHat joystick with the gestures of `run` bound."""
+        dispatcher = JoystickDispatcher(hal.sense_hat().stick, debug=self._debug)
+        dispatcher.on(TOGGLE_DIRECTION, Gesture.PRESS, self.toggle_program)
+        dispatcher.on(TOGGLE_DIRECTION, Gesture.LONG_PRESS, dispatcher.stop)
+        dispatcher.on(MUTE_DIRECTION, Gesture.PRESS, self.toggle_mute)
+        dispatcher.on(ADAPTIVE_DIRECTION, Gesture.PRESS, lambda: self.set_adaptive(True))
+        dispatcher.on(FULL_SWEEP_DIRECTION, Gesture.PRESS, lambda: self.set_adaptive(False))
+        dispatcher.on(PROFILE_DIRECTION, Gesture.PRESS, self.profile)
+        return dispatcher
+
     def shutdown(self) -> None:
         """Performs a complete system shutdown.
 
-        Stops all running components and releases ultrasonic sensor resources.
+        Stops all running components, releases the ultrasonic sensor and audio
+        resources, writes out the flight log and any running profile, and stops
+        serving the metrics.
         """
         if self._debug:
             print("Shutting down EchoNav...")
+        self._profiler.cancel()
         self._stop()
         self._ultrason_cap.shutdown()
+        self._speaker_beep.close()
+        if self._recorder:
+            self._recorder.close()
+        if self._metrics_server:
+            self._metrics_server.close()
+
+def _profile_on_signal(echo_nav: EchoNav) -> None:
+    """Profiles the running process whenever it receives PROFILE_SIGNAL, where the platform has it.
+
+    The handler runs on the main thread between two bytecodes, possibly while
+    that thread holds a lock the profiler needs, so it only writes a byte to a
+    pipe. A thread of its own reads the pipe and starts the profile.
+    """
+    if not hasattr(signal, PROFILE_SIGNAL):
+        return
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(write_fd, False)
+
+    def wake(signum, frame) -> None:
+        try:
+            os.write(write_fd, b"\0")
+        except BlockingIOError:
+            pass    # A profile request is already pending.
+
+    def listen() -> None:
+        while os.read(read_fd, 1):
+            echo_nav.profile()
+
+    threading.Thread(target=listen, name="echonav-profile-signal", daemon=True).start()
+    signal.signal(getattr(signal, PROFILE_SIGNAL), wake)
 
 def main() -> None:
     """
     Main entry point to the program.
 
-    Toggles execution based on pressing the joystick in the RaspPi SenseHat.
-    Exits gracefully with `Ctrl-C`.
+    Toggles execution based on pressing the joystick in the RaspPi SenseHat,
+    which responds straight away while the subsystems start up in the 
+    background, see `EchoNav.run` for the other gestures. Exits gracefully on a
+    long press of the joystick or with `Ctrl-C`. Set ECHONAV_BACKEND=sim to run against
+    the simulated devices, and ECHONAV_RUNTIME=asyncio to run on a single event loop.
+    Records to the flight log set by ECHONAV_FLIGHT_LOG, FLIGHT_LOG by default, and
+    serves the stage metrics on the local port set by ECHONAV_METRICS_PORT, if any.
+    SIGUSR1 profiles the running process.
     """ 
-    echo_nav = EchoNav()
-    sense = SenseHat()
+    flight_log = os.environ.get(FLIGHT_LOG_ENV, FLIGHT_LOG) or None
+    metrics_port = int(os.environ[METRICS_PORT_ENV]) if os.environ.get(METRICS_PORT_ENV) else None
+    if os.environ.get(RUNTIME_ENV, THREADS) == ASYNCIO:
+        from echo_nav_async import AsyncEchoNav
+        echo_nav = AsyncEchoNav(flight_log=flight_log, metrics_port=metrics_port)
+    else:
+        echo_nav = EchoNav(flight_log=flight_log, metrics_port=metrics_port)
+    _profile_on_signal(echo_nav)
     
     print("Press the joystick to toggle the program!")
-    try:
-        while True:
-            # Capture middle presses of the joystick and alert program.
-            for event in sense.stick.get_events():
-                if event.action == "pressed" and event.direction == "middle":
-                    echo_nav.toggle_program()
-    except KeyboardInterrupt:
-        # Catch ctrl-c and exit.
-        echo_nav.shutdown()
-        exit(0)
+    echo_nav.run()
+    exit(0)
 
 if __name__=="__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""Single event loop runtime for the EchoNav ultrasonic navigation system.
+
+File: echo_nav_async.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+This module defines AsyncEchoNav, which runs the same components as EchoNav
+on one asyncio event loop instead of a thread per stage. The ultrasonic
+sweeps and gyroscope sampling are coroutines held to explicit deadlines,
+display redraws are a coroutine of their own, and only the blocking hardware calls
+(echo waits, I2C reads, LED matrix writes) go to a small thread pool. The
+joystick gestures are handled on the loop too, while a daemon thread waits
+for the stick's events. Audio is still rendered by the sound device's own
+callback thread, which the loop feeds through `SpeakerBeep.update_closest`.
+
+The thread runtime stays the default, select this one with
+ECHONAV_RUNTIME=asyncio so both can be benchmarked side by side.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, Dict, List, Optional
+
+from echo_nav import EchoNav
+from common_api.deadline import Deadlines
+from common_api.distance import DistanceReading
+from common_api.readiness import ProgressCallback
+
+IO_WORKERS      = 3     # Executor threads: one each for the sweep, the gyroscope and the display.
+
+class AsyncEchoNav(EchoNav):
+    """EchoNav controller running every stage as a coroutine on a single event loop.
+
+    The event loop runs in a thread of its own, so the controller is driven
+    exactly like EchoNav: `toggle_program` and `shutdown` can be called from
+    any other thread, and `run` blocks the calling thread while the joystick
+    gestures are dispatched on the loop.
+    """
+    def __init__(
+        self,
+        debug: bool = True,
+        on_progress: Optional[ProgressCallback] = None,
+        flight_log: Optional[str] = None,
+        metrics_port: Optional[int] = None
+    ) -> None:
+        """Initializes the components, the executor and the event loop thread.
+
+        Arguments:
+            debug (bool): True if debug logging is active.
+            on_progress (ProgressCallback | None): called with the subsystem name and a
+                message as start-up progresses, logs them in debug mode if None.
+            flight_log (str | None): ring file the streams are recorded to, None to not record.
+            metrics_port (int | None): local port the stage metrics are served on, None to not serve them.
+        """
+        super().__init__(debug, on_progress, flight_log, metrics_port)
+        self._executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="echonav-io")
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name="echonav-loop", daemon=True
+        )
+        self._loop_thread.start()
+        self._tasks: List[asyncio.Task] = []
+        self._sweep_deadlines: Optional[Deadlines] = None     # Pacing of `_sweep_loop`.
+
+    def _on_update(self, readings: List[DistanceReading]) -> None:
+        """Updates the speaker feedback with the latest readings, as soon as a group produced them.
+
+        The handoff is timed from the group's newest reading.
+        """
+        newest = max((r.timestamp for r in readings if r.timestamp is not None), default=None)
+        if newest is not None:
+            self._handoff.record(time.monotonic_ns() - int(newest * 1e9))
+        self._speaker_beep.update_closest(readings)
+
+    async def _sweep_loop(self) -> None:
+        """Sweeps the ultrasonic sensors back to back until cancelled.
+
+        Each sweep must end within the longest a sweep of the current mode can
+        take, see `UltrasonicCapture.worst_case_sweep`, and a sweep that
+        overruns it is counted as a missed deadline. Sweeps are not held back
+        to that period, as idling would delay the alarm.
+        """
+        if self._debug:
+            print("Starting up EchoNav loop...")
+        self._sweep_deadlines = Deadlines(self._ultrason_cap.worst_case_sweep)
+        try:
+            while True:
+                self._sweep_deadlines.begin(self._ultrason_cap.worst_case_sweep)
+                readings = await self._ultrason_cap.read_all_async(self._executor, on_update=self._on_update)
+                if self._debug:
+                    print(f"[DEBUG] Readings: {readings}")
+        finally:
+            if self._debug:
+                print("EchoNav loop exited")
+
+    async def _start_async(self) -> None:
+        """Starts the speaker, then the sweep and gyroscope coroutines."""
+        if self._running:
+            return
+        if not self._muted:
+            self._speaker_beep.start()
+        self._tasks = [
+            asyncio.create_task(self._sweep_loop()),
+            asyncio.create_task(self._angle_cap.run_async(self._executor))
+        ]
+        self._running = True
+
+    async def _stop_async(self) -> None:
+        """Cancels the sweep and gyroscope coroutines, waits for them to exit, and stops the speaker."""
+        if not self._running:
+            return
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._speaker_beep.stop()
+        self._running = False
+
+    def _on_loop(self, coro: Coroutine[Any, Any, None]) -> None:
+        """Runs a coroutine on the event loop, and waits for it unless called from the loop.
+
+        Joystick handlers run on the loop, where waiting would deadlock, so they only schedule it.
+        """
+        if threading.current_thread() is self._loop_thread:
+            self._loop.create_task(coro)
+        else:
+            asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _start(self) -> None:
+        """Starts the EchoNav coroutines on the event loop, from any thread."""
+        self._on_loop(self._start_async())
+
+    def _stop(self) -> None:
+        """Stops the EchoNav coroutines on the event loop, from any thread."""
+        self._on_loop(self._stop_async())
+
+    def run(self) -> None:
+        """Dispatches joystick gestures until a long middle press or `Ctrl-C`, then shuts down.
+
+        Binds the gestures of `EchoNav.run`, but their handlers run on the event loop.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._dispatcher().run_async(), self._loop)
+        try:
+            future.result()
+        except KeyboardInterrupt:
+            future.cancel()
+        self.shutdown()
+
+    def deadline_misses(self) -> Dict[str, int]:
+        """Returns how many deadlines each periodic coroutine missed, by name."""
+        return {
+            "sweep": self._sweep_deadlines.missed if self._sweep_deadlines else 0,
+            "gyro": self._angle_cap.missed_deadlines
+        }
+
+    def shutdown(self) -> None:
+        """Performs a complete system shutdown.
+
+        Stops all running coroutines, releases the ultrasonic sensor and audio
+        resources, writes out the flight log and any running profile, stops serving the
+        metrics, then stops the event loop and its executor.
+        """
+        if self._debug:
+            print("Shutting down EchoNav...")
+        self._profiler.cancel()
+        self._stop()
+        self._ultrason_cap.shutdown()
+        self._speaker_beep.close()
+        if self._recorder:
+            self._recorder.close()
+        if self._metrics_server:
+            self._metrics_server.close()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout=1)
+        if not self._loop_thread.is_alive():
+            self._loop.close()
+        self._executor.shutdown(wait=True)
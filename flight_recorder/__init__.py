@@ -0,0 +1,11 @@
+# flight_recorder/__init__.py
+from .flight_recorder import FlightRecorder, RecordKind, RECORD_DTYPE, FLIGHT_LOG
+from .flight_log import FlightLog
+
+__all__ = [
+    "FlightRecorder",
+    "FlightLog",
+    "RecordKind",
+    "RECORD_DTYPE",
+    "FLIGHT_LOG"
+]
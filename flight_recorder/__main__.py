@@ -0,0 +1,41 @@
+"""Command line reader of the flight recorder's ring files.
+
+File: __main__.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Usage:
+    python -m flight_recorder [path] [--kind ping] [--tail 20]
+"""
+import argparse
+import os
+
+import numpy as np
+
+from .flight_recorder import FLIGHT_LOG, RecordKind
+from .flight_log import FlightLog, format_record
+
+def main() -> None:
+    """Prints the record counts of a ring file, and its latest records."""
+    parser = argparse.ArgumentParser(description="EchoNav flight log reader.")
+    parser.add_argument("path", nargs="?", default=FLIGHT_LOG, help="ring file to read")
+    parser.add_argument("--kind", choices=[kind.name.lower() for kind in RecordKind],
+                        help="only print records of this kind")
+    parser.add_argument("--tail", type=int, default=20, help="number of latest records to print")
+    args = parser.parse_args()
+
+    log = FlightLog(args.path)
+    try:
+        kind = RecordKind[args.kind.upper()] if args.kind else None
+        records = log.records(kind)
+        print(f"{args.path}: {log.written} records written, {len(records)} kept "
+              f"({os.path.getsize(args.path) / 2**20:.0f} MiB ring)")
+        for each in RecordKind:
+            print(f"  {each.name:8} {int(np.count_nonzero(records['kind'] == each)):9}")
+        for record in records[-args.tail:] if args.tail > 0 else []:
+            print(format_record(record))
+    finally:
+        log.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""This module reads the ring files written by the FlightRecorder.
+
+File: flight_log.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+The ring file is memory-mapped read-only, so a log can be inspected while the
+car is still recording into it. Records are returned as NumPy structured
+arrays (see RECORD_DTYPE), oldest first.
+"""
+import math
+import mmap
+from typing import Optional
+
+import numpy as np
+
+from .flight_recorder import (
+    FLIGHT_LOG, HEADER, HEADER_SIZE, MAGIC, VERSION, COUNTER, BEGIN_OFFSET, END_OFFSET,
+    RECORD_DTYPE, RecordKind
+)
+
+class FlightLog():
+    """Read-only view of a flight recorder ring file."""
+    def __init__(self, path: str = FLIGHT_LOG) -> None:
+        """Maps a ring file.
+
+        Arguments:
+            path (str): ring file to read.
+
+        Raises:
+            ValueError: if the file is not a ring file of this version.
+        """
+        self._path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, capacity, _, _ = HEADER.unpack_from(self._mmap, 0)
+        if (magic, version, record_size) != (MAGIC, VERSION, RECORD_DTYPE.itemsize):
+            self._mmap.close()
+            raise ValueError(f"{path} is not a version {VERSION} flight log")
+        self._capacity: int = capacity
+        self._ring = np.frombuffer(self._mmap, RECORD_DTYPE, count=capacity, offset=HEADER_SIZE)
+
+    @property
+    def capacity(self) -> int:
+        """Returns how many records the ring keeps."""
+        return self._capacity
+
+    @property
+    def written(self) -> int:
+        """Returns how many records were written to the ring since it was created."""
+        return COUNTER.unpack_from(self._mmap, END_OFFSET)[0]
+
+    def records(self, kind: Optional[RecordKind] = None) -> np.ndarray:
+        """Returns a copy of the records still in the ring, oldest first.
+
+        The writer may overwrite the oldest records while they are copied, so
+        the counters are read around the copy and any record the writer began
+        to overwrite in the meantime is dropped.
+
+        Arguments:
+            kind (RecordKind | None): only return records of this kind, all of them if None.
+
+        Returns:
+            (np.ndarray): records of RECORD_DTYPE.
+        """
+        capacity = self._capacity
+        end = COUNTER.unpack_from(self._mmap, END_OFFSET)[0]
+        snapshot = self._ring.copy()
+        begun = COUNTER.unpack_from(self._mmap, BEGIN_OFFSET)[0]
+
+        first = max(0, end - capacity, begun - capacity)
+        indices = np.arange(first, end) % capacity
+        records = snapshot[indices]
+        if kind is not None:
+            records = records[records["kind"] == kind]
+        return records
+
+    def close(self) -> None:
+        """Unmaps the ring file."""
+        self._ring = None
+        self._mmap.close()
+
+def format_record(record: np.ndarray) -> str:
+    """Returns one record as a line of text."""
+    from common_api.angle import TurnState
+    from common_api.distance import CarCorner, ReadingStatus
+    kind = RecordKind(int(record["kind"]))
+    a, b = float(record["a"]), float(record["b"])
+    text = f"{int(record['t_ns']) / 1e9:14.6f} {kind.name:8}"
+    if kind == RecordKind.SESSION:
+        return f"{text} wall clock {a:.3f}"
+    if kind in (RecordKind.PING, RecordKind.READING):
+        corner = CarCorner(int(record["arg"])).name
+        status = ReadingStatus(int(record["status"])).name
+        if kind == RecordKind.PING:
+            echo = "-" if math.isnan(a) else f"{a * 1e6:.0f} us"
+            return f"{text} {corner:12} {status:13} echo {echo}, latency {b * 1000:.2f} ms"
+        distance = "-" if math.isnan(a) else f"{a:.1f} cm"
+        return f"{text} {corner:12} {status:13} {distance}, confidence {b:.2f}"
+    if kind == RecordKind.GYRO:
+        return f"{text} {a:+.2f} deg/s over {b * 1000:.2f} ms"
+    if kind == RecordKind.TURN:
+        return f"{text} {TurnState(int(record['arg'])).name:12} yaw {a:+.1f} deg, rate {b:+.1f} deg/s"
+    preempted = " (preempted)" if record["status"] else ""
+    return f"{text} interval {a * 1000:.0f} ms, closest {b:.1f} cm{preempted}"
@@ -0,0 +1,270 @@
+"""This module records the EchoNav sensor and feedback streams to a binary ring file.
+
+File: flight_recorder.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Every ping, distance reading, gyroscope sample, turn state change and beep is
+stored as one fixed 32-byte record in a memory-mapped ring file of fixed
+size. Disk usage is bounded, the oldest records are overwritten first, and the
+file survives a crash, so recording can stay on in production.
+
+The components only append a tuple to an in-memory queue. A background thread
+packs the queue into records and copies them into the ring a few times per
+second, so the sensing loops never wait on the disk. Around every copy the
+writer moves two counters in the header, like a seqlock, so a reader (see
+FlightLog) can drop any record that was overwritten while it read.
+"""
+import math
+import mmap
+import os
+import struct
+import time
+from collections import deque
+from enum import IntEnum
+from threading import Event, Thread
+from typing import Deque, List, Optional, Tuple
+
+import numpy as np
+
+FLIGHT_LOG          = os.path.join(os.path.expanduser("~"), ".echonav", "flight.rec")
+DEFAULT_CAPACITY    = 1 << 21   # Records kept in the ring, 64 MiB and ~30 min of driving.
+FLUSH_INTERVAL      = 0.2       # Time between two copies of the queue into the ring (in s).
+MAX_PENDING         = 1 << 16   # Most queued records, the oldest are dropped if the writer stalls.
+MAX_PENDING_BLOCKS  = 1 << 10   # Most queued gyroscope blocks.
+
+MAGIC       = b"ECHOREC1"
+VERSION     = 1
+HEADER_SIZE = 64                # Bytes before the first record.
+# Magic, version, record size, capacity, records begun, records ended.
+HEADER      = struct.Struct("<8sIIQQQ")
+COUNTER     = struct.Struct("<Q")
+BEGIN_OFFSET, END_OFFSET = 24, 32
+
+# One record: monotonic timestamp, two values, and three small fields, see RecordKind.
+RECORD_DTYPE = np.dtype({
+    "names": ["t_ns", "a", "b", "kind", "arg", "status"],
+    "formats": ["<i8", "<f8", "<f8", "u1", "i1", "u1"],
+    "offsets": [0, 8, 16, 24, 25, 26],
+    "itemsize": 32
+})
+
+class RecordKind(IntEnum):
+    """Kind of a record, which sets the meaning of its fields.
+
+    NaN stands for a missing value (None).
+    - SESSION -> a recorder started. a: wall clock time at t_ns (in s since the epoch).
+    - PING -> one ping. arg: CarCorner, status: ReadingStatus, a: echo pulse width (in s),
+      b: time from trigger to result (in s).
+    - READING -> one distance reading. arg: CarCorner, status: ReadingStatus,
+      a: filtered distance (in cm), b: confidence.
+    - GYRO -> one bias-corrected gyroscope sample. a: z-axis rate (in deg/s), b: time step (in s).
+    - TURN -> a new turn state. arg: TurnState, a: yaw (in deg), b: filtered rate (in deg/s).
+    - BEEP -> a beep started. status: 1 if it cut its gap short, a: beep interval (in s),
+      b: distance to the closest obstacle (in cm).
+    """
+    SESSION = 0
+    PING    = 1
+    READING = 2
+    GYRO    = 3
+    TURN    = 4
+    BEEP    = 5
+
+# Queued record, in RECORD_DTYPE field order.
+Row = Tuple[int, float, float, int, int, int]
+
+def _value(x: Optional[float]) -> float:
+    """Returns a value to store, NaN for None."""
+    return math.nan if x is None else x
+
+def _open_ring(path: str, capacity: int) -> Tuple[int, mmap.mmap, int]:
+    """Maps a ring file, reusing its records if it has the same layout, or creating it.
+
+    Returns:
+        (int, mmap.mmap, int): file descriptor, mapping, and number of records written so far.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    size = HEADER_SIZE + capacity * RECORD_DTYPE.itemsize
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    written = None
+    if os.fstat(fd).st_size == size:
+        magic, version, record_size, old_capacity, begun, ended = HEADER.unpack(
+            os.pread(fd, HEADER.size, 0)
+        )
+        if (magic, version, record_size, old_capacity) == (MAGIC, VERSION, RECORD_DTYPE.itemsize, capacity):
+            written = ended
+    if written is None:
+        # Sparse until written, so a new ring costs no disk space up front.
+        os.ftruncate(fd, 0)
+        os.ftruncate(fd, size)
+        written = 0
+    mapped = mmap.mmap(fd, size)
+    HEADER.pack_into(mapped, 0, MAGIC, VERSION, RECORD_DTYPE.itemsize, capacity, written, written)
+    return fd, mapped, written
+
+class FlightRecorder():
+    """Appends sensor and feedback events to a fixed-size, memory-mapped ring file.
+
+    The recording methods are safe to call from any thread and never block:
+    they queue the event, and a background thread writes it out within
+    FLUSH_INTERVAL. Once `close` has begun they drop their event instead.
+    """
+    def __init__(
+        self,
+        path: str = FLIGHT_LOG,
+        capacity: int = DEFAULT_CAPACITY,
+        flush_interval: float = FLUSH_INTERVAL
+    ) -> None:
+        """Opens the ring file, continuing after its existing records, and starts the writer.
+
+        Arguments:
+            path (str): ring file, created if missing.
+            capacity (int): records kept in the ring, sets its size on disk.
+            flush_interval (float): time between two copies of the queue into the ring (in s).
+        """
+        self._path = path
+        self._capacity = capacity
+        self._flush_interval = flush_interval
+        self._fd, self._mmap, self._written = _open_ring(path, capacity)
+        self._ring = np.frombuffer(self._mmap, RECORD_DTYPE, count=capacity, offset=HEADER_SIZE)
+        self._pending: Deque[Row] = deque(maxlen=MAX_PENDING)
+        self._blocks: Deque[Tuple[int, np.ndarray, float]] = deque(maxlen=MAX_PENDING_BLOCKS)
+        self._stop: Event = Event()
+
+        self._pending.append((time.monotonic_ns(), time.time(), math.nan, RecordKind.SESSION, 0, 0))
+        self._thread = Thread(target=self._write_loop, name="echonav-recorder", daemon=True)
+        self._thread.start()
+
+    @property
+    def path(self) -> str:
+        """Returns the ring file being written."""
+        return self._path
+
+    @property
+    def written(self) -> int:
+        """Returns how many records were written to the ring since it was created."""
+        return self._written
+
+    def ping(self, corner: int, status: int, echo: Optional[float], latency: float) -> None:
+        """Records one ping.
+
+        Arguments:
+            corner (CarCorner): sensor that was pinged.
+            status (ReadingStatus): how the ping ended.
+            echo (float | None): echo pulse width (in s), None if there was no echo.
+            latency (float): time from trigger to result (in s).
+        """
+        if self._stop.is_set():
+            return
+        self._pending.append((time.monotonic_ns(), _value(echo), latency, RecordKind.PING, corner, status))
+
+    def reading(
+        self,
+        corner: int,
+        status: int,
+        distance: Optional[float],
+        confidence: float,
+        timestamp: float
+    ) -> None:
+        """Records one distance reading.
+
+        Arguments:
+            corner (CarCorner): corner of the reading.
+            status (ReadingStatus): status of the reading.
+            distance (float | None): filtered distance (in cm).
+            confidence (float): confidence of the distance.
+            timestamp (float): time.monotonic() of the reading (in s).
+        """
+        if self._stop.is_set():
+            return
+        self._pending.append(
+            (int(timestamp * 1e9), _value(distance), confidence, RecordKind.READING, corner, status)
+        )
+
+    def gyro(self, rate: float, dt: float) -> None:
+        """Records one bias-corrected gyroscope sample (in deg/s), taken dt seconds after the previous one."""
+        if self._stop.is_set():
+            return
+        self._pending.append((time.monotonic_ns(), rate, dt, RecordKind.GYRO, 0, 0))
+
+    def gyro_block(self, rates: np.ndarray, dt: float) -> None:
+        """Records a block of evenly spaced, bias-corrected gyroscope samples, the last one taken now.
+
+        The block is kept by reference and packed by the writer, so it must not be modified afterwards.
+        """
+        if self._stop.is_set():
+            return
+        self._blocks.append((time.monotonic_ns(), rates, dt))
+
+    def turn(self, state: int, yaw: float, rate: float) -> None:
+        """Records a new turn state, with the yaw (in deg) and filtered rate (in deg/s) behind it."""
+        if self._stop.is_set():
+            return
+        self._pending.append((time.monotonic_ns(), yaw, rate, RecordKind.TURN, state, 0))
+
+    def beep(self, interval: Optional[float], closest: Optional[float], preempted: bool) -> None:
+        """Records the start of a beep, its interval (in s), and the closest obstacle (in cm)."""
+        if self._stop.is_set():
+            return
+        self._pending.append(
+            (time.monotonic_ns(), _value(interval), _value(closest), RecordKind.BEEP, 0, int(preempted))
+        )
+
+    def _write_loop(self) -> None:
+        """Copies the queued events into the ring every flush interval, until closed."""
+        while not self._stop.wait(self._flush_interval):
+            self._flush()
+        self._flush()
+
+    def _pack(self) -> Optional[np.ndarray]:
+        """Takes every queued event and packs them into records, in time order."""
+        rows = [self._pending.popleft() for _ in range(len(self._pending))]
+        blocks = [self._blocks.popleft() for _ in range(len(self._blocks))]
+        parts: List[np.ndarray] = []
+        if rows:
+            parts.append(np.array(rows, RECORD_DTYPE))
+        for t_ns, rates, dt in blocks:
+            block = np.zeros(len(rates), RECORD_DTYPE)
+            block["t_ns"] = t_ns - np.arange(len(rates) - 1, -1, -1) * int(dt * 1e9)
+            block["a"] = rates
+            block["b"] = dt
+            block["kind"] = RecordKind.GYRO
+            parts.append(block)
+        if not parts:
+            return None
+        records = np.concatenate(parts) if len(parts) > 1 else parts[0]
+        return records[np.argsort(records["t_ns"], kind="stable")]
+
+    def _flush(self) -> None:
+        """Copies the queued events into the ring, then publishes the new record count."""
+        records = self._pack()
+        if records is None:
+            return
+        count = len(records)
+        records = records[-self._capacity:]
+        begun = self._written + count
+        COUNTER.pack_into(self._mmap, BEGIN_OFFSET, begun)
+
+        start = (begun - len(records)) % self._capacity
+        first = min(len(records), self._capacity - start)
+        self._ring[start:start + first] = records[:first]
+        self._ring[:len(records) - first] = records[first:]
+
+        self._written = begun
+        COUNTER.pack_into(self._mmap, END_OFFSET, begun)
+
+    def close(self) -> None:
+        """Writes out every queued event, and closes the ring file.
+
+        Waits for the writer to finish its last flush, as it still uses the ring.
+        """
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        self._ring = None
+        self._mmap.flush()
+        self._mmap.close()
+        os.close(self._fd)
@@ -0,0 +1,26 @@
+# hal/__init__.py
+from .backend import (
+    configure, backend, is_simulated, world,
+    gpio, gyro, gyro_fifo, sense_hat, led_framebuffer, audio,
+    BACKEND_ENV, HARDWARE, SIMULATED
+)
+from .sense_fb import pack_frame
+from .simulated import SimWorld
+
+__all__ = [
+    "configure",
+    "backend",
+    "is_simulated",
+    "world",
+    "gpio",
+    "gyro",
+    "gyro_fifo",
+    "sense_hat",
+    "led_framebuffer",
+    "pack_frame",
+    "audio",
+    "BACKEND_ENV",
+    "HARDWARE",
+    "SIMULATED",
+    "SimWorld"
+]
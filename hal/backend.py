@@ -0,0 +1,143 @@
+"""This module selects and hands out the device backends used by every EchoNav component.
+
+File: backend.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+The backend is chosen once per process, either with `configure()` or through
+the ECHONAV_BACKEND environment variable ("hardware" or "sim"), and must be
+chosen before the components are imported. The hardware backend returns the
+real libraries, which already satisfy the device interfaces, so the Pi pays
+no extra indirection. They are checked against the interfaces once, when
+first handed out.
+"""
+import os
+from typing import Any, Dict, Optional
+
+from .interfaces import (
+    GpioBackend, GyroBackend, GyroFifoBackend, LedMatrixBackend, LedFrameBufferBackend, AudioBackend
+)
+from .simulated import SimWorld, SimGpio, SimGyro, SimSenseHat, SimAudio
+
+BACKEND_ENV = "ECHONAV_BACKEND"
+HARDWARE    = "hardware"
+SIMULATED   = "sim"
+
+_backend: Optional[str] = None
+_world: Optional[SimWorld] = None
+_devices: Dict[str, Any] = {}
+
+def _checked(device: Any, interface: type) -> Any:
+    """Returns a hardware device, after checking it provides every member of its interface.
+
+    Raises:
+        TypeError: if the device misses a member of the interface.
+    """
+    if not isinstance(device, interface):
+        members = [*vars(interface), *getattr(interface, "__annotations__", {})]
+        missing = [name for name in members if not name.startswith("_") and not hasattr(device, name)]
+        raise TypeError(f"{device!r} is not a {interface.__name__}, it misses: {', '.join(missing)}")
+    return device
+
+def configure(backend: str, world: Optional[SimWorld] = None) -> None:
+    """Selects the backend for this process.
+
+    Arguments:
+        backend (str): HARDWARE or SIMULATED.
+        world (SimWorld | None): world driving the simulated devices, a default one if None.
+    """
+    global _backend, _world
+    if backend not in (HARDWARE, SIMULATED):
+        raise ValueError(f"Unknown backend: {backend}")
+    _backend = backend
+    _world = world
+    _devices.clear()
+
+def backend() -> str:
+    """Returns the selected backend, reading ECHONAV_BACKEND if none was configured."""
+    global _backend
+    if _backend is None:
+        _backend = os.environ.get(BACKEND_ENV, HARDWARE)
+    return _backend
+
+def is_simulated() -> bool:
+    """Returns True if the simulated devices are in use."""
+    return backend() == SIMULATED
+
+def world() -> SimWorld:
+    """Returns the world driving the simulated devices."""
+    global _world
+    if _world is None:
+        _world = SimWorld()
+    return _world
+
+def gpio() -> Any:
+    """Returns the GPIO backend (the `RPi.GPIO` module on hardware)."""
+    if "gpio" not in _devices:
+        if is_simulated():
+            _devices["gpio"] = SimGpio(world())
+        else:
+            import RPi.GPIO as GPIO
+            _devices["gpio"] = _checked(GPIO, GpioBackend)
+    return _devices["gpio"]
+
+def gyro(address: int) -> Any:
+    """Returns a gyroscope backend (an `mpu6050` instance on hardware).
+
+    Arguments:
+        address (int): I2C address of the MPU6050.
+    """
+    if is_simulated():
+        return SimGyro(world())
+    from mpu6050 import mpu6050
+    return _checked(mpu6050(address), GyroBackend)
+
+def gyro_fifo(gyro: Any) -> GyroFifoBackend:
+    """Returns batched FIFO sampling for a gyroscope returned by `gyro`.
+
+    Arguments:
+        gyro (GyroBackend): gyroscope to sample, sharing its bus on hardware.
+    """
+    if isinstance(gyro, GyroFifoBackend):
+        return gyro
+    from .mpu6050_fifo import Mpu6050Fifo
+    return Mpu6050Fifo(gyro)
+
+def sense_hat() -> Any:
+    """Returns the shared LED matrix and joystick backend (a `SenseHat` on hardware)."""
+    if "sense_hat" not in _devices:
+        if is_simulated():
+            _devices["sense_hat"] = SimSenseHat(world())
+        else:
+            from sense_hat import SenseHat
+            _devices["sense_hat"] = _checked(SenseHat(), LedMatrixBackend)
+    return _devices["sense_hat"]
+
+def led_framebuffer(sense: Any) -> LedFrameBufferBackend:
+    """Returns whole-frame writes to the matrix of a LED backend returned by `sense_hat`.
+
+    Arguments:
+        sense (LedMatrixBackend): matrix to write to, the SenseHat framebuffer device on hardware.
+    """
+    if isinstance(sense, LedFrameBufferBackend):
+        return sense
+    if "led_framebuffer" not in _devices:
+        from .sense_fb import SenseFrameBuffer
+        _devices["led_framebuffer"] = SenseFrameBuffer()
+    return _devices["led_framebuffer"]
+
+def audio() -> Any:
+    """Returns the audio backend (the `sounddevice` module on hardware).
+
+    Raises:
+        ImportError: if the hardware backend is selected and sounddevice is missing.
+    """
+    if "audio" not in _devices:
+        if is_simulated():
+            _devices["audio"] = SimAudio(world())
+        else:
+            import sounddevice as sd
+            # Fix the default device to be the Pi audio jack.
+            sd.default.device = [-1, 1]
+            _devices["audio"] = _checked(sd, AudioBackend)
+    return _devices["audio"]
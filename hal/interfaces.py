@@ -0,0 +1,179 @@
+"""This module defines the device interfaces every EchoNav hardware backend must provide.
+
+File: interfaces.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+The interfaces mirror the subset of the `RPi.GPIO`, `mpu6050`, `sense_hat` and
+`sounddevice` APIs that EchoNav uses, so the real libraries satisfy them as-is
+and the components never need to know which backend they are talking to.
+
+They are protocols with abstract methods: a backend subclassing one (the
+simulated devices) cannot be constructed while it misses a method, and the
+real libraries are checked against them when `backend` hands them out, so a
+mismatch fails at start-up rather than at the first call on the car.
+"""
+from abc import abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, runtime_checkable
+
+@runtime_checkable
+class GpioBackend(Protocol):
+    """GPIO pin access, matching the `RPi.GPIO` module."""
+    BCM     = 11
+    OUT     = 0
+    IN      = 1
+    LOW     = 0
+    HIGH    = 1
+    RISING  = 31
+    FALLING = 32
+    BOTH    = 33
+
+    @abstractmethod
+    def setmode(self, mode: int) -> None:
+        """Selects the pin numbering scheme."""
+
+    @abstractmethod
+    def setup(self, pin: int, direction: int) -> None:
+        """Configures a pin as an input or an output."""
+
+    @abstractmethod
+    def output(self, pin: int, value: int) -> None:
+        """Drives an output pin high or low."""
+
+    @abstractmethod
+    def input(self, pin: int) -> int:
+        """Returns the current level of a pin."""
+
+    @abstractmethod
+    def add_event_detect(
+        self, pin: int, edge: int, callback: Optional[Callable[[int], None]] = None
+    ) -> None:
+        """Calls `callback(pin)` from a background thread on every matching edge."""
+
+    @abstractmethod
+    def remove_event_detect(self, pin: int) -> None:
+        """Stops edge detection on a pin."""
+
+    @abstractmethod
+    def cleanup(self) -> None:
+        """Releases every pin."""
+
+@runtime_checkable
+class GyroBackend(Protocol):
+    """MPU6050 gyroscope/accelerometer access, matching the `mpu6050` class."""
+    @abstractmethod
+    def get_gyro_data(self) -> Dict[str, float]:
+        """Returns the angular rate around each axis (in deg/s)."""
+
+    @abstractmethod
+    def get_accel_data(self) -> Dict[str, float]:
+        """Returns the acceleration along each axis (in m/s^2)."""
+
+    @abstractmethod
+    def get_temp(self) -> float:
+        """Returns the die temperature (in C)."""
+
+@runtime_checkable
+class GyroFifoBackend(Protocol):
+    """Batched z-axis gyroscope sampling through the MPU6050 FIFO.
+
+    The sensor samples at a fixed rate into its FIFO, and the samples are read
+    back in bursts, so the reader wakes up once per batch instead of once per sample.
+    """
+    overflows: int  # Times the FIFO filled up and samples were lost.
+
+    @abstractmethod
+    def start_fifo(self, rate_hz: float) -> float:
+        """Starts buffering z-axis samples.
+
+        Arguments:
+            rate_hz (float): requested sample rate (in Hz).
+
+        Returns:
+            (float): sample rate actually configured (in Hz).
+        """
+
+    @abstractmethod
+    def read_fifo_z(self) -> Sequence[float]:
+        """Drains the buffered z-axis samples, oldest first, as a NumPy array (in deg/s)."""
+
+    @abstractmethod
+    def stop_fifo(self) -> None:
+        """Stops buffering and restores the previous sampling configuration."""
+
+@runtime_checkable
+class StickBackend(Protocol):
+    """SenseHat joystick access, matching `sense_hat.stick.SenseStick`."""
+    @abstractmethod
+    def get_events(self) -> List[Any]:
+        """Returns (and drains) all joystick events since the last call."""
+
+    @abstractmethod
+    def wait_for_event(self, emptybuffer: bool = False) -> Any:
+        """Blocks until the next joystick event and returns it."""
+
+@runtime_checkable
+class LedMatrixBackend(Protocol):
+    """SenseHat 8x8 LED matrix access, matching the `SenseHat` class."""
+    stick: StickBackend
+
+    @abstractmethod
+    def set_pixels(self, pixel_list: Sequence[Sequence[int]]) -> None:
+        """Pushes a full frame of 64 RGB pixels to the matrix."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Turns every pixel off."""
+
+@runtime_checkable
+class LedFrameBufferBackend(Protocol):
+    """Whole-frame writes to the LED matrix, not part of `sense_hat`.
+
+    Frames are packed once into the framebuffer layout (see `hal.sense_fb.pack_frame`),
+    and each write replaces the whole matrix in one go.
+    """
+    @abstractmethod
+    def write_frame(self, packed: bytes) -> None:
+        """Replaces the whole matrix with a packed frame."""
+
+@runtime_checkable
+class OutputStreamBackend(Protocol):
+    """A persistent audio output stream, matching `sounddevice.OutputStream`.
+
+    Once started, the stream calls `callback(outdata, frames, time, status)`
+    from its own thread every time it needs the next `frames` samples, which
+    the callback writes into the (frames, channels) `outdata` array.
+    """
+    @abstractmethod
+    def start(self) -> None:
+        """Starts calling the callback."""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stops calling the callback, once the queued buffers have played."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Releases the audio device."""
+
+@runtime_checkable
+class AudioBackend(Protocol):
+    """Audio output access, matching the `sounddevice` module."""
+    @abstractmethod
+    def OutputStream(
+        self, samplerate: int, channels: int, dtype: str, callback: Callable[..., None],
+        blocksize: int = 0, latency: Any = None
+    ) -> OutputStreamBackend:
+        """Opens a persistent output stream fed by `callback`."""
+
+    @abstractmethod
+    def play(self, data: Any, samplerate: int) -> None:
+        """Starts playing a buffer of samples in the background."""
+
+    @abstractmethod
+    def wait(self) -> None:
+        """Blocks until the current playback finishes."""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stops any current playback."""
@@ -0,0 +1,76 @@
+"""This module writes whole packed frames to the SenseHat LED matrix framebuffer.
+
+File: sense_fb.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+`SenseHat.set_pixels` checks and packs every pixel again on each call, then
+writes the frame to the framebuffer device one pixel at a time, with a seek
+before each of the 64 two-byte writes. Frames that are known up front are
+packed once with `pack_frame` instead, and this driver writes each one to the
+device in a single system call.
+"""
+import glob
+import os
+import struct
+from typing import Sequence, Tuple
+
+from .interfaces import LedFrameBufferBackend
+
+FB_NAME     = "RPi-Sense FB"                    # Name the SenseHat kernel driver gives its framebuffer.
+FB_NAMES    = "/sys/class/graphics/fb*/name"    # Names of every framebuffer device.
+PIXELS      = 64                                # Pixels of the 8x8 matrix, row by row.
+FB_FORMAT   = f"={PIXELS}H"                     # One native-endian RGB565 word per pixel, as `sense_hat` packs them.
+
+def pack_frame(pixels: Sequence[Sequence[int]]) -> bytes:
+    """Packs a frame into the framebuffer layout, unrotated.
+
+    Arguments:
+        pixels (Sequence[Sequence[int]]): 64 (r, g, b) pixels, row by row, each channel in 0-255.
+
+    Returns:
+        (bytes): the frame as RGB565 words, ready for `write_frame`.
+
+    Raises:
+        ValueError: if the frame does not hold 64 valid pixels.
+    """
+    if len(pixels) != PIXELS:
+        raise ValueError("Pixel lists must have 64 elements")
+    if any(len(pixel) != 3 or not all(0 <= channel <= 255 for channel in pixel) for pixel in pixels):
+        raise ValueError("Pixels must be (r, g, b) values between 0 and 255")
+    return struct.pack(FB_FORMAT, *((r >> 3) << 11 | (g >> 2) << 5 | b >> 3 for r, g, b in pixels))
+
+def unpack_frame(packed: bytes) -> Tuple[Tuple[int, int, int], ...]:
+    """Expands a packed frame back to 64 (r, g, b) pixels, full and zero channels unchanged."""
+    pixels = []
+    for word in struct.unpack(FB_FORMAT, packed):
+        r, g, b = word >> 11, word >> 5 & 0x3F, word & 0x1F
+        # Repeat the high bits in the low ones, so 31 and 63 expand to 255.
+        pixels.append((r << 3 | r >> 2, g << 2 | g >> 4, b << 3 | b >> 2))
+    return tuple(pixels)
+
+def find_framebuffer() -> str:
+    """Returns the path of the SenseHat framebuffer device.
+
+    Raises:
+        OSError: if no framebuffer belongs to a SenseHat.
+    """
+    for name_file in sorted(glob.glob(FB_NAMES)):
+        with open(name_file) as f:
+            if f.read().strip() == FB_NAME:
+                return os.path.join("/dev", os.path.basename(os.path.dirname(name_file)))
+    raise OSError(f"No {FB_NAME} framebuffer found")
+
+class SenseFrameBuffer(LedFrameBufferBackend):
+    """Single-write access to the SenseHat framebuffer device."""
+    def __init__(self, path: str = "") -> None:
+        """Opens the framebuffer.
+
+        Arguments:
+            path (str): framebuffer device, found with `find_framebuffer` if empty.
+        """
+        self._fd = os.open(path or find_framebuffer(), os.O_WRONLY)
+
+    def write_frame(self, packed: bytes) -> None:
+        """Replaces the whole matrix with a frame returned by `pack_frame`."""
+        os.pwrite(self._fd, packed, 0)
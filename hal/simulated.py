@@ -0,0 +1,519 @@
+"""This module provides deterministic simulated devices for running EchoNav off the Pi.
+
+File: simulated.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Every simulated device reads from one shared SimWorld, which holds the obstacle
+distance of each CarCorner, the steering rate seen by the gyroscope, pending
+joystick events and everything sent to the LED matrix and the speaker. Noise
+comes from a seeded generator, so runs are repeatable.
+"""
+import heapq
+import math
+import random
+import time
+from collections import deque, namedtuple
+from threading import Condition, Lock, Thread
+from types import SimpleNamespace
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from common_api.distance import CarCorner
+from .interfaces import (
+    GpioBackend, GyroBackend, GyroFifoBackend, StickBackend, LedMatrixBackend,
+    LedFrameBufferBackend, AudioBackend, OutputStreamBackend
+)
+from .sense_fb import unpack_frame
+
+# Matches the half speed of sound used by ultrasonic_capture (in cm/s).
+SOUND_SPEED     = 17150
+ECHO_DELAY      = 0.0005    # Delay between the trigger falling and the echo rising (in s).
+NO_ECHO_PULSE   = 0.038     # Echo width an HC-SR04 reports when nothing is in range (in s).
+GRAVITY         = 9.80665
+FIFO_SAMPLES    = 512       # z-axis samples the MPU6050 FIFO holds (1024 bytes).
+SILENCE_LEVEL   = 1e-3      # Output amplitude below which the simulated speaker is silent.
+SILENCE_GAP     = 0.01      # Silence that ends a logged beep (in s).
+
+# Same layout as sense_hat.stick.InputEvent.
+InputEvent = namedtuple("InputEvent", ("timestamp", "direction", "action"))
+
+class SimWorld():
+    """Virtual environment shared by all simulated devices.
+
+    Scenario scripts change the world (obstacles, steering, joystick presses)
+    while EchoNav runs, and inspect what it produced (frames, beeps).
+    """
+    def __init__(
+        self,
+        distances: Optional[Dict[CarCorner, Optional[float]]] = None,
+        gyro_rate: float = 0.0,
+        gyro_bias: float = 0.8,
+        distance_noise: float = 0.3,
+        gyro_noise: float = 0.05,
+        accel_noise: float = 0.05,
+        temperature: float = 25.0,
+        seed: int = 0
+    ) -> None:
+        """Initializes the world.
+
+        Arguments:
+            distances (Dict[CarCorner, float | None] | None): obstacle distance per corner (in cm),
+                None means nothing is in range. Unlisted corners have nothing in range.
+            gyro_rate (float): true steering rate around the z-axis (in deg/s), the
+                steering angle it turns the wheel to is tracked in `steering_angle`.
+            gyro_bias (float): constant z-axis offset of the simulated gyroscope (in deg/s).
+            distance_noise (float): standard deviation of every echo distance (in cm).
+            gyro_noise (float): standard deviation of every gyro sample (in deg/s).
+            accel_noise (float): standard deviation of every accelerometer axis (in m/s^2).
+            temperature (float): gyroscope die temperature (in C).
+            seed (int): seed of the noise generator.
+        """
+        self._lock = Lock()
+        self._rng = random.Random(seed)
+        self._distances: Dict[CarCorner, Optional[float]] = {
+            corner: (distances or {}).get(corner)
+            for corner in CarCorner
+        }
+        self._disconnected: Set[CarCorner] = set()
+        self._gyro_rate = gyro_rate
+        self._steering_angle = 0.0
+        self._rate_since = time.perf_counter()
+        self.gyro_bias = gyro_bias
+        self.distance_noise = distance_noise
+        self.gyro_noise = gyro_noise
+        self.accel_noise = accel_noise
+        self.temperature = temperature
+
+        # Joystick input and feedback output, inspected by scenario scripts.
+        self._stick_cond = Condition()
+        self._stick_events: Deque[InputEvent] = deque()
+        self.frames: Deque[Tuple[float, Tuple[Tuple[int, int, int], ...]]] = deque(maxlen=1000)
+        self.beeps: Deque[Tuple[float, float]] = deque(maxlen=1000)
+
+    def set_distance(self, corner: CarCorner, distance: Optional[float]) -> None:
+        """Moves the obstacle seen by a corner (None removes it)."""
+        with self._lock:
+            self._distances[corner] = distance
+
+    def distance(self, corner: CarCorner) -> Optional[float]:
+        """Returns the true obstacle distance of a corner."""
+        return self._distances[corner]
+
+    def disconnect(self, corner: CarCorner) -> None:
+        """Unplugs a sensor, so it never answers a trigger."""
+        self._disconnected.add(corner)
+
+    def reconnect(self, corner: CarCorner) -> None:
+        """Plugs a sensor back in."""
+        self._disconnected.discard(corner)
+
+    def is_connected(self, corner: CarCorner) -> bool:
+        """Returns True if the corner's sensor is plugged in."""
+        return corner not in self._disconnected
+
+    def echo_width(self, corner: CarCorner) -> float:
+        """Returns the echo pulse width a trigger of this corner produces right now (in s)."""
+        with self._lock:
+            distance = self._distances[corner]
+            if distance is None:
+                return NO_ECHO_PULSE
+            distance = max(0.0, distance + self._rng.gauss(0.0, self.distance_noise))
+        return distance / SOUND_SPEED
+
+    @property
+    def gyro_rate(self) -> float:
+        """Returns the true steering rate (in deg/s)."""
+        return self._gyro_rate
+
+    @gyro_rate.setter
+    def gyro_rate(self, rate: float) -> None:
+        """Changes the steering rate, keeping the angle turned so far."""
+        with self._lock:
+            now = time.perf_counter()
+            self._steering_angle += self._gyro_rate * (now - self._rate_since)
+            self._rate_since = now
+            self._gyro_rate = rate
+
+    @property
+    def steering_angle(self) -> float:
+        """Returns the true steering wheel angle, integrated from the steering rate (in deg)."""
+        with self._lock:
+            return self._steering_angle + self._gyro_rate * (time.perf_counter() - self._rate_since)
+
+    @steering_angle.setter
+    def steering_angle(self, angle: float) -> None:
+        """Moves the steering wheel to an angle instantly (in deg)."""
+        with self._lock:
+            self._steering_angle = angle
+            self._rate_since = time.perf_counter()
+
+    def accel(self) -> Dict[str, float]:
+        """Returns one noisy accelerometer sample (in m/s^2).
+
+        The gyroscope z-axis lies along the steering wheel axle, which is
+        horizontal, so gravity turns with the wheel in the x-y plane.
+        """
+        angle = math.radians(self.steering_angle)
+        with self._lock:
+            noise = [self._rng.gauss(0.0, self.accel_noise) for _ in range(3)]
+        return {
+            "x": GRAVITY * math.sin(angle) + noise[0],
+            "y": GRAVITY * math.cos(angle) + noise[1],
+            "z": noise[2]
+        }
+
+    def gyro_z(self) -> float:
+        """Returns one noisy, biased z-axis gyroscope sample (in deg/s)."""
+        with self._lock:
+            noise = self._rng.gauss(0.0, self.gyro_noise)
+        return self.gyro_rate + self.gyro_bias + noise
+
+    def press(self, direction: str, action: str = "pressed") -> None:
+        """Queues a joystick event, as if the user had moved the stick."""
+        with self._stick_cond:
+            self._stick_events.append(InputEvent(time.time(), direction, action))
+            self._stick_cond.notify_all()
+
+    def pop_events(self, block: bool) -> List[InputEvent]:
+        """Drains queued joystick events, optionally waiting for the first one."""
+        with self._stick_cond:
+            if block:
+                self._stick_cond.wait_for(lambda: self._stick_events)
+            events = list(self._stick_events)
+            self._stick_events.clear()
+        return events
+
+class SimGpio(GpioBackend):
+    """Simulated GPIO header with an HC-SR04 on every CarCorner's pins.
+
+    A falling edge on a trigger pin schedules an echo pulse on the matching
+    echo pin, whose width follows the world's obstacle distance. Echo levels
+    are computed from the clock, and edge callbacks are delivered from a
+    dispatcher thread, like RPi.GPIO's event thread.
+    """
+    def __init__(self, world: SimWorld) -> None:
+        """Initializes the header with every pin low.
+
+        Arguments:
+            world (SimWorld): environment the sensors measure.
+        """
+        self._world = world
+        self._trig_to_corner: Dict[int, CarCorner] = {corner.pins[0]: corner for corner in CarCorner}
+        self._levels: Dict[int, int] = {}
+        self._pulses: Dict[int, Tuple[float, float]] = {}
+        self._callbacks: Dict[int, Tuple[int, Callable[[int], None]]] = {}
+
+        # Pending edge events, ordered by time: (time, seq, pin, rising).
+        self._cond = Condition()
+        self._events: List[Tuple[float, int, int, bool]] = []
+        self._seq = 0
+        self._dispatcher: Optional[Thread] = None
+
+    def setmode(self, mode: int) -> None:
+        """Accepts any numbering mode, pins are always BCM numbers."""
+
+    def setwarnings(self, flag: bool) -> None:
+        """Accepts and ignores the warnings flag."""
+
+    def setup(self, pin: int, direction: int) -> None:
+        """Configures a pin, starting it low."""
+        self._levels.setdefault(pin, self.LOW)
+
+    def output(self, pin: int, value: int) -> None:
+        """Drives a pin, firing the attached sensor on a trigger's falling edge."""
+        previous = self._levels.get(pin, self.LOW)
+        self._levels[pin] = self.HIGH if value else self.LOW
+        corner = self._trig_to_corner.get(pin)
+        if corner is not None and previous and not value:
+            self._fire(corner)
+
+    def _fire(self, corner: CarCorner) -> None:
+        """Schedules the echo pulse of a triggered sensor."""
+        echo_pin = corner.pins[1]
+        if not self._world.is_connected(corner) or self.input(echo_pin):
+            # Unplugged, or still busy with the previous pulse: the trigger is ignored.
+            return
+        rise = time.perf_counter() + ECHO_DELAY
+        fall = rise + self._world.echo_width(corner)
+        self._pulses[echo_pin] = (rise, fall)
+
+        if echo_pin in self._callbacks:
+            edge = self._callbacks[echo_pin][0]
+            if edge in (self.RISING, self.BOTH):
+                self._schedule(rise, echo_pin, True)
+            if edge in (self.FALLING, self.BOTH):
+                self._schedule(fall, echo_pin, False)
+
+    def _schedule(self, when: float, pin: int, rising: bool) -> None:
+        """Queues an edge event for the dispatcher thread."""
+        with self._cond:
+            self._seq += 1
+            heapq.heappush(self._events, (when, self._seq, pin, rising))
+            if self._dispatcher is None:
+                self._dispatcher = Thread(target=self._dispatch_loop, daemon=True)
+                self._dispatcher.start()
+            self._cond.notify()
+
+    def _dispatch_loop(self) -> None:
+        """Delivers queued edge events to their callbacks once they are due."""
+        while True:
+            with self._cond:
+                while not self._events or self._events[0][0] > time.perf_counter():
+                    timeout = self._events[0][0] - time.perf_counter() if self._events else None
+                    self._cond.wait(timeout)
+                _, _, pin, _ = heapq.heappop(self._events)
+                entry = self._callbacks.get(pin)
+            if entry is not None:
+                entry[1](pin)
+
+    def input(self, pin: int) -> int:
+        """Returns the level of a pin, computing echo pins from their scheduled pulse."""
+        pulse = self._pulses.get(pin)
+        if pulse is not None:
+            return self.HIGH if pulse[0] <= time.perf_counter() < pulse[1] else self.LOW
+        return self._levels.get(pin, self.LOW)
+
+    def add_event_detect(
+        self, pin: int, edge: int, callback: Optional[Callable[[int], None]] = None, bouncetime: int = 0
+    ) -> None:
+        """Registers an edge callback on a pin."""
+        if callback is not None:
+            self._callbacks[pin] = (edge, callback)
+
+    def remove_event_detect(self, pin: int) -> None:
+        """Removes the edge callback of a pin."""
+        self._callbacks.pop(pin, None)
+
+    def cleanup(self) -> None:
+        """Releases every pin, dropping callbacks and pending pulses."""
+        with self._cond:
+            self._callbacks.clear()
+            self._events.clear()
+        self._levels.clear()
+        self._pulses.clear()
+
+class SimGyro(GyroBackend, GyroFifoBackend):
+    """Simulated MPU6050 reporting the world's steering rate on the z-axis.
+
+    In FIFO mode, the samples due since the last read are generated when the
+    FIFO is drained, at the configured rate.
+    """
+    def __init__(self, world: SimWorld) -> None:
+        """Initializes the gyroscope.
+
+        Arguments:
+            world (SimWorld): environment the gyroscope measures.
+        """
+        self._world = world
+        self._fifo_rate: Optional[float] = None
+        self._fifo_time: float = 0.0
+        self.overflows = 0
+
+    def get_gyro_data(self) -> Dict[str, float]:
+        """Returns the angular rate around each axis (in deg/s)."""
+        return {"x": 0.0, "y": 0.0, "z": self._world.gyro_z()}
+
+    def get_accel_data(self) -> Dict[str, float]:
+        """Returns the acceleration of the turning steering wheel (in m/s^2)."""
+        return self._world.accel()
+
+    def get_temp(self) -> float:
+        """Returns the die temperature (in C)."""
+        return self._world.temperature
+
+    def start_fifo(self, rate_hz: float) -> float:
+        """Starts buffering z-axis samples at the requested rate."""
+        self._fifo_rate = rate_hz
+        self._fifo_time = time.perf_counter()
+        return rate_hz
+
+    def read_fifo_z(self) -> np.ndarray:
+        """Drains the z-axis samples taken since the last read (in deg/s)."""
+        if self._fifo_rate is None:
+            return np.empty(0)
+        count = int((time.perf_counter() - self._fifo_time) * self._fifo_rate)
+        self._fifo_time += count / self._fifo_rate
+        if count > FIFO_SAMPLES:
+            # The real FIFO would have overflowed, and gets cleared.
+            self.overflows += 1
+            return np.empty(0)
+        return np.fromiter((self._world.gyro_z() for _ in range(count)), float, count)
+
+    def stop_fifo(self) -> None:
+        """Stops buffering."""
+        self._fifo_rate = None
+
+class SimStick(StickBackend):
+    """Simulated SenseHat joystick fed by `SimWorld.press`."""
+    def __init__(self, world: SimWorld) -> None:
+        """Initializes the joystick.
+
+        Arguments:
+            world (SimWorld): environment holding the queued events.
+        """
+        self._world = world
+
+    def get_events(self) -> List[InputEvent]:
+        """Returns (and drains) all joystick events since the last call."""
+        return self._world.pop_events(block=False)
+
+    def wait_for_event(self, emptybuffer: bool = False) -> InputEvent:
+        """Blocks until the next joystick event and returns it."""
+        if emptybuffer:
+            self._world.pop_events(block=False)
+        events = self._world.pop_events(block=True)
+        for event in events[1:]:
+            self._world.press(event.direction, event.action)
+        return events[0]
+
+class SimSenseHat(LedMatrixBackend, LedFrameBufferBackend):
+    """Simulated SenseHat whose LED frames are logged into the world."""
+    def __init__(self, world: SimWorld) -> None:
+        """Initializes a blank matrix.
+
+        Arguments:
+            world (SimWorld): environment logging the frames.
+        """
+        self._world = world
+        self._pixels: List[Tuple[int, int, int]] = [(0, 0, 0)] * 64
+        self.stick = SimStick(world)
+
+    def set_pixels(self, pixel_list: Sequence[Sequence[int]]) -> None:
+        """Pushes a full frame of 64 RGB pixels to the matrix."""
+        if len(pixel_list) != 64:
+            raise ValueError("Pixel lists must have 64 elements")
+        self._pixels = [tuple(pixel) for pixel in pixel_list]
+        self._world.frames.append((time.perf_counter(), tuple(self._pixels)))
+
+    def write_frame(self, packed: bytes) -> None:
+        """Pushes a whole packed frame to the matrix, see `hal.sense_fb.pack_frame`."""
+        self._pixels = list(unpack_frame(packed))
+        self._world.frames.append((time.perf_counter(), tuple(self._pixels)))
+
+    def get_pixels(self) -> List[Tuple[int, int, int]]:
+        """Returns the frame currently shown."""
+        return list(self._pixels)
+
+    def clear(self, *colour: Any) -> None:
+        """Turns every pixel off (or to the given colour)."""
+        fill = tuple(colour[0]) if len(colour) == 1 else tuple(colour) or (0, 0, 0)
+        self.set_pixels([fill] * 64)
+
+class SimOutputStream(OutputStreamBackend):
+    """Simulated output stream calling its callback in real time, one block at a time.
+
+    The samples the callback produces are scanned for sound, and every beep
+    (a run of sound ended by SILENCE_GAP of silence) is logged into the world.
+    """
+    def __init__(
+        self, world: SimWorld, samplerate: int, channels: int, dtype: str,
+        callback: Callable[..., None], blocksize: int
+    ) -> None:
+        """Initializes the stream.
+
+        Arguments:
+            world (SimWorld): environment logging the beeps.
+            samplerate (int): samples per second.
+            channels (int): samples per frame.
+            dtype (str): sample type.
+            callback (Callable): fills each block, called as callback(outdata, frames, time, status).
+            blocksize (int): frames per block.
+        """
+        self._world = world
+        self._samplerate = samplerate
+        self._callback = callback
+        self._buffer = np.zeros((blocksize or 256, channels), dtype=dtype)
+        self._running = False
+        self._thread: Optional[Thread] = None
+        self._beep_start: Optional[float] = None
+        self._last_sound: float = 0.0
+
+    def start(self) -> None:
+        """Starts calling the callback from a background thread."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Calls the callback once per block, on an absolute schedule so timing never drifts."""
+        frames = len(self._buffer)
+        period = frames / self._samplerate
+        block_time = time.perf_counter()
+        while self._running:
+            self._buffer.fill(0)
+            self._callback(self._buffer, frames, SimpleNamespace(outputBufferDacTime=block_time), 0)
+            self._log_beeps(block_time)
+            block_time += period
+            time.sleep(max(0.0, block_time - time.perf_counter()))
+
+    def _log_beeps(self, block_time: float) -> None:
+        """Logs the beeps that ended in the last block."""
+        sound = np.flatnonzero(np.abs(self._buffer).max(axis=1) > SILENCE_LEVEL)
+        if len(sound):
+            first = block_time + sound[0] / self._samplerate
+            if self._beep_start is not None and first - self._last_sound > SILENCE_GAP:
+                self._world.beeps.append((self._beep_start, self._last_sound - self._beep_start))
+                self._beep_start = None
+            if self._beep_start is None:
+                self._beep_start = first
+            self._last_sound = block_time + (sound[-1] + 1) / self._samplerate
+        elif self._beep_start is not None:
+            end = block_time + len(self._buffer) / self._samplerate
+            if end - self._last_sound > SILENCE_GAP:
+                self._world.beeps.append((self._beep_start, self._last_sound - self._beep_start))
+                self._beep_start = None
+
+    def stop(self) -> None:
+        """Stops calling the callback."""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def close(self) -> None:
+        """Stops the stream."""
+        self.stop()
+
+class SimAudio(AudioBackend):
+    """Simulated sounddevice whose playbacks are logged into the world.
+
+    Playback takes real time, so `wait` blocks for the buffer's duration just
+    like the real audio device would.
+    """
+    def __init__(self, world: SimWorld) -> None:
+        """Initializes the audio sink.
+
+        Arguments:
+            world (SimWorld): environment logging the playbacks.
+        """
+        self._world = world
+        self._play_end: float = 0.0
+        self.default = SimpleNamespace(device=None, samplerate=None)
+
+    def OutputStream(
+        self, samplerate: int, channels: int, dtype: str, callback: Callable[..., None],
+        blocksize: int = 0, latency: Any = None
+    ) -> SimOutputStream:
+        """Opens a simulated output stream logging its beeps into the world."""
+        return SimOutputStream(self._world, samplerate, channels, dtype, callback, blocksize)
+
+    def play(self, data: Any, samplerate: int) -> None:
+        """Logs a playback and marks the sink busy for its duration."""
+        now = time.perf_counter()
+        duration = len(data) / samplerate
+        self._play_end = now + duration
+        self._world.beeps.append((now, duration))
+
+    def wait(self) -> None:
+        """Blocks until the current playback finishes."""
+        remaining = self._play_end - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def stop(self) -> None:
+        """Stops any current playback."""
+        self._play_end = 0.0
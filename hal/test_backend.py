@@ -0,0 +1,64 @@
+"""Unit tests of the device interfaces and the simulated backend.
+
+File: test_backend.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+"""
+from types import SimpleNamespace
+
+import pytest
+
+import hal
+from hal.backend import _checked
+from hal.interfaces import (
+    GpioBackend, GyroBackend, GyroFifoBackend, StickBackend, LedMatrixBackend,
+    LedFrameBufferBackend, AudioBackend
+)
+from hal.sense_fb import SenseFrameBuffer, unpack_frame
+
+def test_simulated_devices_satisfy_interfaces():
+    hal.configure(hal.SIMULATED)
+    gyro = hal.gyro(0x68)
+    assert isinstance(hal.gpio(), GpioBackend)
+    assert isinstance(gyro, GyroBackend)
+    assert isinstance(gyro, GyroFifoBackend)
+    assert isinstance(hal.sense_hat(), LedMatrixBackend)
+    assert isinstance(hal.sense_hat().stick, StickBackend)
+    assert isinstance(hal.led_framebuffer(hal.sense_hat()), LedFrameBufferBackend)
+    assert isinstance(hal.audio(), AudioBackend)
+
+def test_backend_missing_a_method_cannot_be_built():
+    class PartialGyro(GyroBackend):
+        def get_gyro_data(self):
+            return {"x": 0.0, "y": 0.0, "z": 0.0}
+    with pytest.raises(TypeError):
+        PartialGyro()
+
+def test_checked_names_missing_members():
+    library = SimpleNamespace(get_gyro_data=lambda: {}, get_accel_data=lambda: {})
+    with pytest.raises(TypeError, match="get_temp"):
+        _checked(library, GyroBackend)
+    library.get_temp = lambda: 25.0
+    assert _checked(library, GyroBackend) is library
+
+def test_packed_frame_round_trips():
+    pixels = tuple((255, 0, 0) if i % 3 else (0, 0, 0) for i in range(64))
+    packed = hal.pack_frame(pixels)
+    assert len(packed) == 128
+    assert unpack_frame(packed) == pixels
+    with pytest.raises(ValueError):
+        hal.pack_frame(pixels[:63])
+
+def test_framebuffer_writes_whole_frame(tmp_path):
+    device = tmp_path / "fb1"
+    device.write_bytes(bytes(128))
+    packed = hal.pack_frame([(0, 0, 255)] * 64)
+    SenseFrameBuffer(str(device)).write_frame(packed)
+    assert device.read_bytes() == packed
+
+def test_simulated_matrix_logs_packed_frames():
+    hal.configure(hal.SIMULATED)
+    pixels = tuple([(255, 0, 0)] * 32 + [(0, 0, 0)] * 32)
+    hal.led_framebuffer(hal.sense_hat()).write_frame(hal.pack_frame(pixels))
+    assert hal.world().frames[-1][1] == pixels
+    assert hal.sense_hat().get_pixels() == list(pixels)
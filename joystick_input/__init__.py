@@ -0,0 +1,8 @@
+# joystick_input/__init__.py
+from .joystick_dispatcher import JoystickDispatcher, Gesture, LONG_PRESS
+
+__all__ = [
+    "JoystickDispatcher",
+    "Gesture",
+    "LONG_PRESS"
+]
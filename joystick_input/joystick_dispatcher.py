@@ -0,0 +1,150 @@
+"""This module turns SenseHat joystick events into gestures and dispatches them to handlers.
+
+File: joystick_dispatcher.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+The dispatcher blocks on the joystick's own event queue (`wait_for_event`)
+instead of polling it, so it uses no CPU until the stick moves. Long presses
+are told apart from the event timestamps: the stick repeats a `held` event
+while it is held down, and a `released` event ends every press, so no timer
+is needed either.
+"""
+import asyncio
+from enum import IntEnum
+from threading import Event, Thread
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import hal
+
+LONG_PRESS = 1.0    # Time a direction must be held for a long press (in s).
+
+# Directions of the SenseHat joystick, as named in its events.
+DIRECTIONS = ("up", "down", "left", "right", "middle")
+
+# Called without arguments when its gesture is made.
+Handler = Callable[[], None]
+
+class Gesture(IntEnum):
+    """Selects what a handler is bound to.
+
+    Two possible gestures:
+    - PRESS -> a direction pressed. Fires on the press itself, or on the release
+      if the direction also has a LONG_PRESS handler, so one never fires both.
+    - LONG_PRESS -> a direction held for at least `long_press` seconds. Fires as
+      soon as the hold is long enough, once per press.
+    """
+    PRESS       = 0
+    LONG_PRESS  = 1
+
+class JoystickDispatcher():
+    """Dispatches joystick gestures to the handlers bound to them.
+
+    Handlers run on the thread that runs the dispatcher, one at a time and in
+    the order the gestures were made.
+    """
+    def __init__(self, stick: Optional[Any] = None, long_press: float = LONG_PRESS, debug: bool = False) -> None:
+        """Initializes a dispatcher without any handler.
+
+        Arguments:
+            stick (StickBackend | None): joystick to read, the SenseHat's if None.
+            long_press (float): time a direction must be held for a long press (in s).
+            debug (bool): True if debug logging is active.
+        """
+        self._stick = stick or hal.sense_hat().stick
+        self._long_press = long_press
+        self._debug = debug
+        self._handlers: Dict[Tuple[str, Gesture], Handler] = {}
+        # Directions held down, by press timestamp, None once their long press fired.
+        self._pressed_at: Dict[str, Optional[float]] = {}
+        self._stop: Event = Event()
+
+    def on(self, direction: str, gesture: Gesture, handler: Handler) -> None:
+        """Binds a handler to a gesture, replacing any handler already bound to it.
+
+        Arguments:
+            direction (str): one of DIRECTIONS.
+            gesture (Gesture): gesture of that direction.
+            handler (Handler): called when the gesture is made.
+
+        Raises:
+            ValueError: if the direction is not a joystick direction.
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown joystick direction: {direction}")
+        self._handlers[(direction, gesture)] = handler
+
+    def dispatch(self, event: Any) -> None:
+        """Feeds one joystick event, calling the handler of any gesture it completes.
+
+        Arguments:
+            event (InputEvent): event with a timestamp (in s), a direction and an
+                action (`pressed`, `held` or `released`).
+        """
+        direction, action = event.direction, event.action
+        has_long = (direction, Gesture.LONG_PRESS) in self._handlers
+        if action == "pressed":
+            self._pressed_at[direction] = event.timestamp
+            if not has_long:
+                self._fire(direction, Gesture.PRESS)
+            return
+
+        pressed_at = self._pressed_at.get(direction)
+        if pressed_at is None:
+            # Already handled as a long press, or pressed before the dispatcher started.
+            if action == "released":
+                self._pressed_at.pop(direction, None)
+            return
+        if has_long and event.timestamp - pressed_at >= self._long_press:
+            self._pressed_at[direction] = None
+            self._fire(direction, Gesture.LONG_PRESS)
+        elif action == "released" and has_long:
+            self._fire(direction, Gesture.PRESS)
+        if action == "released":
+            self._pressed_at.pop(direction, None)
+
+    def _fire(self, direction: str, gesture: Gesture) -> None:
+        """Calls the handler bound to a gesture, if any."""
+        handler = self._handlers.get((direction, gesture))
+        if handler is None:
+            return
+        if self._debug:
+            print(f"[DEBUG] Joystick: {direction} {gesture.name}")
+        handler()
+
+    def run(self) -> None:
+        """Waits for joystick events and dispatches them, until `stop`.
+
+        Blocks inside the joystick driver between events, so an idle dispatcher
+        uses no CPU. Stopping takes effect once the current event is handled,
+        so `stop` is meant to be bound to a gesture.
+        """
+        while not self._stop.is_set():
+            self.dispatch(self._stick.wait_for_event())
+
+    async def run_async(self) -> None:
+        """Coroutine version of `run`, for the asyncio runtime. Runs until `stop` or cancelled.
+
+        A daemon thread blocks inside the joystick driver and hands each event
+        to the event loop, where the handlers run, so they must not block it.
+        The reader is a daemon rather than an executor worker because nothing
+        can wake it up before the next event, and exiting would wait for it.
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def read() -> None:
+            while not self._stop.is_set():
+                event = self._stick.wait_for_event()
+                try:
+                    loop.call_soon_threadsafe(events.put_nowait, event)
+                except RuntimeError:
+                    return  # The event loop is closed.
+
+        Thread(target=read, name="echonav-stick", daemon=True).start()
+        while not self._stop.is_set():
+            self.dispatch(await events.get())
+
+    def stop(self) -> None:
+        """Makes `run` or `run_async` return after the event being handled."""
+        self._stop.set()
@@ -0,0 +1,8 @@
+# profiler/__init__.py
+from .profiler import SamplingProfiler, PROFILE_DIR, DEFAULT_DURATION
+
+__all__ = [
+    "SamplingProfiler",
+    "PROFILE_DIR",
+    "DEFAULT_DURATION"
+]
@@ -0,0 +1,298 @@
+"""This module profiles a running EchoNav process on demand, without restarting it.
+
+File: profiler.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+A profile runs for a fixed time in a background thread. It samples the Python
+stack of every thread at a fixed interval (sys._current_frames), and diffs
+two tracemalloc snapshots taken at its start and end. A thread's stack counts
+as on CPU if the thread's CPU clock moved since the previous sample. In
+CPython a thread running Python code holds the GIL, so the per-thread CPU
+times and on-CPU stacks show which stage is starving the others, while the
+other samples show where threads wait.
+
+The report is written as text, together with the sampled stacks in the
+folded format that flame graph tools read. Nothing is sampled or traced
+outside a profile, so the process runs at full speed otherwise.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, List, Optional, Tuple
+
+PROFILE_DIR         = os.path.join(os.path.expanduser("~"), ".echonav", "profiles")
+DEFAULT_DURATION    = 10.0      # Length of a profile (in s).
+MAX_DURATION        = 120.0     # Longest profile allowed, so a stray trigger cannot trace forever.
+SAMPLE_INTERVAL     = 0.01      # Time between two stack samples (in s).
+MAX_DEPTH           = 48        # Innermost frames kept per sampled stack.
+TRACE_FRAMES        = 8         # Frames tracemalloc keeps per allocation.
+TOP_STACKS          = 10        # Stacks listed per thread in the report.
+TOP_FUNCTIONS       = 15        # Functions listed per thread in the report.
+TOP_ALLOCATIONS     = 20        # Allocation sites listed in the report.
+
+# A sampled frame: file, line, function.
+Frame = Tuple[str, int, str]
+
+# Called with the report file once a profile is written.
+ProfileCallback = Callable[[str], None]
+
+def thread_cpu(ident: int) -> Optional[float]:
+    """Returns the CPU time a thread has used so far (in s), None if the platform does not expose it."""
+    if not hasattr(time, "pthread_getcpuclockid"):
+        return None
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(ident))
+    except (OSError, ProcessLookupError):
+        return None
+
+def _format_frame(frame: Frame) -> str:
+    """Returns a frame as `function (file:line)`, with the file name only."""
+    filename, lineno, name = frame
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+class SamplingProfiler():
+    """Runs time-boxed stack sampling and allocation profiles of the current process.
+
+    At most one profile runs at a time. `start` returns immediately, so it is
+    safe to call from a joystick handler or any other thread. It takes a lock,
+    so a signal handler must hand the request to another thread instead of
+    calling it, as the thread it interrupted may hold that lock.
+    """
+    def __init__(
+        self,
+        directory: str = PROFILE_DIR,
+        interval: float = SAMPLE_INTERVAL,
+        on_done: Optional[ProfileCallback] = None
+    ) -> None:
+        """Initializes the profiler, which stays idle until `start`.
+
+        Arguments:
+            directory (str): directory the reports are written to, created if missing.
+            interval (float): time between two stack samples (in s).
+            on_done (ProfileCallback | None): called with the report file when a profile is written.
+        """
+        self._directory = directory
+        self._interval = interval
+        self._on_done = on_done
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+        self._cancel: Event = Event()
+        self._last_report: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        """Returns True while a profile is being taken."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def last_report(self) -> Optional[str]:
+        """Returns the report file of the last finished profile, None if there was none."""
+        return self._last_report
+
+    def start(self, duration: float = DEFAULT_DURATION, trace_memory: bool = True) -> bool:
+        """Starts a profile in the background, unless one is already running.
+
+        Arguments:
+            duration (float): length of the profile (in s), at most MAX_DURATION.
+            trace_memory (bool): True to also diff tracemalloc snapshots over the profile.
+                Tracing allocations slows every allocation down while the profile runs.
+
+        Returns:
+            (bool): True if a profile was started.
+        """
+        with self._lock:
+            if self.running:
+                return False
+            self._cancel.clear()
+            self._thread = Thread(
+                target=self._run,
+                args=(min(duration, MAX_DURATION), trace_memory),
+                name="echonav-profiler",
+                daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Blocks until the running profile is written, and returns its report file."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self._last_report
+
+    def cancel(self) -> None:
+        """Ends the running profile early, it is still written for the time it ran."""
+        self._cancel.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def _run(self, duration: float, trace_memory: bool) -> None:
+        """Takes one profile and writes its report."""
+        started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(TRACE_FRAMES)
+        before = tracemalloc.take_snapshot() if trace_memory else None
+
+        me = threading.get_ident()
+        stacks: Counter = Counter()         # Samples of every (thread, stack).
+        on_cpu: Counter = Counter()         # The same, only while the thread used CPU.
+        samples: Counter = Counter()
+        cpu_start: Dict[int, Optional[float]] = {}
+        cpu_last: Dict[int, Optional[float]] = {}
+        names: Dict[int, str] = {}
+        wall_start = time.monotonic()
+        deadline = wall_start + duration
+        next_sample = wall_start
+        taken = 0
+        while not self._cancel.is_set():
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            if now < next_sample:
+                self._cancel.wait(next_sample - now)
+                continue
+            next_sample += self._interval
+            if next_sample < now:
+                next_sample = now + self._interval
+            taken += 1
+
+            frames = sys._current_frames()
+            if any(ident not in names for ident in frames):
+                for thread in threading.enumerate():
+                    if thread.ident is not None and thread.ident not in names:
+                        names[thread.ident] = thread.name
+                        cpu_start[thread.ident] = cpu_last[thread.ident] = thread_cpu(thread.ident)
+            for ident, frame in frames.items():
+                if ident == me:
+                    continue
+                stack: List[Frame] = []
+                while frame is not None and len(stack) < MAX_DEPTH:
+                    code = frame.f_code
+                    stack.append((code.co_filename, frame.f_lineno, code.co_name))
+                    frame = frame.f_back
+                key = (ident, tuple(reversed(stack)))
+                stacks[key] += 1
+                samples[ident] += 1
+                used = thread_cpu(ident)
+                if used is not None and used != cpu_last.get(ident):
+                    on_cpu[key] += 1
+                cpu_last[ident] = used
+            frames = frame = None
+        wall = time.monotonic() - wall_start
+
+        cpu: Dict[int, Optional[float]] = {}
+        for ident, start in cpu_start.items():
+            end = thread_cpu(ident)
+            cpu[ident] = None if start is None or end is None else end - start
+
+        allocations = None
+        if trace_memory:
+            after = tracemalloc.take_snapshot()
+            ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+            after = after.filter_traces(ignore)
+            allocations = (
+                after.statistics("lineno")[:TOP_ALLOCATIONS],
+                after.compare_to(before.filter_traces(ignore), "lineno")[:TOP_ALLOCATIONS]
+            )
+            if started_tracing:
+                tracemalloc.stop()
+
+        path = self._write(wall, taken, names, samples, cpu, stacks, on_cpu, allocations)
+        self._last_report = path
+        if self._on_done:
+            self._on_done(path)
+
+    def _write(
+        self,
+        wall: float,
+        taken: int,
+        names: Dict[int, str],
+        samples: Counter,
+        cpu: Dict[int, Optional[float]],
+        stacks: Counter,
+        on_cpu: Counter,
+        allocations: Optional[Tuple[list, list]]
+    ) -> str:
+        """Writes the report and the folded stacks of a profile.
+
+        Returns:
+            (str): the report file. The folded stacks of all samples are next to it, with a
+            .folded extension.
+        """
+        os.makedirs(self._directory, exist_ok=True)
+        base = os.path.join(self._directory, time.strftime("profile-%Y%m%d-%H%M%S"))
+        name_of = lambda ident: names.get(ident, f"thread-{ident}")
+
+        lines = [
+            f"EchoNav profile, pid {os.getpid()}, {time.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Duration {wall:.2f} s, {taken} samples every {self._interval * 1000:.1f} ms",
+            "",
+            "Threads, by CPU time (a thread running Python code holds the GIL):",
+            f"  {'thread':28} {'cpu s':>8} {'cpu %':>7}"
+        ]
+        idents = sorted(names, key=lambda ident: -(cpu.get(ident) or 0.0))
+        for ident in idents:
+            used = cpu.get(ident)
+            cpu_text = "-" if used is None else f"{used:8.3f}"
+            share = "-" if used is None or wall <= 0 else f"{100 * used / wall:6.1f}"
+            lines.append(f"  {name_of(ident):28} {cpu_text:>8} {share:>7}")
+
+        for ident in idents:
+            if not samples[ident]:
+                continue
+            own: Counter = Counter()
+            own_cpu: Counter = Counter()
+            top = []
+            for key, count in stacks.items():
+                thread, stack = key
+                if thread != ident or not stack:
+                    continue
+                own[stack[-1]] += count
+                own_cpu[stack[-1]] += on_cpu[key]
+                top.append((on_cpu[key], count, stack))
+            lines += [
+                "",
+                f"Thread {name_of(ident)}, {samples[ident]} samples, {sum(own_cpu.values())} on CPU",
+                "  Top functions (self), % of samples on CPU / all:"
+            ]
+            ranked = sorted(own, key=lambda frame: (-own_cpu[frame], -own[frame]))[:TOP_FUNCTIONS]
+            for frame in ranked:
+                lines.append(
+                    f"    {100 * own_cpu[frame] / samples[ident]:5.1f}% {100 * own[frame] / samples[ident]:5.1f}%  "
+                    f"{_format_frame(frame)}"
+                )
+            lines.append("  Top stacks:")
+            for busy, count, stack in sorted(top, key=lambda item: (-item[0], -item[1]))[:TOP_STACKS]:
+                lines.append(
+                    f"    {100 * busy / samples[ident]:5.1f}% {100 * count / samples[ident]:5.1f}%  "
+                    f"{_format_frame(stack[-1])}"
+                )
+                for frame in reversed(stack[:-1]):
+                    lines.append(f"                    <- {_format_frame(frame)}")
+
+        if allocations is not None:
+            current, growth = allocations
+            lines += ["", "Largest live allocation sites at the end:"]
+            for stat in current:
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size / 1024:10.1f} KiB {stat.count:8} blocks  {frame.filename}:{frame.lineno}")
+            lines += ["", "Allocation growth over the profile:"]
+            for stat in growth:
+                frame = stat.traceback[0]
+                lines.append(
+                    f"  {stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8} blocks  {frame.filename}:{frame.lineno}"
+                )
+
+        with open(base + ".txt", "w") as f:
+            f.write("\n".join(lines) + "\n")
+        with open(base + ".folded", "w") as f:
+            for (ident, stack), count in stacks.items():
+                frames = ";".join(_format_frame(frame) for frame in stack)
+                f.write(f"{name_of(ident)};{frames} {count}\n")
+        return base + ".txt"
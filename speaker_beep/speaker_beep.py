@@ -2,27 +2,34 @@
 
 File: speaker_beep.py
 Author: Yihang Feng
-Last Modified: 21/10/2025
+Last Modified: 16/10/2026
 
 It generates periodic beeps that vary in frequency based on the proximity
 of detected obstacles, using data provided by ultrasonic distance sensors.
+The beeps are synthesised sample by sample in the callback of one persistent
+output stream, so an interval change is heard from the next audio buffer.
 """
 import sys
 import os
+import time
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from common_api.distance import DistanceReading
+import hal
+from common_api.distance import CarCorner, DistanceReading
+from common_api.latest import Latest
+from common_api.metrics import Metrics, BEEP_UPDATE, AUDIO_CALLBACK
+from common_api.readiness import Readiness, ProgressCallback
+from flight_recorder import FlightRecorder
 import numpy as np
-from typing import List, Optional
-from threading import Thread, Lock, Event
-import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from threading import Thread
 
-# Try to import sounddevice, but have a fallback
+# Try to load the audio backend (sounddevice on the Pi), but have a fallback
 try:
-    import sounddevice as sd
+    sd = hal.audio()
     SOUND_DEVICE_AVAILABLE = True
-    # Fix the default device to be the Pi audio jack.
-    sd.default.device = [-1, 1]
     print("INFO: sounddevice library is available")
 except ImportError:
     SOUND_DEVICE_AVAILABLE = False
@@ -32,6 +39,10 @@ except ImportError:
 SAMP_RATE = 44100          
 FREQ = 1250.0
 BEEP_PLAY_DURATION = 0.05
+FADE_DURATION = 0.005       # Raised-cosine fade in and out of every tone, avoids clicks (in s).
+CHANNELS = 2                # Stereo, so every corner can be panned.
+BLOCK_SIZE = 256            # Frames per audio buffer, ~6 ms at SAMP_RATE.
+IDLE = sys.maxsize          # Stream position while silent, so the next alert beeps at once.
 
 # Distance thresholds (in cm). Using named constants makes the mapping
 # from distance -> beep interval easier to read and change.
@@ -42,61 +53,219 @@ MIN_DIST = 2
 MIN_INTERVAL = 0.05
 MAX_INTERVAL = 0.5
 
+# An interval shrinking below this fraction of the previous one preempts the current
+# gap: the next beep follows after the shortest gap instead of the remaining one.
+PREEMPT_RATIO = 0.5
+MIN_GAP_SAMPLES = int(MIN_INTERVAL * SAMP_RATE)
+
+# Tone pitch by distance band: an obstacle closer than each edge (in cm) uses the
+# next, higher pitch. BAND_FREQS lists the closest band first (in Hz).
+BAND_EDGES = (10, 25)
+BAND_FREQS = (1760.0, 1480.0, FREQ)
+
+# Stereo position of each corner, from -1 (left) to 1 (right). Not fully hard
+# panned, so a beep is still heard with one earphone out.
+CORNER_PAN = {
+    CarCorner.BACK_LEFT: -0.8,
+    CarCorner.FRONT_LEFT: -0.8,
+    CarCorner.FRONT_RIGHT: 0.8,
+    CarCorner.BACK_RIGHT: 0.8
+}
+SECOND_GAIN = 0.5           # Level of the second closest obstacle's tone, mixed under the closest.
+
 # Controls the shape of the exponential mapping. Values <1 make the curve rise
 # faster at shorter distances (more aggressive), values >1 make it slower.
 MAPPING_EXPONENT = 0.5
 
+# (closest, second closest or None) tones of a beep, views into the tone bank.
+Voice = Tuple[np.ndarray, Optional[np.ndarray]]
+
+@dataclass(frozen=True)
+class BeepState:
+    """Immutable DTO of what the speaker should play, replaced whole on every update."""
+    closest: Optional[float]        # Distance to the closest obstacle (in cm), None when silent.
+    interval: Optional[float]       # Gap between two beeps (in s), None when silent.
+    gap_samples: Optional[int]      # The same gap in samples, as the audio callback counts it.
+    voice: Voice                    # Tones of the next beep.
+    preempt: int                    # Counts sharp interval drops, a new count preempts the gap.
+
+def build_tone_bank() -> np.ndarray:
+    """Precomputes every tone a beep can be made of.
+
+    Returns:
+        (np.ndarray): float32 array indexed [level, band, corner, sample, channel],
+        where level 0 is the closest obstacle and level 1 the second closest,
+        scaled by SECOND_GAIN. About 420 kB with the default constants.
+    """
+    count = int(SAMP_RATE * BEEP_PLAY_DURATION)
+    fade = int(SAMP_RATE * FADE_DURATION)
+    envelope = np.ones(count)
+    envelope[:fade] = 0.5 - 0.5 * np.cos(np.pi * np.arange(fade) / fade)
+    envelope[-fade:] = envelope[fade - 1::-1]
+
+    t = np.arange(count) / SAMP_RATE
+    bank = np.empty((2, len(BAND_FREQS), len(CarCorner), count, CHANNELS), dtype=np.float32)
+    for band, freq in enumerate(BAND_FREQS):
+        tone = 0.5 * envelope * np.sin(2 * np.pi * freq * t)
+        for corner in CarCorner:
+            # Constant-power pan, so a tone sounds as loud wherever it is placed.
+            angle = (CORNER_PAN[corner] + 1) * np.pi / 4
+            bank[0, band, corner, :, 0] = tone * np.cos(angle)
+            bank[0, band, corner, :, 1] = tone * np.sin(angle)
+    bank[1] = bank[0] * SECOND_GAIN
+    return bank
+
 class SpeakerBeep():
     """Generates a proximity-based beeping sound through the Raspberry Pi's audio output.
 
     The beeping interval is dynamically adjusted based on the distance to the nearest
     detected obstacle. A shorter distance results in faster beeping, creating an
-    intuitive proximity alert system.
+    intuitive proximity alert system. The pitch rises by distance band and the
+    beep is panned towards the obstacle's corner, with the second closest
+    obstacle mixed in quieter.
     """
-    def __init__(self, debug: bool = False) -> None:
+    def __init__(
+        self,
+        debug: bool = False,
+        on_progress: Optional[ProgressCallback] = None,
+        recorder: Optional[FlightRecorder] = None,
+        metrics: Optional[Metrics] = None
+    ) -> None:
         """Initializes the SpeakerBeep class.
+
+        The audio device is opened in the background, see `readiness`.
         
         Arguments:
             debug (bool): True if debug logging is active.
+            on_progress (ProgressCallback | None): called with start-up progress messages.
+            recorder (FlightRecorder | None): recorder the start of every beep is logged to, if any.
+            metrics (Metrics | None): registry the updates and audio buffers are timed in, and
+                the beeps counted in. A private one if None.
         """
         self._debug: bool = debug
-        self._closest_dist: Optional[float] = None
-        self._curr_duration: Optional[float] = None
+        self._recorder = recorder
+        metrics = metrics or Metrics()
+        self._beep_update = metrics.histogram(BEEP_UPDATE)
+        self._audio_callback = metrics.histogram(AUDIO_CALLBACK)
+        self._beeps = metrics.counter("beeps")
+        self._beeps_preempted = metrics.counter("beeps_preempted")
         self._audio_available: bool = SOUND_DEVICE_AVAILABLE
-
-        # Thread controls.
-        self._play_flag: Event = Event()
-        self._thread: Optional[Thread] = None
-        self._lock = Lock()
+        self._stream = None
+        self._playing: bool = False
+        
+        # Build every tone once, and keep a view of each so picking one never allocates.
+        self._bank = build_tone_bank()
+        self._tones = [[list(by_corner) for by_corner in by_band] for by_band in self._bank]
+        self._beep_len = self._bank.shape[3]
+        silence = np.zeros((self._beep_len, CHANNELS), dtype=np.float32)
         
-        # Cache the generated waveform so we don't need to recreate it on every beep call.
-        t = np.linspace(0, BEEP_PLAY_DURATION, int(SAMP_RATE * BEEP_PLAY_DURATION), endpoint=False)
-        self._cached_wave = 0.5 * np.sin(2 * np.pi * FREQ * t)
+        # What to play, published by `update_closest` and read by the audio callback
+        # without either side locking.
+        self._state: Latest[BeepState] = Latest(BeepState(None, None, None, (silence, None), 0))
+        
+        # Owned by the audio callback.
+        self._pos: int = IDLE                     # Samples since the start of the current beep.
+        self._beep_voice: Voice = (silence, None) # Tones of the beep playing.
+        self._preempt_seen: int = 0               # Preempt count already acted on.
+        
+        # Open the audio device without blocking start-up.
+        self._readiness = Readiness("audio", on_progress)
+        Thread(target=self._warm_up, name="echonav-audio-warm-up", daemon=True).start()
+
+    def _warm_up(self) -> None:
+        """Opens and starts the output stream, which stays silent until `start` is called."""
+        if not self._audio_available:
+            self._readiness.set_ready("ready (no audio device)")
+            return
+        try:
+            stream = sd.OutputStream(
+                samplerate=SAMP_RATE, channels=CHANNELS, dtype="float32",
+                callback=self._callback, blocksize=BLOCK_SIZE, latency="low"
+            )
+            stream.start()
+            self._stream = stream
+        except Exception as e:
+            self._audio_available = False
+            if self._debug:
+                print(f"[DEBUG] Audio error: {e}")
+            self._readiness.set_ready("ready (no audio device)")
+            return
+        self._readiness.set_ready()
+
+    @property
+    def readiness(self) -> Readiness:
+        """Returns the start-up state of the audio output, ready once the device is open."""
+        return self._readiness
         
     def update_closest(self, nearby_objects: List[DistanceReading]) -> None:
         """Updates the system with the most recent distance readings.
 
-        Determines which object is closest and updates the beeping duration
-        accordingly. Ignores any sensors that return invalid (None) readings.
+        Determines which objects are the two closest and updates the beeping
+        duration and tones accordingly. Ignores any sensors that return invalid
+        (None) readings, and goes silent as soon as no sensor reports a distance,
+        whatever their status (out of range, no response, error or backed off),
+        so a stale beep never outlives the obstacle.
 
         Arguments:
             nearby_objects (List[DistanceReadings]): most recent distance readings to process.
         """
         if not nearby_objects:
             return
+        start = time.perf_counter_ns()
+        self._update_from(nearby_objects)
+        self._beep_update.since(start)
+
+    def _update_from(self, nearby_objects: List[DistanceReading]) -> None:
+        """Updates the state for the two closest obstacles of a non-empty list of readings."""
+        # Find the two closest valid objects, skipping None readings.
+        closest = second = None
+        for obj in nearby_objects:
+            if obj.distance is None:
+                continue
+            if closest is None or obj.distance < closest.distance:
+                closest, second = obj, closest
+            elif second is None or obj.distance < second.distance:
+                second = obj
         
-        # Filter out None readings before finding the closest
-        valid_objects = [obj for obj in nearby_objects if obj.distance is not None]
-        
-        if not valid_objects:
+        if closest is None:
+            # Nothing is known to be in range, keeping the last interval would beep for an obstacle that left.
+            self._update_state(None, self._state.get().voice)
             return
         
-        # Find the closest valid object
-        closest_object = min(valid_objects, key=lambda obj: obj.distance)
-        self._closest_dist = closest_object.distance
-        self._update_duration()
+        self._update_state(closest.distance, self._voice_for(closest, second))
+
+    def _voice_for(self, closest: DistanceReading, second: Optional[DistanceReading]) -> Voice:
+        """Selects the tones of the next beep from the tone bank.
 
-    def _map_dist_to_duration(self, distance: float) -> Optional[float]:
+        Arguments:
+            closest (DistanceReading): closest obstacle, sets the pitch and pan.
+            second (DistanceReading | None): second closest obstacle, mixed in if within MAX_DIST.
+
+        Returns:
+            (Voice): the closest obstacle's tone, and the second one's or None.
+        """
+        primary = self._tones[0][bisect_right(BAND_EDGES, closest.distance)][closest.corner]
+        secondary = None
+        if second is not None and second.distance <= MAX_DIST:
+            secondary = self._tones[1][bisect_right(BAND_EDGES, second.distance)][second.corner]
+        return (primary, secondary)
+
+    @staticmethod
+    def interval_for(nearby_objects: List[DistanceReading]) -> Optional[float]:
+        """Returns the beeping interval a list of readings maps to, without touching the audio device.
+
+        Arguments:
+            nearby_objects (List[DistanceReading]): latest reading of each sensor.
+
+        Returns:
+            (float | None): gap between two beeps for the closest obstacle (in s), None if
+            no reading has a distance.
+        """
+        distances = [obj.distance for obj in nearby_objects if obj.distance is not None]
+        return SpeakerBeep._map_dist_to_duration(min(distances)) if distances else None
+
+    @staticmethod
+    def _map_dist_to_duration(distance: float) -> Optional[float]:
         """
         Maps a distance value (cm) to a beeping interval duration (seconds).
 
@@ -116,76 +285,125 @@ class SpeakerBeep():
         duration = MIN_INTERVAL + (MAX_INTERVAL - MIN_INTERVAL) * (norm ** MAPPING_EXPONENT)
         return max(MIN_INTERVAL, min(MAX_INTERVAL, duration))
                 
-    def _update_duration(self) -> None:
-        """Recalculates the beeping interval duration based on the most recent distance."""
-        if self._closest_dist is None:
-            with self._lock:
-                self._curr_duration = None
+    def _update_state(self, closest: Optional[float], voice: Voice) -> None:
+        """Recalculates the beeping interval based on the closest distance, and publishes it.
+
+        The new state is picked up by the audio callback from the next buffer
+        it fills. A sharp drop (a much closer obstacle) also preempts the gap
+        in progress, see PREEMPT_RATIO.
+
+        Arguments:
+            closest (float | None): distance to the closest obstacle (in cm), None to go silent.
+            voice (Voice): tones of the next beep.
+        """
+        previous = self._state.get()
+        if closest is None:
+            self._state.set(BeepState(None, None, None, voice, previous.preempt))
             return
     
-        duration = self._map_dist_to_duration(self._closest_dist)
-        with self._lock:
-            self._curr_duration = duration
+        duration = self._map_dist_to_duration(closest)
+        preempt = previous.preempt
+        if previous.interval is not None and duration < previous.interval * PREEMPT_RATIO:
+            preempt += 1
+        self._state.set(BeepState(closest, duration, int(duration * SAMP_RATE), voice, preempt))
+
+    @property
+    def interval(self) -> Optional[float]:
+        """Returns the current gap between two beeps (in s), None when silent."""
+        return self._state.get().interval
+
+    @property
+    def closest(self) -> Optional[float]:
+        """Returns the distance to the obstacle being beeped for (in cm), None when silent."""
+        return self._state.get().closest
 
     def start(self) -> None:
-        """Start the beeping loop once.
+        """Starts beeping at the current interval.
         
         Safe to call multiple times.
         """
-        if self._thread and self._thread.is_alive():
-            return
-        self._play_flag.set()
-        self._thread = Thread(target=self._beep_loop)
-        self._thread.start()
+        if self._debug and not self._playing:
+            print("[DEBUG] Beeping started.")
+        self._playing = True
+
+    def _callback(self, outdata: np.ndarray, frames: int, time_info: object, status: object) -> None:
+        """Fills the next audio buffer, called from the audio thread.
 
-    def _beep_loop(self) -> None:
-        """Continuous loop that handles the timing and playback of beep sounds.
+        Every beep is the tones of the current voice, latched when the beep
+        starts, followed by the current gap of silence. The state is read once
+        per buffer, so a shorter interval cuts the current gap short and None
+        ends the beeping once the current beep is played. A preempted gap ends
+        after MIN_GAP_SAMPLES, the shortest gap that still keeps two beeps apart.
+        Tones are copied and mixed in place from the tone bank, so no sample
+        buffer is allocated per beep.
 
-        The beeping frequency is adjusted in real time as distance updates
-        are received. The loop runs until stopped externally.
+        Arguments:
+            outdata (np.ndarray): (frames, CHANNELS) buffer to fill.
+            frames (int): number of frames to write.
+            time_info (object): stream timestamps, unused.
+            status (object): stream underflow flags, unused.
         """
-        if self._debug:
-            print("[DEBUG] Beep thread started.")
-        while self._play_flag.is_set():
-            with self._lock:
-                dur = self._curr_duration
-                dist = self._closest_dist
-
-            # Busy wait if there is no current duration.
-            if dur is None:
-                time.sleep(0.1)
-                
-                if self._debug:
-                    print(f"[DEBUG] Beeping (dist={dist}, dur={dur})")
+        start = time.perf_counter_ns()
+        state = self._state.get()
+        primary, secondary = self._beep_voice
+        beep_len = self._beep_len
+        pos = self._pos
+        written = 0
+        while written < frames:
+            if pos < beep_len:
+                count = min(frames - written, beep_len - pos)
+                block = outdata[written:written + count]
+                block[:] = primary[pos:pos + count]
+                if secondary is not None:
+                    block += secondary[pos:pos + count]
+                pos += count
+                written += count
                 continue
-            try:
-                sd.play(self._cached_wave, SAMP_RATE)
-                sd.wait()
-            except Exception as e:
-                if self._debug:
-                    print(f"[DEBUG] Audio error: {e}")
 
-            if self._debug:
-                print(f"[DEBUG] Beeping (dist={dist:.1f}, dur={dur:.2f}s)")
-            time.sleep(dur)
-        
-        if self._debug:
-            print("[DEBUG] Beep thread exited.")
+            gap = state.gap_samples
+            if gap is None or not self._playing:
+                outdata[written:] = 0
+                pos = IDLE
+                break
+            if state.preempt != self._preempt_seen and gap > MIN_GAP_SAMPLES:
+                gap = MIN_GAP_SAMPLES
+            if pos >= beep_len + gap:
+                pos = 0
+                preempted = state.preempt != self._preempt_seen
+                self._beeps.add()
+                if preempted:
+                    self._beeps_preempted.add()
+                if self._recorder:
+                    self._recorder.beep(state.interval, state.closest, preempted)
+                self._preempt_seen = state.preempt
+                primary, secondary = self._beep_voice = state.voice
+                continue
+            count = min(frames - written, beep_len + gap - pos)
+            outdata[written:written + count] = 0
+            pos += count
+            written += count
+        self._pos = pos
+        self._audio_callback.since(start)
 
     def stop(self) -> None:
-        """Stops the beeping loop and safely terminates the background thread.
+        """Stops beeping once the current beep has played.
 
-        Cleans up any active sound playback to prevent hanging audio processes.
+        The output stream stays open so `start` beeps again without delay, see `close`.
         """
         if self._debug:
-            print("[DEBUG] Stopping beep thread...")
-        self._play_flag.clear()
-        if self._thread:
-            self._thread.join(timeout=1)
-            self._thread = None
+            print("[DEBUG] Stopping beeping...")
+        self._playing = False
+
+    def close(self) -> None:
+        """Stops beeping and releases the audio device."""
+        self.stop()
+        self._readiness.wait(timeout=1)
+        stream, self._stream = self._stream, None
+        if stream is None:
+            return
         try:
-            if self._audio_available:
-                sd.stop()
+            stream.stop()
+            stream.close()
         except Exception as e:
             if self._debug:
-                print(f"[DEBUG] Audio error: {e}")
\ No newline at end of file
+                print(f"[DEBUG] Audio error: {e}")
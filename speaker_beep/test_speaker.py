@@ -8,10 +8,13 @@ import sounddevice as sd
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from speaker_beep import SpeakerBeep
+from common_api.distance import CarCorner, ReadingStatus
 
 class MockDistanceReading:
-    def __init__(self, distance):
+    def __init__(self, distance, corner=CarCorner.BACK_LEFT, status=ReadingStatus.OK):
         self.distance = distance
+        self.corner = corner
+        self.status = status
 
 def test_audio_system():
     """Test if the audio system is working"""
@@ -61,9 +64,9 @@ def test_basic_functionality():
         
         beep.update_closest(objects)
         
-        print(f"  {case['desc']}: {beep._curr_duration}s (expected: {case['expected_duration']}s)")
+        print(f"  {case['desc']}: {beep.interval}s (expected: {case['expected_duration']}s)")
         
-        if beep._curr_duration != case['expected_duration']:
+        if beep.interval != case['expected_duration']:
             print(f"✗ Failed for {case['desc']}")
             return False
     
@@ -120,12 +123,12 @@ def test_backup_simulation():
         else:
             status = "CRITICAL"
             
-        print(f"Distance: {distance:3d}cm | Beep interval: {beep._curr_duration}s | {status}")
+        print(f"Distance: {distance:3d}cm | Beep interval: {beep.interval}s | {status}")
         
-        if beep._curr_duration:
+        if beep.interval:
             print("  Playing beep...")
             beep.play_beep()
-            time.sleep(beep._curr_duration)
+            time.sleep(beep.interval)
         else:
             print("  No beep (safe distance)")
             time.sleep(0.5)  # Shorter wait for safe distance
@@ -177,14 +180,14 @@ def test_continuous_beeping():
         objects = [MockDistanceReading(distance)]
         beep.update_closest(objects)
         
-        print(f"  Beep interval: {beep._curr_duration}s")
+        print(f"  Beep interval: {beep.interval}s")
         
-        if beep._curr_duration:
+        if beep.interval:
             # Play more beeps to better demonstrate the pattern
             for i in range(5):
                 print(f"  Beep {i+1}...")
                 beep.play_beep()
-                time.sleep(beep._curr_duration)
+                time.sleep(beep.interval)
         else:
             print("  No beeps (as expected)")
             time.sleep(1.0)
@@ -199,7 +202,7 @@ def test_constant_distance():
     constant_distance = 20  # 20cm, should result in 0.15s interval
     objects = [MockDistanceReading(constant_distance)]
     beep.update_closest(objects)
-    interval = beep._curr_duration
+    interval = beep.interval
     print(f"Distance: {constant_distance}cm | Expected interval: 0.15s | Actual interval: {interval}s")
     if interval != 0.15:
         print(f"✗ Interval incorrect, actual: {interval}s")
@@ -253,9 +256,9 @@ def interactive_test():
             beep.update_closest(objects)
             
             print(f"Distance: {distance}cm")
-            print(f"Beep interval: {beep._curr_duration}s")
+            print(f"Beep interval: {beep.interval}s")
             
-            if beep._curr_duration:
+            if beep.interval:
                 print("Playing beep...")
                 beep.play_beep()
                 
@@ -1,6 +1,7 @@
 # ultrasonic_capture/__init__.py
-from .ultrasonic_capture import UltrasonicCapture
+from .ultrasonic_capture import UltrasonicCapture, EchoTiming
 
 __all__ = [
-    "UltrasonicCapture"
-]
\ No newline at end of file
+    "UltrasonicCapture",
+    "EchoTiming"
+]
@@ -0,0 +1,189 @@
+"""This module decides which corners to ping on each sweep, based on how urgent they are.
+
+File: adaptive_schedule.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Each sweep has a budget of ping slots. Corners with a close, approaching or
+recently changed obstacle get slots in proportion to their urgency, so the
+most urgent one can be pinged several times in one sweep, while far or static
+corners are only pinged often enough to honour their minimum refresh
+guarantee. This spends the limited ping budget where collisions can actually
+happen.
+"""
+from typing import Collection, Dict, List, Optional
+
+from common_api.distance import CarCorner, DistanceReading
+
+NEAR_DIST       = 30.0  # Obstacles this close are maximally urgent (in cm).
+FAR_DIST        = 200.0 # Obstacles this far away carry no proximity urgency (in cm).
+APPROACH_SPEED  = 30.0  # Closing speed that is maximally urgent (in cm/s).
+CHANGE_DIST     = 10.0  # Jump between readings that is maximally urgent (in cm).
+MIN_REFRESH     = 0.5   # Default max age of any corner's reading (in s).
+PING_BUDGET     = 2     # Ping slots per sweep, unless more corners are overdue.
+MAX_OVERFLOW    = 1     # Extra slots overdue corners may take beyond the budget.
+
+class CornerUrgency():
+    """Tracks the recent readings of one corner and rates how urgently it needs a ping."""
+    def __init__(self, corner: CarCorner, min_refresh: float) -> None:
+        """Initializes the tracker with no readings.
+
+        Arguments:
+            corner (CarCorner): corner being tracked.
+            min_refresh (float): max time between two pings of this corner (in s).
+        """
+        self.corner = corner
+        self.min_refresh = min_refresh
+        self.last_ping: Optional[float] = None
+        self.distance: Optional[float] = None
+        self.urgency: float = 1.0
+
+    def observe(self, distance: Optional[float], now: float) -> None:
+        """Updates the urgency from a new reading of this corner.
+
+        Arguments:
+            distance (float | None): latest distance, or None if nothing is in range.
+            now (float): monotonic time of the reading (in s).
+        """
+        proximity = approach = change = 0.0
+
+        if distance is not None:
+            proximity = (FAR_DIST - distance) / (FAR_DIST - NEAR_DIST)
+
+        if self.last_ping is not None:
+            if (distance is None) != (self.distance is None):
+                # An obstacle just appeared or vanished.
+                change = 1.0
+            elif distance is not None:
+                delta = self.distance - distance
+                change = abs(delta) / CHANGE_DIST
+                dt = now - self.last_ping
+                if dt > 0:
+                    approach = (delta / dt) / APPROACH_SPEED
+
+        self.urgency = max(0.0, min(1.0, max(proximity, approach, change)))
+        self.distance = distance
+        self.last_ping = now
+
+    def age(self, now: float) -> float:
+        """Returns the time since this corner was last pinged (infinite if never)."""
+        if self.last_ping is None:
+            return float("inf")
+        return now - self.last_ping
+
+    def priority(self, now: float) -> float:
+        """Returns how overdue this corner is; 1.0 means its urgency-scaled interval has elapsed.
+
+        A fully urgent corner is due on every sweep, a non-urgent one only once
+        its minimum refresh interval has elapsed.
+        """
+        interval = self.min_refresh * (1.0 - self.urgency)
+        if interval <= 0:
+            return float("inf")
+        return self.age(now) / interval
+
+def rounds_of(slots: Dict[CarCorner, int]) -> List[List[CarCorner]]:
+    """Splits a slot allocation into firing rounds, each pinging a corner at most once.
+
+    Arguments:
+        slots (Dict[CarCorner, int]): ping slots of each corner, see `AdaptiveScheduler.select`.
+
+    Returns:
+        (List[List[CarCorner]]): corners of each round, the first round holds every corner.
+    """
+    return [
+        [corner for corner, count in slots.items() if count > i]
+        for i in range(max(slots.values(), default=0))
+    ]
+
+class AdaptiveScheduler():
+    """Allocates the per-sweep ping slots across corners by urgency.
+
+    Every corner whose reading is older than its minimum refresh interval gets
+    a slot first, the most overdue first, and may take up to `max_overflow`
+    slots beyond the budget. The remaining slots are handed out one at a time
+    to the corner with the highest urgency per slot it already has (D'Hondt),
+    so a corner can take several slots. Once no corner is urgent, the spare
+    slots go to the corners not pinged yet, by priority.
+    """
+    def __init__(
+        self,
+        corners: List[CarCorner],
+        min_refresh: Optional[Dict[CarCorner, float]] = None,
+        budget: int = PING_BUDGET,
+        max_overflow: int = MAX_OVERFLOW
+    ) -> None:
+        """Initializes the scheduler.
+
+        Arguments:
+            corners (List[CarCorner]): corners that can be pinged.
+            min_refresh (Dict[CarCorner, float] | None): per-corner max time between pings (in s),
+                corners that are not listed use MIN_REFRESH.
+            budget (int): ping slots per sweep when no more corners than that are overdue.
+            max_overflow (int): extra slots overdue corners may take beyond the budget.
+        """
+        min_refresh = min_refresh or {}
+        self._budget = max(1, budget)
+        self._max_overflow = max(0, max_overflow)
+        self._corners: Dict[CarCorner, CornerUrgency] = {
+            corner: CornerUrgency(corner, min_refresh.get(corner, MIN_REFRESH))
+            for corner in corners
+        }
+
+    @property
+    def max_slots(self) -> int:
+        """Returns the most ping slots a sweep can be allocated."""
+        return self._budget + self._max_overflow
+
+    def select(self, now: float, eligible: Optional[Collection[CarCorner]] = None) -> Dict[CarCorner, int]:
+        """Allocates the ping slots of the next sweep, see `rounds_of` to fire them.
+
+        Only eligible corners are ranked: a corner that cannot be pinged never
+        refreshes its age, so it would otherwise take an overdue slot on every sweep.
+
+        Arguments:
+            now (float): current monotonic time (in s).
+            eligible (Collection[CarCorner] | None): corners that can be pinged now, all of them if None.
+
+        Returns:
+            (Dict[CarCorner, int]): ping slots of every chosen corner, most slots first.
+            At most budget + max_overflow slots in total.
+        """
+        candidates = [
+            c for corner, c in self._corners.items() if eligible is None or corner in eligible
+        ]
+        ranked = sorted(
+            candidates,
+            key=lambda c: c.priority(now),
+            reverse=True
+        )
+        overdue = [c for c in ranked if c.age(now) >= c.min_refresh]
+        slots: Dict[CornerUrgency, int] = {
+            c: 1 for c in overdue[:self.max_slots]
+        }
+
+        for _ in range(self._budget - len(slots) if ranked else 0):
+            # Ties go to the higher priority, as `max` keeps the first of the ranking.
+            best = max(ranked, key=lambda c: c.urgency / (slots.get(c, 0) + 1))
+            if best.urgency <= 0:
+                spare = [c for c in ranked if c not in slots]
+                if not spare:
+                    break
+                best = spare[0]
+            slots[best] = slots.get(best, 0) + 1
+
+        chosen = sorted(slots, key=lambda c: slots[c], reverse=True)
+        return {c.corner: slots[c] for c in chosen}
+
+    def observe(self, reading: DistanceReading, now: float) -> None:
+        """Feeds a fresh reading back so the corner's urgency can be updated.
+
+        Arguments:
+            reading (DistanceReading): newly produced reading.
+            now (float): monotonic time of the reading (in s).
+        """
+        self._corners[reading.corner].observe(reading.distance, now)
+
+    def urgency(self) -> Dict[CarCorner, float]:
+        """Returns the current urgency in [0, 1] of every corner."""
+        return {corner: c.urgency for corner, c in self._corners.items()}
@@ -0,0 +1,159 @@
+"""This module provides the streaming distance filter used by each ultrasonic sensor.
+
+File: distance_filter.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Instead of firing a burst of pings and discarding it when the pings disagree,
+every single ping is pushed into a small ring buffer. A running median rejects
+outliers and an alpha-beta tracker smooths the accepted pings, so a fresh
+distance estimate (and a confidence value) is produced after every ping.
+
+Two cases skip the median, so the alarm never lags behind the obstacle: the
+track is dropped once MAX_MISSES pings in a row have no echo, and it is
+re-seeded once RESEED_PINGS pings in a row agree on an obstacle much closer
+than the track. A single short echo (crosstalk, a ground return) is still
+rejected by the median.
+"""
+import statistics
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+WINDOW          = 5     # Pings kept in each sensor's ring buffer.
+ALPHA           = 0.6   # Alpha-beta position gain, higher trusts new pings more.
+BETA            = 0.1   # Alpha-beta velocity gain.
+MAX_MISSES      = 2     # Pings in a row without an echo that drop the track.
+RESEED_FACTOR   = 3.0   # Pings closer than the track by this many max_dev may re-seed it.
+RESEED_PINGS    = 2     # Such pings in a row, agreeing within max_dev, that re-seed the track.
+
+class DistanceFilter():
+    """Per-sensor ring-buffer filter combining a running median and an alpha-beta tracker.
+
+    A ping is accepted when it lies within `max_dev` of the buffer median,
+    otherwise the tracker only predicts forward. If the median itself moves
+    away from the track (a new obstacle appeared), the track is reset onto it.
+    `reseed_pings` pings in a row that agree on an obstacle much closer than
+    the track re-seed it straight away, and `max_misses` pings in a row
+    without an echo drop it.
+    """
+    def __init__(
+        self,
+        max_dev: float,
+        window: int = WINDOW,
+        alpha: float = ALPHA,
+        beta: float = BETA,
+        max_misses: int = MAX_MISSES,
+        reseed_pings: int = RESEED_PINGS
+    ) -> None:
+        """Initializes an empty filter.
+
+        Arguments:
+            max_dev (float): max deviation from the median for a ping to be accepted (in cm).
+            window (int): number of pings kept in the ring buffer.
+            alpha (float): alpha-beta position gain.
+            beta (float): alpha-beta velocity gain.
+            max_misses (int): pings in a row without an echo that drop the track.
+            reseed_pings (int): pings in a row much closer than the track that re-seed it.
+        """
+        self._max_dev = max_dev
+        self._alpha = alpha
+        self._beta = beta
+        self._max_misses = max_misses
+        self._buffer: Deque[Optional[float]] = deque(maxlen=window)
+        self._misses: int = 0
+        self._reseed_pings = max(1, reseed_pings)
+        self._closer: List[float] = []     # Pings in a row much closer than the track.
+
+        # Alpha-beta track state.
+        self._estimate: Optional[float] = None
+        self._velocity: float = 0.0
+        self._last_time: Optional[float] = None
+
+    def reset(self) -> None:
+        """Forgets all buffered pings and the current track."""
+        self._buffer.clear()
+        self._misses = 0
+        self._closer.clear()
+        self._estimate = None
+        self._velocity = 0.0
+        self._last_time = None
+
+    @property
+    def velocity(self) -> float:
+        """Returns the tracked rate of change of the distance (in cm/s, negative when approaching)."""
+        return self._velocity
+
+    def update(self, distance: Optional[float], timestamp: float) -> Tuple[Optional[float], float]:
+        """Feeds one ping into the filter.
+
+        Arguments:
+            distance (float | None): single-ping distance in centimeters, or None if it timed out.
+            timestamp (float): monotonic time of the ping (in s).
+
+        Returns:
+            (float | None, float): the filtered distance, or None once the latest
+            `max_misses` pings had no echo, and the confidence in [0, 1] of that estimate.
+        """
+        if distance is not None and distance < 0:
+            distance = None
+        if distance is None:
+            self._misses += 1
+            if self._misses >= self._max_misses:
+                # The obstacle is gone, do not keep reporting it from older pings.
+                self.reset()
+                return None, 0.0
+        else:
+            self._misses = 0
+        self._buffer.append(distance)
+
+        valid = [r for r in self._buffer if r is not None]
+        if not valid:
+            self.reset()
+            return None, 0.0
+
+        # Predict the track forward to the time of this ping.
+        dt = 0.0 if self._last_time is None else timestamp - self._last_time
+        self._last_time = timestamp
+        if self._estimate is not None and dt > 0:
+            predicted = self._estimate + self._velocity * dt
+        else:
+            predicted = self._estimate
+
+        # A much closer obstacle appeared: once confirmed, follow it without waiting for the median.
+        if (
+            distance is not None and predicted is not None
+            and distance < predicted - RESEED_FACTOR * self._max_dev
+        ):
+            if self._closer and abs(distance - self._closer[0]) > self._max_dev:
+                self._closer.clear()
+            self._closer.append(distance)
+            if len(self._closer) >= self._reseed_pings:
+                self._buffer.clear()
+                self._buffer.extend(self._closer)
+                self._closer.clear()
+                self._estimate = distance
+                self._velocity = 0.0
+                return self._estimate, len(self._buffer) / self._buffer.maxlen
+        else:
+            self._closer.clear()
+
+        median = statistics.median(valid)
+        if self._estimate is None or abs(median - self._estimate) > self._max_dev:
+            self._estimate = median
+            self._velocity = 0.0
+        elif dt > 0:
+            self._estimate += self._velocity * dt
+
+        # Only correct the track with pings that agree with the median.
+        if distance is not None and abs(distance - median) <= self._max_dev:
+            residual = distance - self._estimate
+            self._estimate += self._alpha * residual
+            if dt > 0:
+                self._velocity += self._beta * residual / dt
+        self._estimate = max(0.0, self._estimate)
+
+        # Confidence is the share of the buffer that agrees with the median.
+        inliers = sum(1 for r in valid if abs(r - median) <= self._max_dev)
+        confidence = inliers / self._buffer.maxlen
+
+        return self._estimate, confidence
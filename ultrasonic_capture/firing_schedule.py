@@ -0,0 +1,315 @@
+"""This module schedules which ultrasonic sensors may be fired at the same time.
+
+File: firing_schedule.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Sensors that cannot hear each other's pings (for example the front and back
+pairs) are fired together and their echoes are collected concurrently, which
+multiplies the sweep rate while keeping the same cross-talk protection as
+firing every sensor on its own.
+"""
+import asyncio
+import time
+from concurrent.futures import Executor
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from common_api.distance import CarCorner, ReadingStatus
+
+if TYPE_CHECKING:
+    from .ultrasonic_capture import UltrasonicSensor
+
+# Interference matrix, rows and columns follow the CarCorner order:
+# BACK_LEFT, BACK_RIGHT, FRONT_RIGHT, FRONT_LEFT.
+# A 1 means the two sensors hear each other's pings and must not fire together.
+DEFAULT_INTERFERENCE: List[List[int]] = [
+    [1, 1, 0, 0],
+    [1, 1, 0, 0],
+    [0, 0, 1, 1],
+    [0, 0, 1, 1]
+]
+
+GROUP_GAP = 0.05    # Pause before each group fires, lets earlier echoes die out (in s).
+
+# Called with a group, the samples and the errors of the sweep so far.
+GroupCallback = Callable[
+    [List["UltrasonicSensor"], Dict[CarCorner, List[Optional[float]]], Dict[CarCorner, Exception]],
+    None
+]
+
+class FiringScheduler():
+    """Fires groups of mutually non-interfering sensors together.
+
+    The groups are derived once from the interference matrix by greedy
+    colouring in CarCorner order, so the default matrix yields the two
+    diagonal pairs. A matrix of all 1s reproduces strictly sequential firing.
+    """
+    def __init__(
+        self,
+        sensors: List["UltrasonicSensor"],
+        interference: Optional[List[List[int]]] = None,
+        debug: bool = False,
+        on_ping: Optional[Callable[["UltrasonicSensor", ReadingStatus, float], None]] = None
+    ) -> None:
+        """Initializes the scheduler and computes the firing groups.
+
+        Arguments:
+            sensors (List[UltrasonicSensor]): sensors to schedule.
+            interference (List[List[int]] | None): CarCorner x CarCorner interference matrix.
+            debug (bool): True if debug logging is active.
+            on_ping (Callable | None): called with the sensor, outcome and latency of every ping.
+        """
+        self._interference = interference or DEFAULT_INTERFERENCE
+        self._on_ping = on_ping
+        self._groups: List[List["UltrasonicSensor"]] = self._build_groups(sensors)
+
+        if debug:
+            for i, group in enumerate(self._groups):
+                names = ", ".join(sensor.name for sensor in group)
+                print(f"[DEBUG] Firing group {i}: {names}")
+
+    def _interferes(self, a: CarCorner, b: CarCorner) -> bool:
+        """Checks whether two corners may not fire at the same time.
+
+        The matrix is treated as symmetric, so one-sided entries are enough.
+        """
+        return bool(self._interference[a][b] or self._interference[b][a])
+
+    def _build_groups(self, sensors: List["UltrasonicSensor"]) -> List[List["UltrasonicSensor"]]:
+        """Greedily places each sensor into the first group it does not interfere with.
+
+        Arguments:
+            sensors (List[UltrasonicSensor]): sensors to place.
+
+        Returns:
+            (List[List[UltrasonicSensor]]): firing groups, in firing order.
+        """
+        groups: List[List["UltrasonicSensor"]] = []
+        for sensor in sorted(sensors, key=lambda s: s.corner):
+            for group in groups:
+                if not any(self._interferes(sensor.corner, other.corner) for other in group):
+                    group.append(sensor)
+                    break
+            else:
+                groups.append([sensor])
+        return groups
+
+    @property
+    def groups(self) -> List[List[CarCorner]]:
+        """Returns the corners of each firing group, in firing order."""
+        return [[sensor.corner for sensor in group] for group in self._groups]
+
+    def worst_case_duration(self, trials: int) -> float:
+        """Returns the longest a full sweep of `trials` pings per sensor can take (in s).
+
+        Every echo wait is bounded by the sensor's echo deadline, so this is an
+        upper bound on the time spent sleeping and waiting, excluding GPIO overhead.
+        """
+        duration = 0.0
+        for group in self._groups:
+            edge_timed = [sensor.echo_deadline for sensor in group if sensor.edge_timed]
+            polled = [sensor.echo_deadline for sensor in group if not sensor.edge_timed]
+            if edge_timed:
+                duration += GROUP_GAP + max(edge_timed)
+            duration += sum(GROUP_GAP + deadline for deadline in polled)
+        return duration * trials
+
+    def worst_case_ping(self, pings: int) -> float:
+        """Returns the longest `pings` single-sensor slots can take (in s), whichever sensors they fire."""
+        slot = max(
+            (GROUP_GAP + sensor.echo_deadline for group in self._groups for sensor in group),
+            default=0.0
+        )
+        return slot * pings
+
+    def _collect(
+        self,
+        sensor: "UltrasonicSensor",
+        samples: Dict[CarCorner, List[Optional[float]]],
+        errors: Dict[CarCorner, Exception]
+    ) -> None:
+        """Collects one echo from a fired sensor, recording any error instead of raising."""
+        try:
+            samples[sensor.corner].append(sensor.collect())
+            outcome, latency = sensor.last_status, sensor.last_latency
+        except Exception as e:
+            samples[sensor.corner].append(None)
+            errors[sensor.corner] = e
+            outcome, latency = ReadingStatus.ERROR, time.perf_counter() - sensor.fire_time
+        
+        if self._on_ping:
+            self._on_ping(sensor, outcome, latency)
+
+    def _fire(
+        self,
+        sensor: "UltrasonicSensor",
+        samples: Dict[CarCorner, List[Optional[float]]],
+        errors: Dict[CarCorner, Exception]
+    ) -> bool:
+        """Triggers a sensor, recording any error instead of raising.
+
+        Returns:
+            (bool): True if the sensor fired and its echo should be collected.
+        """
+        try:
+            sensor.fire()
+        except Exception as e:
+            samples[sensor.corner].append(None)
+            errors[sensor.corner] = e
+            if self._on_ping:
+                self._on_ping(sensor, ReadingStatus.ERROR, 0.0)
+            return False
+        return True
+
+    def probe(self, sensor: "UltrasonicSensor") -> Optional[float]:
+        """Pings a single sensor in a slot of its own.
+
+        Arguments:
+            sensor (UltrasonicSensor): sensor to probe.
+
+        Returns:
+            (float | None): the measured distance, or None if the probe failed.
+        """
+        samples: Dict[CarCorner, List[Optional[float]]] = {sensor.corner: []}
+        time.sleep(GROUP_GAP)
+        if not self._fire(sensor, samples, {}):
+            return None
+        self._collect(sensor, samples, {})
+        return samples[sensor.corner][0]
+
+    def _fire_group(
+        self,
+        group: List["UltrasonicSensor"],
+        samples: Dict[CarCorner, List[Optional[float]]],
+        errors: Dict[CarCorner, Exception]
+    ) -> None:
+        """Fires one group and collects its echoes. A sensor that fails to fire is not collected.
+
+        Edge-timed sensors are all triggered first and then awaited, so their
+        echoes are timed concurrently. Polled sensors cannot be watched at the
+        same time, so they each get a slot of their own.
+        """
+        edge_timed = [sensor for sensor in group if sensor.edge_timed]
+        polled = [sensor for sensor in group if not sensor.edge_timed]
+
+        if edge_timed:
+            time.sleep(GROUP_GAP)
+            fired = [sensor for sensor in edge_timed if self._fire(sensor, samples, errors)]
+            for sensor in fired:
+                self._collect(sensor, samples, errors)
+
+        for sensor in polled:
+            time.sleep(GROUP_GAP)
+            if self._fire(sensor, samples, errors):
+                self._collect(sensor, samples, errors)
+
+    def sweep(
+        self,
+        trials: int,
+        corners: Optional[List[CarCorner]] = None,
+        on_group: Optional[GroupCallback] = None
+    ) -> Tuple[Dict[CarCorner, List[Optional[float]]], Dict[CarCorner, Exception]]:
+        """Pings every (selected) sensor `trials` times, cycling through the firing groups.
+
+        Groups left empty by the selection are skipped entirely.
+
+        Arguments:
+            trials (int): number of pings per sensor.
+            corners (List[CarCorner] | None): corners to ping, or None for all of them.
+            on_group (Callable | None): called with each group, the samples and the errors
+                so far as soon as the group's last ping is collected, before the next group fires.
+
+        Returns:
+            (Dict[CarCorner, List[float | None]], Dict[CarCorner, Exception]): the single-ping
+            distances of each corner, and the last error raised by any failing corner.
+        """
+        groups = self._select(corners)
+        samples: Dict[CarCorner, List[Optional[float]]] = {
+            sensor.corner: []
+            for group in groups
+            for sensor in group
+        }
+        errors: Dict[CarCorner, Exception] = {}
+
+        for trial in range(trials):
+            for group in groups:
+                self._fire_group(group, samples, errors)
+                if on_group and trial == trials - 1:
+                    on_group(group, samples, errors)
+
+        return samples, errors
+
+    def _select(self, corners: Optional[List[CarCorner]]) -> List[List["UltrasonicSensor"]]:
+        """Returns the firing groups restricted to some corners, dropping the groups left empty."""
+        if corners is None:
+            return self._groups
+        groups = [
+            [sensor for sensor in group if sensor.corner in corners]
+            for group in self._groups
+        ]
+        return [group for group in groups if group]
+
+    def _fire_slot(
+        self,
+        slot: List["UltrasonicSensor"],
+        samples: Dict[CarCorner, List[Optional[float]]],
+        errors: Dict[CarCorner, Exception],
+        lock: Lock
+    ) -> None:
+        """Fires sensors together and collects their echoes, holding the firing lock."""
+        with lock:
+            fired = [sensor for sensor in slot if self._fire(sensor, samples, errors)]
+            for sensor in fired:
+                self._collect(sensor, samples, errors)
+
+    async def sweep_async(
+        self,
+        trials: int,
+        executor: Executor,
+        lock: Lock,
+        corners: Optional[List[CarCorner]] = None,
+        on_group: Optional[GroupCallback] = None
+    ) -> Tuple[Dict[CarCorner, List[Optional[float]]], Dict[CarCorner, Exception]]:
+        """Coroutine version of `sweep`, for the asyncio runtime.
+
+        The gaps between slots are awaited on the event loop, and only the
+        blocking part (triggering and waiting for the echoes) runs in the
+        executor. As in `_fire_group`, a group's edge-timed sensors share one
+        slot and each polled sensor gets a slot of its own. The firing lock is
+        taken per slot, so background probes can fit in between.
+
+        Arguments:
+            trials (int): number of pings per sensor.
+            executor (Executor): runs the blocking GPIO work.
+            lock (Lock): firing lock shared with the background probes.
+            corners (List[CarCorner] | None): corners to ping, or None for all of them.
+            on_group (GroupCallback | None): called on the event loop with each group as
+                soon as its last ping is collected.
+
+        Returns:
+            (Dict[CarCorner, List[float | None]], Dict[CarCorner, Exception]): the single-ping
+            distances of each corner, and the last error raised by any failing corner.
+        """
+        loop = asyncio.get_running_loop()
+        groups = self._select(corners)
+        samples: Dict[CarCorner, List[Optional[float]]] = {
+            sensor.corner: []
+            for group in groups
+            for sensor in group
+        }
+        errors: Dict[CarCorner, Exception] = {}
+
+        for trial in range(trials):
+            for group in groups:
+                edge_timed = [sensor for sensor in group if sensor.edge_timed]
+                slots = ([edge_timed] if edge_timed else []) + [
+                    [sensor] for sensor in group if not sensor.edge_timed
+                ]
+                for slot in slots:
+                    await asyncio.sleep(GROUP_GAP)
+                    await loop.run_in_executor(executor, self._fire_slot, slot, samples, errors, lock)
+                if on_group and trial == trials - 1:
+                    on_group(group, samples, errors)
+
+        return samples, errors
@@ -0,0 +1,161 @@
+"""This module tracks the health of each ultrasonic sensor and backs off failing ones.
+
+File: sensor_health.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+
+Every ping outcome is recorded per sensor. When a sensor stops responding or
+keeps raising errors, its circuit breaker opens and the sensor is skipped by
+the sweep, so one bad corner cannot slow down the others. Open sensors are
+re-probed with an exponentially growing back-off until they recover.
+
+A sensor whose echo line never rises is treated as unplugged or faulty, since
+a working HC-SR04 always raises its echo line after a trigger, even when
+nothing is in range. A ping skipped because the echo line was still high
+(BUSY) says nothing about the sensor, only about interference, so it neither
+counts as a failure nor as a success.
+"""
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Deque, Optional
+
+from common_api.distance import CarCorner, ReadingStatus
+
+HEALTH_WINDOW   = 50    # Ping outcomes kept for the rate statistics.
+FAIL_THRESHOLD  = 5     # Consecutive failures that open the breaker.
+BASE_BACKOFF    = 0.5   # First wait before re-probing an open sensor (in s).
+MAX_BACKOFF     = 10.0  # Longest wait between two probes (in s).
+LATENCY_ALPHA   = 0.1   # Smoothing factor of the mean ping latency.
+
+# Ping outcomes that count against a sensor's health.
+FAILURES = (ReadingStatus.NO_RESPONSE, ReadingStatus.ERROR)
+
+# Ping outcomes that say nothing about a sensor's health.
+NEUTRAL = (ReadingStatus.BUSY,)
+
+class BreakerState(IntEnum):
+    """Represents the circuit breaker state of a sensor.
+
+    Three possible states:
+    - CLOSED -> the sensor is healthy and pinged normally.
+    - OPEN -> the sensor is failing and skipped until its next probe.
+    - HALF_OPEN -> the sensor is being probed to see if it recovered.
+    """
+    CLOSED      = 0
+    OPEN        = 1
+    HALF_OPEN   = 2
+
+@dataclass
+class HealthStats:
+    """DTO summarising the health of one sensor."""
+    corner: CarCorner
+    state: BreakerState
+    pings: int
+    timeout_rate: float
+    error_rate: float
+    mean_latency: float
+    backoff: float
+    next_probe: Optional[float]
+    busy_rate: float = 0.0
+
+class SensorHealth():
+    """Records ping outcomes of one sensor and runs its circuit breaker."""
+    def __init__(self, corner: CarCorner) -> None:
+        """Initializes a healthy, closed breaker.
+
+        Arguments:
+            corner (CarCorner): corner of the tracked sensor.
+        """
+        self._corner = corner
+        self._outcomes: Deque[ReadingStatus] = deque(maxlen=HEALTH_WINDOW)
+        self._pings: int = 0
+        self._consecutive_failures: int = 0
+        self._mean_latency: float = 0.0
+
+        self._state: BreakerState = BreakerState.CLOSED
+        self._backoff: float = BASE_BACKOFF
+        self._next_probe: Optional[float] = None
+
+    @property
+    def state(self) -> BreakerState:
+        """Returns the current breaker state."""
+        return self._state
+
+    @property
+    def next_probe(self) -> Optional[float]:
+        """Returns the monotonic time the open sensor should next be probed, if any."""
+        return self._next_probe
+
+    def allows_ping(self) -> bool:
+        """Returns True if the sweep may ping this sensor."""
+        return self._state == BreakerState.CLOSED
+
+    def probe_due(self, now: float) -> bool:
+        """Returns True if the sensor is open and its back-off has elapsed."""
+        return self._state == BreakerState.OPEN and now >= self._next_probe
+
+    def begin_probe(self) -> None:
+        """Marks the sensor as being probed."""
+        self._state = BreakerState.HALF_OPEN
+
+    def record(self, outcome: ReadingStatus, latency: float, now: float) -> bool:
+        """Records the outcome of one ping and updates the breaker.
+
+        A success closes a probing breaker again, a failed probe doubles the
+        back-off, and FAIL_THRESHOLD consecutive failures open a closed breaker.
+        NEUTRAL outcomes are only counted, a neutral probe is retried after the same back-off.
+
+        Arguments:
+            outcome (ReadingStatus): how the ping ended.
+            latency (float): time from trigger to result (in s).
+            now (float): current monotonic time (in s).
+
+        Returns:
+            (bool): True if the breaker changed state.
+        """
+        self._outcomes.append(outcome)
+        self._pings += 1
+        self._mean_latency += LATENCY_ALPHA * (latency - self._mean_latency)
+        previous = self._state
+
+        if outcome in NEUTRAL:
+            if self._state == BreakerState.HALF_OPEN:
+                # The probe told nothing, try again after the same back-off.
+                self._open(now)
+            return self._state != previous
+        if outcome not in FAILURES:
+            self._consecutive_failures = 0
+            if self._state == BreakerState.HALF_OPEN:
+                self._state = BreakerState.CLOSED
+                self._backoff = BASE_BACKOFF
+                self._next_probe = None
+            return self._state != previous
+
+        self._consecutive_failures += 1
+        if self._state == BreakerState.HALF_OPEN:
+            self._backoff = min(MAX_BACKOFF, self._backoff * 2)
+            self._open(now)
+        elif self._consecutive_failures >= FAIL_THRESHOLD:
+            self._open(now)
+        return self._state != previous
+
+    def _open(self, now: float) -> None:
+        """Opens the breaker and schedules the next probe."""
+        self._state = BreakerState.OPEN
+        self._next_probe = now + self._backoff
+
+    def stats(self) -> HealthStats:
+        """Returns a snapshot of this sensor's health."""
+        count = len(self._outcomes) or 1
+        return HealthStats(
+            corner=self._corner,
+            state=self._state,
+            pings=self._pings,
+            timeout_rate=self._outcomes.count(ReadingStatus.NO_RESPONSE) / count,
+            error_rate=self._outcomes.count(ReadingStatus.ERROR) / count,
+            mean_latency=self._mean_latency,
+            backoff=self._backoff,
+            next_probe=self._next_probe,
+            busy_rate=self._outcomes.count(ReadingStatus.BUSY) / count
+        )
@@ -0,0 +1,95 @@
+"""Unit tests of the AdaptiveScheduler slot allocation.
+
+File: test_adaptive_schedule.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+"""
+from common_api.distance import CarCorner, DistanceReading
+from ultrasonic_capture.adaptive_schedule import AdaptiveScheduler, rounds_of
+
+CORNERS = list(CarCorner)
+
+def observe_all(scheduler: AdaptiveScheduler, distances, now: float) -> None:
+    """Feeds one reading of every corner."""
+    for corner, distance in zip(CORNERS, distances):
+        scheduler.observe(DistanceReading(corner, distance, 1.0), now)
+
+def test_never_pinged_corners_are_overdue_within_cap():
+    scheduler = AdaptiveScheduler(CORNERS, budget=2, max_overflow=1)
+    slots = scheduler.select(0.0)
+    assert len(slots) == 3
+    assert all(count == 1 for count in slots.values())
+
+def test_overflow_cap_zero_keeps_budget():
+    scheduler = AdaptiveScheduler(CORNERS, budget=2, max_overflow=0)
+    assert sum(scheduler.select(0.0).values()) == 2
+
+def test_overdue_corners_rotate_under_cap():
+    scheduler = AdaptiveScheduler(CORNERS, budget=1, max_overflow=0)
+    pinged = set()
+    now = 0.0
+    for _ in CORNERS:
+        (corner,) = scheduler.select(now)
+        pinged.add(corner)
+        scheduler.observe(DistanceReading(corner, None, 1.0), now)
+        now += 0.01
+    assert pinged == set(CORNERS)
+
+def test_urgent_corner_takes_several_slots():
+    scheduler = AdaptiveScheduler(CORNERS, budget=3)
+    observe_all(scheduler, [None, None, None, None], 0.0)
+    observe_all(scheduler, [20.0, None, None, None], 0.1)
+    slots = scheduler.select(0.2)
+    assert slots == {CarCorner.BACK_LEFT: 3}
+
+def test_slots_split_by_urgency():
+    scheduler = AdaptiveScheduler(CORNERS, budget=4)
+    observe_all(scheduler, [20.0, 115.0, None, None], 0.0)
+    observe_all(scheduler, [20.0, 115.0, None, None], 0.1)
+    slots = scheduler.select(0.2)
+    # Urgency 1.0 against 0.5: D'Hondt gives three slots to one, one to the other.
+    assert slots == {CarCorner.BACK_LEFT: 3, CarCorner.BACK_RIGHT: 1}
+    assert next(iter(slots)) == CarCorner.BACK_LEFT
+
+def test_spare_slots_go_to_unpinged_corners_without_urgency():
+    scheduler = AdaptiveScheduler(CORNERS, budget=2)
+    observe_all(scheduler, [None, None, None, None], 0.0)
+    observe_all(scheduler, [None, None, None, None], 0.1)
+    slots = scheduler.select(0.2)
+    assert sum(slots.values()) == 2
+    assert all(count == 1 for count in slots.values())
+
+def test_overdue_corner_still_pinged_next_to_urgent_one():
+    scheduler = AdaptiveScheduler(CORNERS, min_refresh={CarCorner.FRONT_LEFT: 0.3}, budget=2)
+    observe_all(scheduler, [None, None, None, None], 0.0)
+    observe_all(scheduler, [20.0, None, None, None], 0.1)
+    slots = scheduler.select(0.45)
+    assert slots[CarCorner.FRONT_LEFT] == 1
+    assert slots[CarCorner.BACK_LEFT] == 1
+
+def test_rounds_of_pings_each_corner_once_per_round():
+    rounds = rounds_of({CarCorner.BACK_LEFT: 3, CarCorner.FRONT_RIGHT: 1})
+    assert rounds == [
+        [CarCorner.BACK_LEFT, CarCorner.FRONT_RIGHT],
+        [CarCorner.BACK_LEFT],
+        [CarCorner.BACK_LEFT]
+    ]
+    assert rounds_of({}) == []
+
+def test_faulted_corners_do_not_starve_healthy_ones():
+    scheduler = AdaptiveScheduler(CORNERS, budget=2, max_overflow=1)
+    healthy = CORNERS[:2]
+    pings = 0
+    now = 0.0
+    for _ in range(100):
+        slots = scheduler.select(now, healthy)
+        assert set(slots) <= set(healthy)
+        for corner, count in slots.items():
+            pings += count
+            scheduler.observe(DistanceReading(corner, None, 1.0), now)
+        now += 0.05
+    assert pings == 200
+
+def test_no_eligible_corner_gets_no_slot():
+    scheduler = AdaptiveScheduler(CORNERS)
+    assert scheduler.select(0.0, []) == {}
@@ -0,0 +1,104 @@
+"""Unit tests of the streaming DistanceFilter.
+
+File: test_distance_filter.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+"""
+from ultrasonic_capture.distance_filter import DistanceFilter, MAX_MISSES, RESEED_PINGS, WINDOW
+
+MAX_DEV = 3.0
+
+def feed(dist_filter: DistanceFilter, distances, start: float = 0.0, step: float = 0.05):
+    """Feeds pings at a fixed interval, returning the last output."""
+    out = (None, 0.0)
+    for i, distance in enumerate(distances):
+        out = dist_filter.update(distance, start + i * step)
+    return out
+
+def test_first_ping_is_estimate():
+    dist_filter = DistanceFilter(MAX_DEV)
+    distance, confidence = dist_filter.update(50.0, 0.0)
+    assert distance == 50.0
+    assert confidence == 1 / WINDOW
+
+def test_steady_pings_converge_with_full_confidence():
+    dist_filter = DistanceFilter(MAX_DEV)
+    distance, confidence = feed(dist_filter, [50.0, 50.5, 49.5, 50.0, 50.2])
+    assert abs(distance - 50.0) < 1.0
+    assert confidence == 1.0
+
+def test_outlier_is_rejected():
+    dist_filter = DistanceFilter(MAX_DEV)
+    feed(dist_filter, [50.0] * WINDOW)
+    distance, _ = dist_filter.update(90.0, 1.0)
+    assert abs(distance - 50.0) < 1.0
+
+def test_single_miss_keeps_estimate():
+    dist_filter = DistanceFilter(MAX_DEV)
+    feed(dist_filter, [50.0] * WINDOW)
+    distance, confidence = dist_filter.update(None, 1.0)
+    assert distance is not None
+    assert confidence < 1.0
+
+def test_stale_estimate_dropped_after_misses():
+    dist_filter = DistanceFilter(MAX_DEV)
+    feed(dist_filter, [50.0] * WINDOW)
+    out = feed(dist_filter, [None] * MAX_MISSES, start=1.0)
+    assert out == (None, 0.0)
+    # The old pings are forgotten too: a new obstacle starts a new track.
+    distance, _ = dist_filter.update(120.0, 2.0)
+    assert distance == 120.0
+
+def test_misses_must_be_in_a_row():
+    dist_filter = DistanceFilter(MAX_DEV)
+    distance, _ = feed(dist_filter, [50.0, None, 50.0, None, 50.0])
+    assert distance is not None
+
+def test_negative_distance_counts_as_miss():
+    dist_filter = DistanceFilter(MAX_DEV)
+    feed(dist_filter, [50.0] * WINDOW)
+    assert feed(dist_filter, [-1.0] * MAX_MISSES, start=1.0) == (None, 0.0)
+
+def test_confirmed_closer_pings_reseed():
+    dist_filter = DistanceFilter(MAX_DEV)
+    feed(dist_filter, [100.0] * WINDOW)
+    distance, _ = feed(dist_filter, [20.0, 20.5][:RESEED_PINGS], start=1.0)
+    assert distance == 20.5
+    # And the track stays on the new obstacle.
+    distance, _ = dist_filter.update(20.0, 1.2)
+    assert abs(distance - 20.0) < 1.0
+
+def test_single_short_ping_does_not_move_estimate():
+    dist_filter = DistanceFilter(MAX_DEV)
+    feed(dist_filter, [100.0] * WINDOW)
+    distance, _ = feed(dist_filter, [20.0, 100.0, 100.0], start=1.0)
+    assert abs(distance - 100.0) < 1.0
+
+def test_disagreeing_closer_pings_do_not_reseed():
+    dist_filter = DistanceFilter(MAX_DEV)
+    feed(dist_filter, [100.0] * WINDOW)
+    distance, _ = feed(dist_filter, [20.0, 50.0], start=1.0)
+    assert abs(distance - 100.0) < 1.0
+
+def test_farther_jump_waits_for_median():
+    dist_filter = DistanceFilter(MAX_DEV)
+    feed(dist_filter, [20.0] * WINDOW)
+    distance, _ = dist_filter.update(100.0, 1.0)
+    assert abs(distance - 20.0) < 1.0
+
+def test_reset_forgets_track():
+    dist_filter = DistanceFilter(MAX_DEV)
+    feed(dist_filter, [50.0] * WINDOW)
+    dist_filter.reset()
+    assert dist_filter.velocity == 0.0
+    assert dist_filter.update(80.0, 1.0)[0] == 80.0
+
+def test_filtered_reading_reports_silent_status():
+    from common_api.distance import CarCorner, ReadingStatus
+    from ultrasonic_capture.ultrasonic_capture import filtered_reading
+    dist_filter = DistanceFilter(MAX_DEV)
+    reading = filtered_reading(CarCorner.FRONT_LEFT, dist_filter, [40.0], ReadingStatus.OK, 1.0)
+    assert (reading.distance, reading.status, reading.timestamp) == (40.0, ReadingStatus.OK, 1.0)
+    for _ in range(MAX_MISSES):
+        reading = filtered_reading(CarCorner.FRONT_LEFT, dist_filter, [None], ReadingStatus.NO_RESPONSE, 1.1)
+    assert (reading.distance, reading.status) == (None, ReadingStatus.NO_RESPONSE)
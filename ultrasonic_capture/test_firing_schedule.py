@@ -0,0 +1,67 @@
+"""Unit tests of the FiringScheduler error handling.
+
+File: test_firing_schedule.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from common_api.distance import CarCorner, ReadingStatus
+from ultrasonic_capture.firing_schedule import FiringScheduler
+
+class FakeSensor:
+    """Sensor echoing a fixed distance, whose trigger can be made to fail."""
+    def __init__(self, corner: CarCorner, edge_timed: bool = True, broken: bool = False) -> None:
+        self.corner = corner
+        self.name = corner.name
+        self.edge_timed = edge_timed
+        self.echo_deadline = 0.01
+        self.broken = broken
+        self.fire_time = 0.0
+        self.last_status = ReadingStatus.OK
+        self.last_latency = 0.001
+        self.collected = 0
+
+    def fire(self) -> None:
+        if self.broken:
+            raise OSError("GPIO write failed")
+
+    def collect(self) -> float:
+        self.collected += 1
+        return 50.0
+
+def make(edge_timed: bool):
+    sensors = [FakeSensor(corner, edge_timed) for corner in CarCorner]
+    sensors[0].broken = True
+    pings = []
+    scheduler = FiringScheduler(sensors, on_ping=lambda s, outcome, _: pings.append((s.corner, outcome)))
+    return sensors, scheduler, pings
+
+def check(sensors, samples, errors, pings) -> None:
+    broken = sensors[0]
+    assert isinstance(errors[broken.corner], OSError)
+    assert samples[broken.corner] == [None]
+    assert broken.collected == 0
+    assert (broken.corner, ReadingStatus.ERROR) in pings
+    for sensor in sensors[1:]:
+        assert samples[sensor.corner] == [50.0]
+
+def test_fire_error_is_recorded_per_corner():
+    for edge_timed in (True, False):
+        sensors, scheduler, pings = make(edge_timed)
+        samples, errors = scheduler.sweep(1)
+        check(sensors, samples, errors, pings)
+
+def test_fire_error_is_recorded_per_corner_async():
+    sensors, scheduler, pings = make(True)
+    with ThreadPoolExecutor(1) as executor:
+        samples, errors = asyncio.run(scheduler.sweep_async(1, executor, Lock()))
+    check(sensors, samples, errors, pings)
+
+def test_failed_probe_returns_none():
+    sensors, scheduler, pings = make(True)
+    assert scheduler.probe(sensors[0]) is None
+    assert pings == [(sensors[0].corner, ReadingStatus.ERROR)]
+    assert scheduler.probe(sensors[1]) == 50.0
@@ -0,0 +1,106 @@
+"""Unit tests of the SensorHealth circuit breaker.
+
+File: test_sensor_health.py
+Author: Josh Dean
+Last Modified: 16/10/2026
+"""
+from common_api.distance import CarCorner, ReadingStatus
+from ultrasonic_capture.sensor_health import (
+    SensorHealth, BreakerState, FAIL_THRESHOLD, BASE_BACKOFF, MAX_BACKOFF
+)
+
+LATENCY = 0.01
+
+def fail(health: SensorHealth, times: int, now: float = 0.0, status=ReadingStatus.NO_RESPONSE) -> None:
+    """Records `times` failed pings."""
+    for _ in range(times):
+        health.record(status, LATENCY, now)
+
+def opened(now: float = 0.0) -> SensorHealth:
+    """Returns a sensor whose breaker just opened."""
+    health = SensorHealth(CarCorner.BACK_LEFT)
+    fail(health, FAIL_THRESHOLD, now)
+    return health
+
+def test_starts_closed():
+    health = SensorHealth(CarCorner.BACK_LEFT)
+    assert health.state == BreakerState.CLOSED
+    assert health.allows_ping()
+
+def test_opens_after_consecutive_failures():
+    health = SensorHealth(CarCorner.BACK_LEFT)
+    fail(health, FAIL_THRESHOLD - 1)
+    assert health.state == BreakerState.CLOSED
+    assert health.record(ReadingStatus.ERROR, LATENCY, 0.0)
+    assert health.state == BreakerState.OPEN
+    assert not health.allows_ping()
+    assert health.next_probe == BASE_BACKOFF
+
+def test_success_resets_failure_count():
+    health = SensorHealth(CarCorner.BACK_LEFT)
+    fail(health, FAIL_THRESHOLD - 1)
+    health.record(ReadingStatus.OK, LATENCY, 0.0)
+    fail(health, FAIL_THRESHOLD - 1)
+    assert health.state == BreakerState.CLOSED
+
+def test_out_of_range_is_healthy():
+    health = SensorHealth(CarCorner.BACK_LEFT)
+    fail(health, FAIL_THRESHOLD * 2, status=ReadingStatus.OUT_OF_RANGE)
+    assert health.state == BreakerState.CLOSED
+
+def test_busy_never_opens_breaker():
+    health = SensorHealth(CarCorner.BACK_LEFT)
+    fail(health, FAIL_THRESHOLD * 2, status=ReadingStatus.BUSY)
+    assert health.state == BreakerState.CLOSED
+    assert health.stats().busy_rate == 1.0
+    assert health.stats().timeout_rate == 0.0
+
+def test_busy_does_not_break_failure_streak():
+    health = SensorHealth(CarCorner.BACK_LEFT)
+    fail(health, FAIL_THRESHOLD - 1)
+    health.record(ReadingStatus.BUSY, LATENCY, 0.0)
+    fail(health, 1)
+    assert health.state == BreakerState.OPEN
+
+def test_probe_due_after_backoff():
+    health = opened()
+    assert not health.probe_due(BASE_BACKOFF / 2)
+    assert health.probe_due(BASE_BACKOFF)
+
+def test_successful_probe_closes():
+    health = opened()
+    health.begin_probe()
+    assert health.state == BreakerState.HALF_OPEN
+    assert not health.allows_ping()
+    assert health.record(ReadingStatus.OK, LATENCY, 1.0)
+    assert health.state == BreakerState.CLOSED
+    assert health.next_probe is None
+
+def test_failed_probe_doubles_backoff_up_to_max():
+    health = opened()
+    now = 0.0
+    backoff = BASE_BACKOFF
+    for _ in range(10):
+        health.begin_probe()
+        fail(health, 1, now)
+        backoff = min(MAX_BACKOFF, backoff * 2)
+        assert health.state == BreakerState.OPEN
+        assert health.next_probe == now + backoff
+        now = health.next_probe
+    assert health.stats().backoff == MAX_BACKOFF
+
+def test_busy_probe_retries_with_same_backoff():
+    health = opened()
+    health.begin_probe()
+    assert health.record(ReadingStatus.BUSY, LATENCY, 1.0)
+    assert health.state == BreakerState.OPEN
+    assert health.next_probe == 1.0 + BASE_BACKOFF
+
+def test_closed_after_probe_restarts_at_base_backoff():
+    health = opened()
+    health.begin_probe()
+    fail(health, 1, 1.0)
+    health.begin_probe()
+    health.record(ReadingStatus.OK, LATENCY, 2.0)
+    fail(health, FAIL_THRESHOLD, 3.0)
+    assert health.next_probe == 3.0 + BASE_BACKOFF
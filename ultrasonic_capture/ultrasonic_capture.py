@@ -2,126 +2,311 @@
 
 File: ultrasonic_capture.py
 Author: Josh Dean
-Last Modified: 21/10/2025
+Last Modified: 16/10/2026
 
 This module defines two main classes:
 
 - UltrasonicSensor: handles a single ultrasonic sensor, managing GPIO setup,
-  triggering, timing, and distance measurement.
+  triggering, timing, and distance measurement. The echo pulse can either be
+  timed by polling the echo pin, or from GPIO edge-event timestamps.
+  Readings are either validated in bursts of pings, or streamed through a
+  per-sensor DistanceFilter that emits a fresh estimate after every ping.
 - UltrasonicCapture: manages multiple sensors (front, rear, etc.), aggregates
   their readings, and handles cleanup.
 
 The system operates on the principle that the time taken for a sound pulse to
 travel to an obstacle and back can be used to calculate distance. It uses
-the Raspberry Pi's GPIO pins for trigger and echo control.
+the Raspberry Pi's GPIO pins for trigger and echo control, through the
+hardware abstraction layer so it also runs against simulated sensors.
 """
-import RPi.GPIO as GPIO
+import asyncio
 import time
 import statistics
-from typing import Optional, List, Tuple
+from concurrent.futures import Executor
+from enum import IntEnum
+from threading import Event, Lock, Thread
+from typing import Callable, Optional, List, Tuple, Dict, Set
 
-from common_api.distance import CarCorner, DistanceReading
+import hal
+from common_api.distance import CarCorner, DistanceReading, DistanceSnapshot, ReadingStatus
+from common_api.latest import Latest
+from common_api.readiness import Readiness, ProgressCallback
+from common_api.event_bus import EventBus, DISTANCE_TOPIC
+from common_api.metrics import Metrics, PING_WAIT, STABILITY_CHECK
+from flight_recorder import FlightRecorder
+from .firing_schedule import FiringScheduler, GROUP_GAP
+from .distance_filter import DistanceFilter
+from .adaptive_schedule import AdaptiveScheduler, PING_BUDGET, rounds_of
+from .sensor_health import SensorHealth, HealthStats
 
 # We know the speed of sound is 373 m/s, so 37300 cm/s
 # Signal must go and come back, so divide by 2: 37300 / 2 = 17150
 SOUND_SPEED = 17150
 PULSE_DUR = 0.0001  # 10 microsecond pulse.
-TIMEOUT_DUR = 3     # 3 second timeout.
-NUM_TRIALS = 3      # Times to try reading.
+MAX_RANGE = 400.0   # Max useful range, bounds the echo wait (400 cm ~ 23 ms round trip).
+ECHO_START_DUR = 0.005  # Max delay between the trigger and the echo line rising (in s).
+NUM_TRIALS = 3      # Times to try reading (burst mode).
 MAX_DEV = 3.0       # Max deviation between readings (in cm).
+SETTLE_DUR = 2.0    # Time a sensor needs after set-up before its first ping (in s).
+
+# RPi.GPIO on the Pi, or the simulated header off it.
+GPIO = hal.gpio()
 
 # Use the GPIO pin names, not physical pin locations.
 GPIO.setmode(GPIO.BCM)
 
+class EchoTiming(IntEnum):
+    """Selects how a sensor measures the width of its echo pulse.
+
+    Two possible modes:
+    - POLLING -> spins on the echo pin until it changes level (burns a CPU core).
+    - EDGE -> sleeps until GPIO edge events timestamp the rising and falling edges.
+    """
+    POLLING = 0
+    EDGE    = 1
+
+# Timing mode for any sensor not explicitly configured.
+DEFAULT_TIMING = EchoTiming.EDGE
+
+def silent_status(last_status: ReadingStatus) -> ReadingStatus:
+    """Returns the status of a reading without any echo: no response, busy or out of range.
+
+    Arguments:
+        last_status (ReadingStatus): outcome of the sensor's latest ping.
+
+    Returns:
+        (ReadingStatus): NO_RESPONSE or BUSY if the ping failed that way, else OUT_OF_RANGE.
+    """
+    if last_status in (ReadingStatus.NO_RESPONSE, ReadingStatus.BUSY):
+        return last_status
+    return ReadingStatus.OUT_OF_RANGE
+
+def filtered_reading(
+    corner: CarCorner,
+    dist_filter: DistanceFilter,
+    distances: List[Optional[float]],
+    last_status: ReadingStatus,
+    timestamp: float
+) -> DistanceReading:
+    """Pushes successive single-ping distances through a streaming filter, returning its latest estimate.
+
+    Touches no GPIO, so recorded pings can be replayed through a bare DistanceFilter.
+
+    Arguments:
+        corner (CarCorner): corner the pings come from.
+        dist_filter (DistanceFilter): the corner's streaming filter.
+        distances (List[float | None]): successive single-ping distances, None without an echo.
+        last_status (ReadingStatus): outcome of the latest ping, see `silent_status`.
+        timestamp (float): monotonic time of the pings (in s).
+
+    Returns:
+        (DistanceReading): reading DTO with the filtered distance and its confidence.
+    """
+    distance, confidence = None, 0.0
+    for raw in distances:
+        distance, confidence = dist_filter.update(raw, timestamp)
+    status = ReadingStatus.OK if distance is not None else silent_status(last_status)
+    return DistanceReading(corner, distance, confidence, timestamp, status)
+
 class UltrasonicSensor():
     """
     Represents a single ultrasonic sensor module connected to a specific 
     position (corner) on the vehicle or device.
 
     Handles GPIO initialization, trigger pulse emission, echo timing, and
-    conversion to distance readings. Includes a brief dry-run on initialization
-    to verify hardware function.
+    conversion to distance readings. Construction only sets up the pins, the
+    sensor must then settle (see `settle_remaining`) before its first ping.
     """
-    def __init__(self, corner: CarCorner, debug: bool = False) -> None:
+    def __init__(
+        self, 
+        corner: CarCorner, 
+        debug: bool = False, 
+        timing: EchoTiming = DEFAULT_TIMING,
+        streaming: bool = True,
+        max_range: float = MAX_RANGE
+    ) -> None:
         """Initializes an ultrasonic sensor.
 
         Arguments:
             corner (CarCorner): Which physical corner we are attached to.
             debug (bool): True if we logging debugging statements.
+            timing (EchoTiming): how the echo pulse width is measured.
+            streaming (bool): True to filter every ping, False to validate NUM_TRIALS bursts.
+            max_range (float): furthest distance worth waiting for (in cm), 
+                anything beyond it is reported as out of range.
         """
         self._corner = corner
+        self._debug = debug
+        self._timing = timing
+        self._max_pulse: float = max_range / SOUND_SPEED
+        self._fire_time: float = 0.0
+        self._busy: bool = False
+        self._last_status: ReadingStatus = ReadingStatus.OK
+        self._last_latency: float = 0.0
+        self._last_echo: Optional[float] = None
+        self._filter: Optional[DistanceFilter] = DistanceFilter(MAX_DEV) if streaming else None
         self._trig_pin, self._echo_pin = self._corner.pins
         
+        # Edge timestamps, written by the GPIO callback thread in EDGE mode.
+        self._rise_time: Optional[float] = None
+        self._fall_time: Optional[float] = None
+        self._echo_done: Event = Event()
+        
         if debug:
             print(f"[DEBUG] Setting up sensor: {self._corner.print_name}")
             print(f"[DEBUG] TRIG: {self._trig_pin}, ECHO: {self._echo_pin}")
+            print(f"[DEBUG] Echo timing: {self._timing.name}")
         
         # Attempt to communicate with the sensor.
         try:
             GPIO.setup(self._trig_pin, GPIO.OUT)
             GPIO.setup(self._echo_pin, GPIO.IN)
+            if self._timing == EchoTiming.EDGE:
+                GPIO.add_event_detect(self._echo_pin, GPIO.BOTH, callback=self._on_echo_edge)
         except Exception as e:
             print(f"Failed to set-up sensor: {self._corner.print_name}")
             print(f"Error: {e}")
             exit(-1)
         
-        if debug:
-            print("[DEBUG] Allowing sensor to settle...")
-        time.sleep(2)
+        # The sensor needs time to settle before its first ping, see `settle_remaining`.
+        self._settled_at: float = time.monotonic() + SETTLE_DUR
         
         if debug:
-            print("[DEBUG] Attempting a dry-fire")
-            
-        try:
-            test_distance = self._read_one_distance()
-        except Exception as e:
-            print(f"Critical error while testing sensor: {self._corner.print_name}!")
-            print(f"Error: {e}")
-            exit(-1)
+            print(f"[DEBUG] Sensor: {self._corner.print_name} setup, settling...")
         
-        if debug:
-            print(f"[DEBUG] Test reading result: {test_distance}")
-            print(f"[DEBUG] Sensor: {self._corner.print_name} setup!")
-        
-    def _read_one_distance(self) -> Optional[float]:
-        """Emits one ultrasonic pulse and measures the round-trip time to compute distance.
+    def _on_echo_edge(self, channel: int) -> None:
+        """GPIO callback recording the timestamps of the echo pulse edges.
 
-        Returns:
-            (float | None): a single distance measurement in centimeters, or None if timed out.
+        The first edge after a trigger is the rising edge, the second is the
+        falling edge. Counting edges (rather than re-reading the pin level)
+        stays correct for very short pulses that end before the callback runs.
+
+        Arguments:
+            channel (int): GPIO pin that raised the event.
         """
-        # Sleep 50 ms to prevent cross-talk collisions.
-        time.sleep(0.05)
+        now = time.perf_counter()
+        if self._rise_time is None:
+            self._rise_time = now
+        elif self._fall_time is None:
+            self._fall_time = now
+            self._echo_done.set()
+
+    def fire(self) -> None:
+        """Resets the edge state and sends a 10 us trigger pulse to the sensor.
+
+        If the echo line is still high from an earlier pulse (an out of range
+        echo, or cross-talk) the sensor would ignore the trigger, so the ping is
+        skipped instead and reported as BUSY.
+        """
+        self._rise_time = None
+        self._fall_time = None
+        self._echo_done.clear()
+        self._last_echo = None
+        self._fire_time = time.perf_counter()
+        
+        self._busy = GPIO.input(self._echo_pin) == 1
+        if self._busy:
+            return
         
-        # Send the trigger signal out for 10 ms.
         GPIO.output(self._trig_pin, True)
         time.sleep(PULSE_DUR)
         GPIO.output(self._trig_pin, False)
-        
-        timeout = time.time() + TIMEOUT_DUR
+
+    @property
+    def echo_deadline(self) -> float:
+        """Returns the longest a ping can take before it is out of range (in s)."""
+        return ECHO_START_DUR + self._max_pulse
+
+    def _read_polled(self) -> Optional[float]:
+        """Measures the echo pulse width by polling the echo pin.
+
+        Returns:
+            (float | None): pulse width in seconds, or None if out of range.
+        """
+        timeout = self._fire_time + ECHO_START_DUR
+        pulse_start = time.perf_counter()
 
         # Measure how long it takes to reflect the signal.
         while GPIO.input(self._echo_pin) == 0:
-            pulse_start = time.time()
+            pulse_start = time.perf_counter()
             
             if pulse_start >= timeout:
-                if self._debug:
-                    print(f"Sensor: {self._corner.print_name} timed out during reading!")
+                self._last_status = ReadingStatus.NO_RESPONSE
                 return None
             
-        timeout = time.time() + TIMEOUT_DUR
+        timeout = pulse_start + self._max_pulse
+        pulse_end = time.perf_counter()
             
         while GPIO.input(self._echo_pin) == 1:
-            pulse_end = time.time()
+            pulse_end = time.perf_counter()
             
             if pulse_end >= timeout:
-                raise RuntimeError(f"Sensor: {self._corner.print_name} timed out during reading!")
+                self._last_status = ReadingStatus.OUT_OF_RANGE
+                return None
+            
+        return pulse_end - pulse_start
+
+    def _read_edge_timed(self) -> Optional[float]:
+        """Measures the echo pulse width from the edge callback timestamps.
+
+        Blocks on an event rather than spinning, so no CPU is used while waiting.
+
+        Returns:
+            (float | None): pulse width in seconds, or None if out of range.
+        """
+        remaining = self._fire_time + self.echo_deadline - time.perf_counter()
+        if not self._echo_done.wait(max(0.0, remaining)):
+            if self._rise_time is None:
+                self._last_status = ReadingStatus.NO_RESPONSE
+            else:
+                self._last_status = ReadingStatus.OUT_OF_RANGE
+            return None
+        
+        return self._fall_time - self._rise_time
+
+    def collect(self) -> Optional[float]:
+        """Waits for the echo of the last trigger pulse and converts it to a distance.
+
+        The outcome, latency and echo pulse width of the ping are kept in
+        `last_status`, `last_latency` and `last_echo`.
+
+        Returns:
+            (float | None): a single distance measurement in centimeters, or None if out of range.
+        """
+        self._last_status = ReadingStatus.OK
+        if self._busy:
+            # The echo line never dropped from an earlier pulse, the sensor itself is fine.
+            self._last_status = ReadingStatus.BUSY
+            pulse_duration = None
+        elif self._timing == EchoTiming.EDGE:
+            pulse_duration = self._read_edge_timed()
+        else:
+            pulse_duration = self._read_polled()
+        self._last_latency = time.perf_counter() - self._fire_time
+        self._last_echo = pulse_duration
+            
+        if pulse_duration is None:
+            if self._debug:
+                print(f"[DEBUG] Sensor: {self._corner.print_name} {self._last_status.name}.")
+            return None
             
         # Calculate the final distance measurement.
-        pulse_duration = pulse_end - pulse_start
         distance = pulse_duration * SOUND_SPEED
         distance = round(distance, 2)
         
         return distance
+
+    def _read_one_distance(self) -> Optional[float]:
+        """Emits one ultrasonic pulse and measures the round-trip time to compute distance.
+
+        Returns:
+            (float | None): a single distance measurement in centimeters, or None if out of range.
+        """
+        # Sleep 50 ms to prevent cross-talk collisions.
+        time.sleep(0.05)
+        
+        self.fire()
+        return self.collect()
     
     def _is_stable(self, readings: List[float]) -> Tuple[bool, Optional[float]]:
         """Determines whether a group of distance readings is consistent.
@@ -148,28 +333,93 @@ class UltrasonicSensor():
         return max(deviations) <= MAX_DEV, mean
     
     def read_distance(self) -> DistanceReading:
-        """Performs multiple readings to ensure accuracy.
+        """Performs one streaming ping, or multiple burst readings to ensure accuracy.
 
         Returns: 
             (DistanceReading): reading DTO with a valid or None distance value.
         """
         distances: List[float] = [
             self._read_one_distance()
-            for _ in range(NUM_TRIALS)
+            for _ in range(self.pings_per_reading)
         ]
+        return self.reading_from(distances)
+
+    def reading_from(self, distances: List[Optional[float]], timestamp: Optional[float] = None) -> DistanceReading:
+        """Converts successive single-ping distances into one validated reading.
 
+        In streaming mode each ping updates the filter and the latest estimate
+        is returned, see `filtered_reading`. In burst mode the pings are checked
+        with `_is_stable`.
+
+        Arguments:
+            distances (List[float | None]): successive single-ping distances from this sensor.
+            timestamp (float | None): monotonic time of the pings (in s), now if None. Set
+                when replaying recorded pings on a virtual clock.
+
+        Returns: 
+            (DistanceReading): reading DTO with a valid or None distance value.
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        if self._filter is not None:
+            return filtered_reading(self._corner, self._filter, distances, self._last_status, now)
+        
         stable, mean = self._is_stable(distances)
-        dr = DistanceReading(self._corner, mean)
+        dr = DistanceReading(self._corner, mean, 1.0, now)
+        if all(d is None for d in distances):
+            dr.status = silent_status(self._last_status)
+        elif not stable:
+            dr.status = ReadingStatus.UNSTABLE
         if not stable:
             dr.distance = None
+            dr.confidence = 0.0
 
         return dr
+
+    @property
+    def pings_per_reading(self) -> int:
+        """Returns how many pings make up one reading: 1 when streaming, else NUM_TRIALS."""
+        return 1 if self._filter is not None else NUM_TRIALS
         
     @property
     def name(self) -> str:
         """Returns the sensor’s descriptive name."""
         return self._corner.print_name
 
+    @property
+    def corner(self) -> CarCorner:
+        """Returns the corner this sensor is mounted on."""
+        return self._corner
+
+    @property
+    def last_status(self) -> ReadingStatus:
+        """Returns the outcome of the last collected ping."""
+        return self._last_status
+
+    @property
+    def last_latency(self) -> float:
+        """Returns the time from trigger to result of the last collected ping (in s)."""
+        return self._last_latency
+
+    @property
+    def last_echo(self) -> Optional[float]:
+        """Returns the echo pulse width of the last ping (in s), None if there was no echo."""
+        return self._last_echo
+
+    @property
+    def fire_time(self) -> float:
+        """Returns the perf_counter time of the last trigger pulse."""
+        return self._fire_time
+
+    @property
+    def settle_remaining(self) -> float:
+        """Returns how long the sensor still needs to settle before its first ping (in s)."""
+        return max(0.0, self._settled_at - time.monotonic())
+
+    @property
+    def edge_timed(self) -> bool:
+        """Returns True if the echo is timed from edge events, so it can be awaited passively."""
+        return self._timing == EchoTiming.EDGE
+
 class UltrasonicCapture():
     """Manages multiple ultrasonic sensors and coordinates distance readings.
 
@@ -179,49 +429,347 @@ class UltrasonicCapture():
     resources used by the sensors.
     """
 
-    def __init__(self, debug: bool = True):
+    def __init__(
+        self, 
+        debug: bool = True, 
+        timing: Optional[Dict[CarCorner, EchoTiming]] = None,
+        interference: Optional[List[List[int]]] = None,
+        streaming: bool = True,
+        adaptive: bool = True,
+        min_refresh: Optional[Dict[CarCorner, float]] = None,
+        ping_budget: int = PING_BUDGET,
+        max_range: float = MAX_RANGE,
+        on_progress: Optional[ProgressCallback] = None,
+        bus: Optional[EventBus] = None,
+        recorder: Optional[FlightRecorder] = None,
+        metrics: Optional[Metrics] = None
+    ):
         """Initializes the capturing controller.
         
         Arguments:
             debug (bool): True if debug logging is active.
+            timing (Dict[CarCorner, EchoTiming] | None): per-corner echo timing mode,
+                corners that are not listed use DEFAULT_TIMING.
+            interference (List[List[int]] | None): CarCorner x CarCorner matrix where 1 means
+                the two sensors must never fire together. Defaults to DEFAULT_INTERFERENCE.
+            streaming (bool): True to filter every ping, False to validate NUM_TRIALS bursts.
+            adaptive (bool): True to ping corners by urgency, False to ping all on every sweep.
+            min_refresh (Dict[CarCorner, float] | None): per-corner max time between pings
+                in adaptive mode (in s), corners that are not listed use MIN_REFRESH.
+            ping_budget (int): ping slots per adaptive sweep, unless more corners are overdue.
+            max_range (float): furthest distance worth waiting for on every sensor (in cm).
+            on_progress (ProgressCallback | None): called with start-up progress messages.
+            bus (EventBus | None): bus every reading is published to (DISTANCE_TOPIC) as
+                soon as it is produced, if any.
+            recorder (FlightRecorder | None): recorder every ping and reading is logged to, if any.
+            metrics (Metrics | None): registry the ping wait and stability check times, and
+                the ping outcomes, are counted in. A private one if None.
+
+        Returns straight after setting up the pins. The sensors settle and are
+        dry-fired in the background, and each one is pinged as soon as it is ready.
         """
+        timing = timing or {}
+
         GPIO.setmode(GPIO.BCM)
         
         if debug:
             print("[DEBUG] Initializing up all sensors")
             
         self._sensors: List[UltrasonicSensor] = [
-            UltrasonicSensor(corner, debug=debug)
+            UltrasonicSensor(
+                corner, 
+                debug=debug, 
+                timing=timing.get(corner, DEFAULT_TIMING),
+                streaming=streaming,
+                max_range=max_range
+            )
             for corner in CarCorner
         ]
         
+        self._debug = debug
+        self._bus = bus
+        self._recorder = recorder
+        metrics = metrics or Metrics()
+        self._ping_wait = metrics.histogram(PING_WAIT)
+        self._stability_check = metrics.histogram(STABILITY_CHECK)
+        self._ping_outcomes = {
+            status: metrics.counter(f"pings_{status.name.lower()}")
+            for status in ReadingStatus
+        }
+        self._pings_per_reading = 1 if streaming else NUM_TRIALS
+        self._scheduler = FiringScheduler(
+            self._sensors, interference, debug=debug, on_ping=self._record_ping
+        )
+        # Kept while full sweeps are selected, so adaptive mode can be switched back on.
+        self._adaptive_planner = AdaptiveScheduler(list(CarCorner), min_refresh, ping_budget)
+        self._planner: Optional[AdaptiveScheduler] = self._adaptive_planner if adaptive else None
+        
+        # Most recent reading of every corner, returned for corners skipped in a sweep.
+        self._latest: Latest[DistanceSnapshot] = Latest(DistanceSnapshot(tuple(
+            DistanceReading(corner, None)
+            for corner in CarCorner
+        )))
+        
+        # Sensors that finished settling and their dry-fire, see `readiness`.
+        self._readiness = Readiness("ultrasonic", on_progress)
+        self._warmed: Set[CarCorner] = set()
+        
+        # Health tracking, and a background thread warming up the sensors, 
+        # then re-probing backed-off ones.
+        self._health: Dict[CarCorner, SensorHealth] = {
+            corner: SensorHealth(corner)
+            for corner in CarCorner
+        }
+        self._fire_lock = Lock()
+        self._probe_wake: Event = Event()
+        self._probe_stop: Event = Event()
+        self._probe_thread = Thread(target=self._probe_loop, name="echonav-probe", daemon=True)
+        self._probe_thread.start()
+        
         if debug:
-            print("[DEBUG] System setup, ready for readings!")
+            print("[DEBUG] System setup, warming up sensors...")
+
+    def _record_ping(self, sensor: UltrasonicSensor, outcome: ReadingStatus, latency: float) -> None:
+        """Feeds one ping outcome into the sensor's health, the metrics and the recorder, waking the prober if its breaker opened.
+
+        Arguments:
+            sensor (UltrasonicSensor): sensor that was pinged.
+            outcome (ReadingStatus): how the ping ended.
+            latency (float): time from trigger to result (in s).
+        """
+        self._ping_wait.record(int(latency * 1e9))
+        self._ping_outcomes[outcome].add()
+        if self._recorder:
+            self._recorder.ping(sensor.corner, outcome, sensor.last_echo, latency)
+        health = self._health[sensor.corner]
+        if health.record(outcome, latency, time.monotonic()):
+            if self._debug:
+                print(f"[DEBUG] Sensor: {sensor.name} breaker {health.state.name}")
+            self._probe_wake.set()
+
+    def _warm_up(self) -> None:
+        """Waits for every sensor to settle, then dry-fires each one in turn.
+
+        The sensors were all set up together, so they settle concurrently. Each
+        sensor joins the sweep as soon as its dry-fire is done, and a failing
+        dry-fire counts against its health rather than stopping start-up.
+        """
+        for sensor in self._sensors:
+            if self._probe_stop.wait(sensor.settle_remaining):
+                return
+            with self._fire_lock:
+                test_distance = self._scheduler.probe(sensor)
+                self._warmed.add(sensor.corner)
+            self._readiness.report(f"{sensor.name} ready (test reading: {test_distance})")
+        
+        self._readiness.set_ready()
+        if self._debug:
+            print("[DEBUG] All sensors ready for readings!")
+
+    def _probe_loop(self) -> None:
+        """Background loop warming up the sensors, then re-probing sensors whose breaker is open.
+
+        Sleeps until the earliest probe is due (or a breaker opens), then pings
+        the sensor on its own while holding the firing lock, so probes never
+        overlap with a sweep.
+        """
+        self._warm_up()
+        while not self._probe_stop.is_set():
+            now = time.monotonic()
+            due = [s for s in self._sensors if self._health[s.corner].probe_due(now)]
+            for sensor in due:
+                with self._fire_lock:
+                    self._health[sensor.corner].begin_probe()
+                    self._scheduler.probe(sensor)
+            
+            pending = [
+                h.next_probe for h in self._health.values() 
+                if h.next_probe is not None and h.next_probe > now
+            ]
+            timeout = min(pending) - time.monotonic() if pending else None
+            self._probe_wake.wait(None if timeout is None else max(0.0, timeout))
+            self._probe_wake.clear()
+
+    def _produce(self, reading: DistanceReading) -> None:
+        """Keeps a new reading as its corner's latest, and publishes it."""
+        readings = list(self._latest.get().readings)
+        readings[reading.corner] = reading
+        self._latest.set(DistanceSnapshot(tuple(readings)))
+        if self._bus:
+            self._bus.publish(DISTANCE_TOPIC, reading)
+        if self._recorder:
+            self._recorder.reading(
+                reading.corner, reading.status, reading.distance, reading.confidence, reading.timestamp
+            )
+
+    def _finish_group(
+        self,
+        group: List[UltrasonicSensor],
+        samples: Dict[CarCorner, List[Optional[float]]],
+        errors: Dict[CarCorner, Exception]
+    ) -> None:
+        """Produces the readings of a group as soon as its pings are collected.
+
+        Arguments:
+            group (List[UltrasonicSensor]): sensors of the group.
+            samples (Dict[CarCorner, List[float | None]]): single-ping distances of the sweep so far.
+            errors (Dict[CarCorner, Exception]): errors of the sweep so far.
+        """
+        for sensor in group:
+            if sensor.corner in errors:
+                print(f"Error while reading sensor: {sensor.name}!")
+                print(f"Error: {errors[sensor.corner]}")
+                reading = DistanceReading(
+                    sensor.corner, None, 0.0, time.monotonic(), ReadingStatus.ERROR
+                )
+            else:
+                start = time.perf_counter_ns()
+                reading = sensor.reading_from(samples[sensor.corner])
+                self._stability_check.since(start)
+            self._produce(reading)
+            if self._planner:
+                self._planner.observe(reading, reading.timestamp)
 
     def read_all(self) -> List[DistanceReading]:
         """Reads distance data from all ultrasonic sensors.
 
-        Iterates through each sensor, collecting distance readings.
-        If a sensor fails to provide a reading, the error is logged but
-        execution continues for the remaining sensors.
+        Fires the sensors in acoustically non-interfering groups, collecting
+        one ping from each when streaming (NUM_TRIALS in burst mode) before
+        validating them. Every echo wait is bounded by the sensor's max range,
+        and sensors that time out report an out of range reading. In adaptive
+        mode only the most urgent corners are pinged, the most urgent possibly
+        several times, and the others report their most recent reading.
+        Sensors still warming up report NOT_READY, and sensors with an open
+        circuit breaker are skipped and report SENSOR_FAULT until a background probe succeeds. If 
+        a sensor raises an error, it is logged, the sensor reports a None 
+        distance, and execution continues for the remaining sensors.
+
+        Every new reading is published as soon as it is produced, so a group's
+        readings are out before the next group fires. If no sensor can be
+        pinged, waits GROUP_GAP instead so back-to-back sweeps never spin.
+
+        Returns:
+            (List[DistanceReading]): list of reading DTO containing distance data for each sensor position.
+        """
+        rounds = self._begin_sweep()
+        if rounds:
+            with self._fire_lock:
+                for corners in rounds:
+                    self._scheduler.sweep(
+                        self._pings_per_reading, corners, on_group=self._finish_group
+                    )
+        else:
+            self._probe_stop.wait(GROUP_GAP)
+            
+        return list(self._latest.get().readings)
+
+    async def read_all_async(
+        self,
+        executor: Executor,
+        on_update: Optional[Callable[[List[DistanceReading]], None]] = None
+    ) -> List[DistanceReading]:
+        """Coroutine version of `read_all`, for the asyncio runtime.
+
+        The gaps between firing slots are awaited on the event loop, and only
+        the triggering and echo waits run in the executor. The firing lock is
+        held per slot rather than for the whole sweep.
+
+        Arguments:
+            executor (Executor): runs the blocking GPIO work.
+            on_update (Callable | None): called on the event loop with the latest
+                readings every time a group's readings are produced.
 
         Returns:
             (List[DistanceReading]): list of reading DTO containing distance data for each sensor position.
         """
-        readings: List[DistanceReading] = []
+        def finish_group(
+            group: List[UltrasonicSensor],
+            samples: Dict[CarCorner, List[Optional[float]]],
+            errors: Dict[CarCorner, Exception]
+        ) -> None:
+            self._finish_group(group, samples, errors)
+            if on_update:
+                on_update(list(self._latest.get().readings))
+
+        rounds = self._begin_sweep()
+        if rounds:
+            for corners in rounds:
+                await self._scheduler.sweep_async(
+                    self._pings_per_reading, executor, self._fire_lock, corners, on_group=finish_group
+                )
+        else:
+            await asyncio.sleep(GROUP_GAP)
+
+        return list(self._latest.get().readings)
+
+    def _begin_sweep(self) -> List[List[CarCorner]]:
+        """Produces the readings of the sensors that cannot be pinged, and returns the rounds to fire.
+
+        Sensors still warming up report NOT_READY, and sensors with an open
+        circuit breaker report SENSOR_FAULT. A full sweep is a single round of
+        every other corner. In adaptive mode the planner only allocates slots to
+        those corners, and its slots are split into rounds, so a corner with
+        several slots is pinged once per round.
+        """
+        now = time.monotonic()
+        pingable = [c for c in CarCorner if c in self._warmed and self._health[c].allows_ping()]
+        rounds = [pingable] if pingable else []
+        if self._planner and pingable:
+            rounds = rounds_of(self._planner.select(now, pingable))
         
-        # Attempt to read all of the sensors.
         for sensor in self._sensors:
-            try:
-                reading = sensor.read_distance()
-            except Exception as e:
-                print(f"Error while reading sensor: {sensor.name}!")
-                print(f"Error: {e}")
-                
-            readings.append(reading)
-            
-        return readings
+            if sensor.corner not in self._warmed:
+                self._produce(DistanceReading(
+                    sensor.corner, None, 0.0, time.monotonic(), ReadingStatus.NOT_READY
+                ))
+            elif not self._health[sensor.corner].allows_ping():
+                self._produce(DistanceReading(
+                    sensor.corner, None, 0.0, time.monotonic(), ReadingStatus.SENSOR_FAULT
+                ))
+        return rounds
+
+    @property
+    def adaptive(self) -> bool:
+        """Returns True if corners are pinged by urgency, False if all of them are pinged on every sweep."""
+        return self._planner is not None
+
+    def set_adaptive(self, adaptive: bool) -> None:
+        """Switches between pinging corners by urgency and pinging all of them on every sweep.
+
+        Takes effect from the next sweep, and can be called from any thread.
+        """
+        self._planner = self._adaptive_planner if adaptive else None
+
+    def latest(self) -> DistanceSnapshot:
+        """Returns the latest reading of every corner, without waiting for a sweep.
+
+        Safe to call from any thread: the snapshot is immutable and reading it never blocks the sweep.
+        """
+        return self._latest.get()
+
+    @property
+    def readiness(self) -> Readiness:
+        """Returns the start-up state of the sensors, ready once all of them are warmed up."""
+        return self._readiness
+
+    def health(self) -> Dict[CarCorner, HealthStats]:
+        """Returns the health statistics and breaker state of every sensor."""
+        return {corner: health.stats() for corner, health in self._health.items()}
+
+    @property
+    def worst_case_sweep(self) -> float:
+        """Returns the longest a `read_all` sweep can take in the current mode (in s).
+
+        An adaptive sweep may fire each of its ping slots on its own.
+        """
+        planner = self._planner
+        if planner:
+            return self._scheduler.worst_case_ping(planner.max_slots * self._pings_per_reading)
+        return self._scheduler.worst_case_duration(self._pings_per_reading)
 
     def shutdown(self) -> None:
         """Safely shuts down all ultrasonic sensors."""
+        self._probe_stop.set()
+        self._probe_wake.set()
+        self._probe_thread.join(timeout=1)
         GPIO.cleanup()
\ No newline at end of file